@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ChurchesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'churches'
+
+    def ready(self):
+        from . import signals  # Invalidação das opções de igreja em cache
@@ -0,0 +1,30 @@
+"""
+Opções de igreja para os formulários, lidas do cache.
+
+A lista (pk, nome) é pequena e muda raramente; fica no cache por
+CHOICES_CACHE_TIMEOUT segundos e é descartada a cada alteração em Church (ver
+churches.signals). Assim abrir um formulário não consulta a tabela de igrejas.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Church
+
+CHURCH_CHOICES_KEY = "churches:choices"
+
+
+def church_choices():
+    return cache.get_or_set(
+        CHURCH_CHOICES_KEY,
+        lambda: list(Church.objects.order_by("name").values_list("pk", "name")),
+        settings.CHOICES_CACHE_TIMEOUT,
+    )
+
+
+def invalidate():
+    cache.delete(CHURCH_CHOICES_KEY)
+
+
+def use_cached_church_choices(field, empty_label="---------"):
+    """Troca as opções do ModelChoiceField pela lista em cache (a validação continua pelo queryset)."""
+    field.choices = [("", empty_label), *church_choices()]
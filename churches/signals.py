@@ -0,0 +1,12 @@
+from django.db.models.signals import post_save, post_delete
+
+from .models import Church
+from . import choices
+
+
+def invalidate_church_choices(sender, **kwargs):
+    choices.invalidate()
+
+
+post_save.connect(invalidate_church_choices, sender=Church, dispatch_uid="churches_choices_save")
+post_delete.connect(invalidate_church_choices, sender=Church, dispatch_uid="churches_choices_delete")
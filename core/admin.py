@@ -1,6 +1,13 @@
 from django.contrib import admin
 
 # Register your models here.
-from .models import ChurchConfiguration
+from .models import ChurchConfiguration, RequestProfile
 
-admin.site.register(ChurchConfiguration)
\ No newline at end of file
+admin.site.register(ChurchConfiguration)
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    list_display = ["created_at", "method", "view_name", "status_code", "total_time", "sql_time", "render_time", "query_count", "duplicate_count"]
+    list_filter = ["method", "status_code"]
+    search_fields = ["view_name", "path"]
@@ -1,6 +1,18 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        from . import signals  # Invalidação da configuração da igreja em cache
+        # Tabela do cache compartilhado (CACHE_BACKEND=database), criada junto com as migrações
+        post_migrate.connect(create_cache_table, sender=self, dispatch_uid="core_create_cache_table")
+
+
+def create_cache_table(sender, using, verbosity=1, **kwargs):
+    from django.core.management import call_command
+
+    call_command("createcachetable", database=using, verbosity=verbosity)
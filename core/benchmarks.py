@@ -0,0 +1,154 @@
+"""
+Benchmark das telas mais pesadas (comando run_benchmarks).
+
+Cada caso é uma URL acessada pelo django.test.Client com um usuário logado,
+passando por todos os middlewares. A primeira requisição é feita com o cache
+vazio ("fria", a que conta para o limite de consultas), as seguintes medem o
+caso comum com o cache aquecido. Os limites de consultas não dependem do volume
+de dados: se uma tela passar a fazer uma consulta por linha (N+1), o número
+cresce com a base gerada por seed_data e o limite estoura. As idas ao cache não
+contam (com CACHE_BACKEND=database elas também são consultas). Os mesmos casos
+rodam no manage.py test (core.tests), sobre uma base pequena.
+"""
+import json
+import re
+import statistics
+import time
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from churches.models import Church
+from events.models import Event
+from finances.models import Expense, Income
+from members.models import Member
+from school.models import Attendance, SchoolClass, Student
+
+
+TRANSACTION_CONTROL = re.compile(r"\s*(SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT)\b", re.IGNORECASE)
+
+
+class Case:
+    def __init__(self, name, url, max_queries, params=None):
+        self.name = name
+        self.url = url
+        self.max_queries = max_queries
+        self.params = params or {}
+
+
+def cases():
+    today = timezone.localdate()
+    last_month = date(today.year - (today.month == 1), (today.month - 2) % 12 + 1, 1)
+    school_class = SchoolClass.objects.order_by("pk").values_list("pk", flat=True).first()
+    last_class_date = Attendance.objects.filter(school_class_id=school_class)\
+                                        .order_by("-date").values_list("date", flat=True).first() or today
+    month = {"month": last_month.month, "year": last_month.year}
+    year = {"year": today.year}
+    end = {"end_date": today.isoformat()}
+    frequencia = {"class_id": school_class or "", "class_date": last_class_date.isoformat()}
+    return [
+        Case("dashboard", reverse("dashboard:index"), 24),
+        Case("entradas", reverse("finances:income_list"), 12),
+        Case("saidas", reverse("finances:expense_list"), 11),
+        Case("relatorio financeiro", reverse("finances:report_finance"), 9),
+        Case("membros", reverse("members:member_list"), 7),
+        Case("busca de membros", reverse("members:member_search"), 8, {"q": "silva"}),
+        Case("turmas", reverse("school:school_class_list"), 7),
+        Case("movimentações", reverse("reports:movimentacoes_mensais"), 10, month),
+        Case("movimentações xlsx", reverse("reports:export_movimentacoes_mensais_xlsx"), 10, month),
+        Case("movimentações pdf", reverse("reports:export_movimentacoes_mensais_pdf"), 10, month),
+        Case("dre", reverse("reports:dre"), 8, year),
+        Case("dre xlsx", reverse("reports:export_dre_xlsx"), 8, year),
+        Case("dre pdf", reverse("reports:export_dre_pdf"), 8, year),
+        Case("balanço", reverse("reports:balanco"), 7, end),
+        Case("balanço xlsx", reverse("reports:export_balanco_xlsx"), 7, end),
+        Case("balanço pdf", reverse("reports:export_balanco_pdf"), 7, end),
+        Case("financeiro por categorias", reverse("reports:financeiro_categorias"), 8, month),
+        Case("alunos por turma", reverse("reports:alunos_por_turma"), 8),
+        Case("alunos por turma xlsx", reverse("reports:export_alunos_por_turma_xlsx"), 8),
+        Case("alunos por turma pdf", reverse("reports:export_alunos_por_turma_pdf"), 8),
+        Case("frequência", reverse("reports:frequencia"), 12, frequencia),
+        Case("frequência xlsx", reverse("reports:export_frequencia_xlsx"), 12, frequencia),
+        Case("frequência pdf", reverse("reports:export_frequencia_pdf"), 12, frequencia),
+        Case("estatísticas de membros", reverse("reports:membros_estatisticas"), 12),
+        Case("estatísticas de membros xlsx", reverse("reports:export_membros_estatisticas_xlsx"), 12),
+        Case("estatísticas de membros pdf", reverse("reports:export_membros_estatisticas_pdf"), 12),
+        Case("aniversariantes", reverse("reports:aniversariantes"), 7, {"month": today.month}),
+        Case("contribuições anuais", reverse("reports:contribuicoes_anuais"), 10, year),
+        Case("contribuições anuais csv", reverse("reports:export_contribuicoes_anuais_csv"), 8, year),
+    ]
+
+
+def _request(client, case):
+    started = time.perf_counter()
+    response = client.get(case.url, case.params)
+    # Respostas em streaming (exportações) só são geradas ao serem consumidas
+    size = sum(len(chunk) for chunk in response.streaming_content) if response.streaming else len(response.content)
+    return response.status_code, size, (time.perf_counter() - started) * 1000
+
+
+def _screen_queries(captured):
+    """
+    Consultas da tela, sem as da tabela do cache (DatabaseCache) e sem os
+    SAVEPOINT/RELEASE que as gravações no cache abrem dentro de transações.
+    """
+    cache_settings = settings.CACHES["default"]
+    table = connection.ops.quote_name(cache_settings["LOCATION"]) \
+        if cache_settings["BACKEND"].endswith("DatabaseCache") else None
+    return sum(1 for query in captured.captured_queries
+               if not (table and table in query["sql"]) and not TRANSACTION_CONTROL.match(query["sql"]))
+
+
+def run_case(client, case, repeat):
+    cache.clear()
+    with CaptureQueriesContext(connection) as cold_queries:
+        status, size, cold_ms = _request(client, case)
+    warm = []
+    with CaptureQueriesContext(connection) as warm_queries:
+        for _ in range(repeat):
+            warm.append(_request(client, case)[2])
+    return {
+        "name": case.name,
+        "url": case.url,
+        "params": case.params,
+        "status": status,
+        "bytes": size,
+        "queries": _screen_queries(cold_queries),
+        "warm_queries": _screen_queries(warm_queries) // repeat if repeat else None,
+        "max_queries": case.max_queries,
+        "cold_ms": round(cold_ms, 2),
+        "warm_p50_ms": round(statistics.median(warm), 2) if warm else None,
+        "warm_min_ms": round(min(warm), 2) if warm else None,
+        "passed": status == 200 and _screen_queries(cold_queries) <= case.max_queries,
+    }
+
+
+def run(user, repeat=5, only=None):
+    """Executa os casos (filtrados por nome em only) e devolve o dicionário gravado no JSON."""
+    client = Client()
+    client.force_login(user)
+    results = []
+    with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+        for case in cases():
+            if only and not any(term in case.name for term in only):
+                continue
+            results.append(run_case(client, case, repeat))
+    return {
+        "created_at": timezone.now().isoformat(),
+        "database": connection.vendor,
+        "repeat": repeat,
+        "rows": {model.__name__: model.objects.count()
+                 for model in (Church, Member, Income, Expense, SchoolClass, Student, Attendance, Event)},
+        "results": results,
+    }
+
+
+def load(path):
+    with open(path, encoding="utf-8") as results_file:
+        return {result["name"]: result for result in json.load(results_file)["results"]}
@@ -0,0 +1,26 @@
+"""
+Verificações do sistema (rodam no manage.py check, migrate, runserver e test).
+
+Dashboard e relatórios invalidam o cache trocando uma chave de versão no cache
+padrão; com um cache local do processo (LocMemCache) a troca só vale para o
+worker que gravou a alteração.
+"""
+from django.conf import settings
+from django.core import checks
+
+PROCESS_LOCAL_CACHES = ("django.core.cache.backends.locmem.LocMemCache",)
+
+
+def shared_cache_check(app_label):
+    """Check que exige o cache padrão compartilhado entre processos (fora do DEBUG)."""
+    def check(app_configs=None, **kwargs):
+        backend = settings.CACHES["default"]["BACKEND"]
+        if settings.DEBUG or backend not in PROCESS_LOCAL_CACHES:
+            return []
+        return [checks.Error(
+            f"O cache padrão ({backend}) não é compartilhado entre processos: a invalidação do cache de "
+            f"{app_label} não chegaria aos outros workers.",
+            hint="Use CACHE_BACKEND=database, redis ou file (ver settings.CACHES).",
+            id=f"{app_label}.E001",
+        )]
+    return check
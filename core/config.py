@@ -0,0 +1,48 @@
+"""
+Configuração da igreja sede (ChurchConfiguration): logo, pastor e tesoureiro
+usados no cabeçalho de todos os relatórios e exportações.
+
+Três camadas, da mais rápida para a mais lenta:
+- por requisição: church_configuration(request) guarda o objeto no próprio
+  request, então views, context processor e exportações compartilham a mesma
+  instância;
+- por processo: a última leitura fica em memória por CHURCH_CONFIG_PROCESS_TIMEOUT
+  segundos (outros processos veem uma alteração no máximo depois desse prazo);
+- cache compartilhado por CHOICES_CACHE_TIMEOUT segundos.
+Salvar ou excluir a configuração descarta o cache compartilhado e o do processo
+(ver core.signals).
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import ChurchConfiguration
+
+CHURCH_CONFIG_KEY = "core:church_config"
+CHURCH_CONFIG_PROCESS_TIMEOUT = 60
+
+_process_cache = {"value": None, "expires": 0}
+
+
+def _load():
+    now = time.monotonic()
+    if _process_cache["expires"] > now:
+        return _process_cache["value"]
+    value = cache.get_or_set(CHURCH_CONFIG_KEY, ChurchConfiguration.objects.first, settings.CHOICES_CACHE_TIMEOUT)
+    _process_cache.update(value=value, expires=now + CHURCH_CONFIG_PROCESS_TIMEOUT)
+    return value
+
+
+def church_configuration(request=None):
+    """A configuração única (ou None se ainda não foi cadastrada)."""
+    if request is None:
+        return _load()
+    if not hasattr(request, "_church_configuration"):
+        request._church_configuration = _load()
+    return request._church_configuration
+
+
+def invalidate():
+    cache.delete(CHURCH_CONFIG_KEY)
+    _process_cache.update(value=None, expires=0)
@@ -0,0 +1,8 @@
+from django.utils.functional import SimpleLazyObject
+
+from .config import church_configuration
+
+
+def church_config(request):
+    """church_config em todos os templates; só é carregada se o template usar."""
+    return {"church_config": SimpleLazyObject(lambda: church_configuration(request))}
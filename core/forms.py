@@ -12,3 +12,14 @@ class ChurchConfigurationForm(forms.ModelForm):
             "treasurer_name": forms.TextInput(attrs={"class": "form-control"}),
         }
 
+
+
+class ImportForm(forms.Form):
+    tipo = forms.ChoiceField(label="Importar")
+    arquivo = forms.FileField(label="Planilha (.csv ou .xlsx)")
+    dry_run = forms.BooleanField(label="Apenas validar (não gravar)", required=False)
+
+    def __init__(self, *args, **kwargs):
+        importer_choices = kwargs.pop("importer_choices")
+        super().__init__(*args, **kwargs)
+        self.fields["tipo"].choices = importer_choices
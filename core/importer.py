@@ -0,0 +1,260 @@
+"""
+Importação em massa de planilhas (CSV/XLSX).
+
+As linhas são lidas em fluxo (csv.DictReader / openpyxl read-only) e processadas
+em blocos de IMPORT_CHUNK_SIZE: cada linha passa pelas regras do formulário do
+app (MemberForm, IncomeForm...), igreja/categoria/membro são resolvidos pelo
+nome com dicionários carregados uma única vez, e as linhas válidas de cada bloco
+entram com um único bulk_create. Linhas inválidas não interrompem a importação:
+voltam em ImportResult.errors com o número da linha na planilha.
+
+bulk_create não dispara post_save; ao final de cada bloco o sinal
+rows_imported avisa quem mantém dados derivados (consolidado, caches).
+"""
+import csv
+import io
+import time
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.db import transaction
+from django.forms.models import modelform_factory
+from openpyxl import load_workbook
+
+from members.search import normalize
+from .signals import rows_imported
+
+IMPORT_CHUNK_SIZE = 500
+MAX_REPORTED_ERRORS = 500
+AMBIGUOUS = object()
+
+
+class ImportFileError(Exception):
+    pass
+
+
+def _csv_rows(fileobj):
+    text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="")
+    sample = text.read(4096)
+    text.seek(0)
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+    reader = csv.reader(text, dialect)
+    header = next(reader, None)
+    if not header:
+        return
+    for line, values in enumerate(reader, 2):
+        if any(v.strip() for v in values):
+            yield line, dict(zip(header, values))
+
+
+def _xlsx_rows(fileobj):
+    workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if not header:
+            return
+        header = [str(h) if h is not None else "" for h in header]
+        for line, values in enumerate(rows, 2):
+            if any(v not in (None, "") for v in values):
+                yield line, dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+def read_rows(fileobj, filename):
+    """Gera (número da linha, {cabeçalho: valor}) sem carregar a planilha inteira."""
+    name = filename.lower()
+    if name.endswith(".xlsx"):
+        return _xlsx_rows(fileobj)
+    if name.endswith((".csv", ".txt")):
+        return _csv_rows(fileobj)
+    raise ImportFileError("Formato não suportado. Envie um arquivo .csv ou .xlsx.")
+
+
+class ImportResult:
+    def __init__(self):
+        self.total = 0
+        self.imported = 0
+        self.error_count = 0
+        self.errors = [] # (linha, mensagem), limitado a MAX_REPORTED_ERRORS
+        self.elapsed = 0.0
+
+    def add_error(self, line, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+    @property
+    def rows_per_second(self):
+        return self.total / self.elapsed if self.elapsed else 0
+
+
+class BaseImporter:
+    """
+    Subclasses definem model, form_class, fields (campos do formulário lidos da
+    planilha), aliases ({campo: outros nomes de coluna}) e lookups: {campo FK:
+    (modelo, colunas aceitas)}. Os FKs são resolvidos pelos dicionários de
+    build_lookups(), sem consulta por linha.
+    """
+    model = None
+    form_class = None
+    fields = []
+    aliases = {}
+    lookups = {}
+    label = ""
+    permission = ""
+
+    def __init__(self, chunk_size=IMPORT_CHUNK_SIZE, dry_run=False):
+        self.chunk_size = chunk_size
+        self.dry_run = dry_run
+        # O formulário do app, só com os campos simples: os FKs vêm dos lookups
+        self.form = modelform_factory(self.model, form=self.form_class, fields=self.fields)
+        self.columns = self._column_map()
+        self.choice_maps = self._choice_maps()
+        self.lookup_maps = self.build_lookups()
+
+    def _column_map(self):
+        """Cabeçalho normalizado -> campo. Aceita o nome do campo ou o rótulo em português."""
+        columns = {}
+        for name in self.fields:
+            field = self.model._meta.get_field(name)
+            columns[normalize(name)] = name
+            columns[normalize(str(field.verbose_name))] = name
+            for alias in self.aliases.get(name, []):
+                columns[normalize(alias)] = name
+        for name, (_, aliases) in self.lookups.items():
+            columns[normalize(name)] = name
+            for alias in aliases:
+                columns[normalize(alias)] = name
+        return columns
+
+    def _choice_maps(self):
+        """Campos com choices aceitam o valor ou o texto exibido (ex.: "Cartão de Crédito")."""
+        maps = {}
+        for name in self.fields:
+            field = self.model._meta.get_field(name)
+            if field.choices:
+                maps[name] = {normalize(str(label)): value for value, label in field.flatchoices}
+                maps[name].update({normalize(str(value)): value for value, _ in field.flatchoices})
+        return maps
+
+    @staticmethod
+    def name_map(pairs):
+        """{nome normalizado: pk}; nomes repetidos ficam marcados como AMBIGUOUS."""
+        names = {}
+        for pk, label in pairs:
+            key = normalize(label)
+            names[key] = AMBIGUOUS if key in names else pk
+        return names
+
+    def build_lookups(self):
+        """{campo FK: {nome normalizado: pk}} para cada lookup; subclasses podem ampliar."""
+        return {
+            name: self.name_map(model.objects.values_list("pk", "name"))
+            for name, (model, _) in self.lookups.items()
+        }
+
+    def resolve(self, name, value):
+        return self.lookup_maps[name].get(normalize(value))
+
+    def _clean_value(self, name, value):
+        if value is None:
+            return ""
+        if isinstance(value, datetime):
+            return value.date().isoformat()
+        if isinstance(value, date):
+            return value.isoformat()
+        if isinstance(value, (int, float, Decimal)):
+            return str(value)
+        value = str(value).strip()
+        if name in self.choice_maps:
+            return self.choice_maps[name].get(normalize(value), value)
+        field = self.model._meta.get_field(name) if name in self.fields else None
+        if field is not None and field.get_internal_type() in ("DecimalField", "FloatField") and "," in value:
+            value = value.replace(".", "").replace(",", ".") # 1.234,56 -> 1234.56
+        return value
+
+    def parse_row(self, raw):
+        """Retorna (dados para o formulário, {campo FK: pk}, erros de resolução)."""
+        data, related, errors = {}, {}, []
+        for header, value in raw.items():
+            name = self.columns.get(normalize(str(header or "")))
+            if name is None:
+                continue
+            value = self._clean_value(name, value)
+            if name in self.lookups:
+                if value:
+                    related[name] = self.resolve(name, value)
+                    label = self.model._meta.get_field(name).verbose_name
+                    if related[name] is None:
+                        errors.append(f"{label}: \"{value}\" não encontrado(a).")
+                    elif related[name] is AMBIGUOUS:
+                        errors.append(f"{label}: há mais de um cadastro chamado \"{value}\".")
+            else:
+                data[name] = value
+        # Coluna ausente ou vazia: vale o padrão do modelo (ex.: status "ativo")
+        for name in self.fields:
+            field = self.model._meta.get_field(name)
+            if not data.get(name) and field.has_default():
+                data[name] = field.get_default()
+        for name in self.lookups:
+            field = self.model._meta.get_field(name)
+            if not field.null and name not in related:
+                errors.append(f"{field.verbose_name}: campo obrigatório.")
+        return data, related, errors
+
+    def build_instance(self, line, raw, result):
+        data, related, errors = self.parse_row(raw)
+        form = self.form(data=data)
+        if not form.is_valid():
+            for field, messages in form.errors.items():
+                label = form.fields[field].label if field in form.fields else ""
+                errors.extend(f"{label}: {m}" if label else m for m in messages)
+        if errors:
+            result.add_error(line, " ".join(errors))
+            return None
+        instance = form.save(commit=False)
+        for name, pk in related.items():
+            setattr(instance, f"{name}_id", pk)
+        self.prepare(instance)
+        return instance
+
+    def prepare(self, instance):
+        """Ajustes que o save() do modelo faria e o bulk_create não faz."""
+
+    def _flush(self, objects, result):
+        if not objects:
+            return
+        if not self.dry_run:
+            with transaction.atomic():
+                created = list(self.model.objects.bulk_create(objects, batch_size=self.chunk_size))
+                transaction.on_commit(lambda: rows_imported.send(sender=self.model, objects=created))
+        result.imported += len(objects)
+        objects.clear()
+
+    def run(self, rows):
+        result = ImportResult()
+        started = time.monotonic()
+        pending = []
+        for line, raw in rows:
+            result.total += 1
+            instance = self.build_instance(line, raw, result)
+            if instance is not None:
+                pending.append(instance)
+            if len(pending) >= self.chunk_size:
+                self._flush(pending, result)
+        self._flush(pending, result)
+        result.elapsed = time.monotonic() - started
+        return result
+
+
+def importers():
+    """Tipos de importação disponíveis (chave usada na URL e no comando import_data)."""
+    from finances.importers import ExpenseImporter, IncomeImporter
+    from members.importers import MemberImporter
+
+    return {"membros": MemberImporter, "entradas": IncomeImporter, "saidas": ExpenseImporter}
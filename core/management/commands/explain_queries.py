@@ -0,0 +1,105 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from events.models import Event
+from events.recurrence import active_rules
+from finances.models import Expense, Income
+from members import birthdays
+from members.models import Member
+from school.models import Attendance
+
+
+class _Rollback(Exception):
+    pass
+
+
+def hot_queries():
+    """Consultas representativas das telas de finanças, escola, eventos e membros."""
+    today = timezone.now().date()
+    start = today - timedelta(days=90)
+    church_id = Income.objects.values_list("church_id", flat=True).first() or 0
+    class_id = Attendance.objects.values_list("school_class_id", flat=True).first() or 0
+    return [
+        ("Entradas por período (lista)",
+         Income.objects.filter(date__gte=start, date__lte=today).order_by("-date", "-id")[:51]),
+        ("Entradas por igreja e período",
+         Income.objects.filter(church_id=church_id, date__gte=start, date__lte=today)
+         .values("church_id").annotate(total=Sum("amount"))),
+        ("Saídas por categoria no período",
+         Expense.objects.filter(date__gte=start, date__lte=today).values("category__name").annotate(total=Sum("amount"))),
+        ("Frequência por turma e data",
+         Attendance.objects.filter(school_class_id=class_id, date__gte=start, date__lte=today)),
+        ("Próximos eventos",
+         Event.objects.filter(recurrence="", date__gte=today).order_by("date", "time")[:5]),
+        ("Regras de eventos recorrentes ativas",
+         Event.objects.filter(active_rules(today)).order_by()),
+        ("Aniversariantes do mês",
+         birthdays.in_month(Member.objects.all(), today.month)),
+        ("Aniversariantes do dia",
+         birthdays.today(Member.objects.all(), today)),
+        ("Aniversariantes dos próximos 30 dias",
+         birthdays.next_days(Member.objects.all(), today, 30)),
+        ("Membros ativos",
+         Member.objects.filter(status="ativo").order_by("name")),
+    ]
+
+
+MODELS = (Income, Expense, Attendance, Event, Member)
+
+
+class Command(BaseCommand):
+    help = (
+        "Mostra o plano de execução (EXPLAIN) das consultas mais usadas. "
+        "Com --compare, mostra também o plano sem os índices de Meta.indexes "
+        "(removidos dentro de uma transação desfeita ao final)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--compare", action="store_true", help="Compara com o plano sem os índices.")
+        parser.add_argument("--analyze", action="store_true", help="Usa EXPLAIN ANALYZE (apenas PostgreSQL).")
+
+    def handle(self, *args, **options):
+        explain_options = {}
+        if options["analyze"] and connection.vendor == "postgresql":
+            explain_options["analyze"] = True
+
+        # O plano "sem índices" vem primeiro: o SQLite reaproveita planos já preparados
+        before = None
+        if options["compare"]:
+            if not connection.features.can_rollback_ddl:
+                self.stderr.write("O banco atual não desfaz DDL em transação; --compare ignorado.")
+            else:
+                before = self._explain_without_indexes(explain_options)
+        after = self._explain_all(explain_options)
+
+        for title, plan in after.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(title))
+            if before is not None:
+                self.stdout.write(self.style.WARNING("  sem índices:"))
+                self.stdout.write(self._indent(before[title]))
+                self.stdout.write(self.style.SUCCESS("  com índices:"))
+            self.stdout.write(self._indent(plan))
+
+    def _explain_all(self, explain_options):
+        return {title: queryset.explain(**explain_options) for title, queryset in hot_queries()}
+
+    def _explain_without_indexes(self, explain_options):
+        plans = {}
+        try:
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    for model in MODELS:
+                        for index in model._meta.indexes:
+                            cursor.execute(f"DROP INDEX {connection.ops.quote_name(index.name)}")
+                plans = self._explain_all(explain_options)
+                raise _Rollback
+        except _Rollback:
+            pass
+        return plans
+
+    def _indent(self, text):
+        return "\n".join(f"    {line}" for line in text.splitlines())
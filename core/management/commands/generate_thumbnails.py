@@ -0,0 +1,31 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from core.thumbnails import sync_thumbnail
+from members.models import Member
+
+
+class Command(BaseCommand):
+    help = "Gera as miniaturas que faltam das fotos de membros e das imagens de perfil dos usuários."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Regera também as miniaturas já existentes.")
+
+    def handle(self, *args, **options):
+        sources = [
+            (Member, "photo", "photo_thumbnail"),
+            (get_user_model(), "profile_image", "profile_thumbnail"),
+        ]
+        for model, source_field, thumbnail_field in sources:
+            # Com foto, ou sem foto mas com miniatura antiga a remover
+            queryset = model._default_manager.filter(
+                ~Q(**{source_field: ""}) & Q(**{f"{source_field}__isnull": False}) | ~Q(**{thumbnail_field: ""})
+            ).only("pk", source_field, thumbnail_field).order_by("pk")
+            updated = 0
+            for instance in queryset.iterator(chunk_size=200):
+                if sync_thumbnail(instance, source_field, thumbnail_field, force=options["force"]):
+                    updated += 1
+            self.stdout.write(self.style.SUCCESS(
+                f"{model._meta.verbose_name_plural}: {updated} miniatura(s) atualizada(s)."
+            ))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.importer import IMPORT_CHUNK_SIZE, ImportFileError, importers, read_rows
+
+
+class Command(BaseCommand):
+    help = "Importa membros, entradas ou saídas de uma planilha CSV/XLSX."
+
+    def add_arguments(self, parser):
+        parser.add_argument("tipo", choices=sorted(importers()))
+        parser.add_argument("arquivo", help="Caminho do arquivo .csv ou .xlsx.")
+        parser.add_argument("--dry-run", action="store_true", help="Valida as linhas sem gravar nada.")
+        parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE,
+                            help="Linhas gravadas por bulk_create.")
+
+    def handle(self, *args, **options):
+        importer = importers()[options["tipo"]](chunk_size=options["chunk_size"], dry_run=options["dry_run"])
+        try:
+            with open(options["arquivo"], "rb") as fileobj:
+                result = importer.run(read_rows(fileobj, options["arquivo"]))
+        except (OSError, ImportFileError) as exc:
+            raise CommandError(str(exc))
+        for line, message in result.errors:
+            self.stderr.write(f"Linha {line}: {message}")
+        if result.error_count > len(result.errors):
+            self.stderr.write(f"... mais {result.error_count - len(result.errors)} linha(s) com erro.")
+        verb = "validadas" if options["dry_run"] else "importadas"
+        self.stdout.write(self.style.SUCCESS(
+            f"{importer.label}: {result.imported}/{result.total} linhas {verb} em {result.elapsed:.2f}s "
+            f"({result.rows_per_second:.0f} linhas/s)."
+        ))
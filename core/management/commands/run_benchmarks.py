@@ -0,0 +1,48 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from core import benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede o tempo e o número de consultas do dashboard, das listas financeiras e de cada relatório/"
+        "exportação, grava os resultados em JSON e falha se alguma tela passar do limite de consultas. "
+        "Use sobre uma base gerada por seed_data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=5, help="Requisições com cache aquecido por tela.")
+        parser.add_argument("--output", default="benchmark_results.json", help="Arquivo JSON de resultados.")
+        parser.add_argument("--compare", help="JSON de uma execução anterior para comparar.")
+        parser.add_argument("--only", nargs="+", help="Executa só os casos cujo nome contém um destes termos.")
+        parser.add_argument("--user", help="Usuário usado nas requisições (padrão: o primeiro superusuário).")
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.filter(is_active=True)
+        user = users.filter(username=options["user"]).first() if options["user"] else \
+            users.filter(is_superuser=True).order_by("pk").first()
+        if user is None:
+            raise CommandError("Nenhum usuário encontrado. Crie um superusuário ou informe --user.")
+        previous = benchmarks.load(options["compare"]) if options["compare"] else {}
+
+        data = benchmarks.run(user, repeat=options["repeat"], only=options["only"])
+        with open(options["output"], "w", encoding="utf-8") as output:
+            json.dump(data, output, ensure_ascii=False, indent=2)
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{'Tela':<32} {'Status':>6} {'Consultas':>10} {'Fria ms':>9} {'p50 ms':>9} {'Anterior':>9}"
+        ))
+        for result in data["results"]:
+            before = previous.get(result["name"], {}).get("warm_p50_ms")
+            line = (f"{result['name'][:32]:<32} {result['status']:>6} "
+                    f"{result['queries']:>4}/{result['max_queries']:<5} {result['cold_ms']:>9.1f} "
+                    f"{result['warm_p50_ms'] or 0:>9.1f} {before if before is not None else '-':>9}")
+            self.stdout.write(line if result["passed"] else self.style.ERROR(line))
+        self.stdout.write(f"Resultados gravados em {options['output']}.")
+
+        failed = [result["name"] for result in data["results"] if not result["passed"]]
+        if failed:
+            raise CommandError(f"Acima do limite de consultas ou com erro: {', '.join(failed)}.")
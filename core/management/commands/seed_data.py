@@ -0,0 +1,214 @@
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from churches.models import Church
+from dashboard import activity
+from dashboard import cache as dashboard_cache
+from dashboard.models import Activity
+from events.models import Event
+from finances import balances, ledger
+from finances.models import Category, Expense, Income
+from members.models import Member
+from members.birthdays import birthday_key
+from members.search import build_search_document, install_search_index
+from reports import datasets
+from school import stats
+from school.models import Attendance, SchoolClass, Student
+
+BATCH_SIZE = 1000
+FIRST_NAMES = [
+    "Ana", "Maria", "José", "João", "Antônio", "Francisca", "Carlos", "Paulo", "Pedro", "Lucas",
+    "Luiz", "Marcos", "Luís", "Gabriel", "Rafael", "Daniel", "Márcia", "Juliana", "Patrícia", "Aline",
+    "Sandra", "Fernanda", "Camila", "Amanda", "Bruna", "Letícia", "Raimundo", "Sebastião", "Jéssica", "Tiago",
+]
+LAST_NAMES = [
+    "Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira", "Lima", "Gomes",
+    "Costa", "Ribeiro", "Martins", "Carvalho", "Araújo", "Melo", "Barbosa", "Cardoso", "Rocha", "Nascimento",
+]
+INCOME_CATEGORIES = ["Dízimo", "Oferta", "Missões", "Campanha"]
+EXPENSE_CATEGORIES = ["Energia", "Água", "Aluguel", "Manutenção", "Ação Social", "Material"]
+CLASS_NAMES = ["Adultos", "Jovens", "Adolescentes", "Juniores", "Primários", "Casais", "Novos Convertidos", "Berçário"]
+EVENT_TITLES = {
+    "culto": "Culto de Celebração", "estudo": "Estudo Bíblico", "reuniao": "Reunião de Obreiros",
+    "conferencia": "Conferência", "atividade": "Ação Social", "especial": "Culto Especial",
+}
+SEEDED_MODELS = [Activity, Attendance, Student, SchoolClass, Event, Income, Expense, Member, Category, Church]
+
+
+class Command(BaseCommand):
+    help = (
+        "Gera uma base sintética realista (igrejas, membros, anos de entradas e saídas, turmas com "
+        "frequência semanal e eventos). Com o mesmo --seed e --end-date os dados são sempre os mesmos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--churches", type=int, default=3)
+        parser.add_argument("--members", type=int, default=1000)
+        parser.add_argument("--years", type=int, default=3, help="Anos de histórico financeiro.")
+        parser.add_argument("--incomes-per-week", type=int, default=25, help="Entradas por igreja por semana.")
+        parser.add_argument("--classes", type=int, default=6)
+        parser.add_argument("--students-per-class", type=int, default=15)
+        parser.add_argument("--attendance-weeks", type=int, default=52)
+        parser.add_argument("--events", type=int, default=300)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--end-date", type=date.fromisoformat, default=None,
+                            help="Último dia dos dados (AAAA-MM-DD); padrão: hoje.")
+        parser.add_argument("--flush", action="store_true",
+                            help="Apaga igrejas, membros, finanças, escola e eventos existentes antes de gerar.")
+
+    def handle(self, *args, **options):
+        if not options["flush"] and any(model.objects.exists() for model in SEEDED_MODELS):
+            raise CommandError("O banco já tem dados. Use --flush para apagá-los e gerar a base sintética.")
+        self.rng = random.Random(options["seed"])
+        self.end_date = options["end_date"] or date.today()
+
+        with transaction.atomic():
+            if options["flush"]:
+                for model in SEEDED_MODELS:
+                    model.objects.all().delete()
+            churches = self._churches(options["churches"])
+            members = self._members(options["members"], churches)
+            incomes, expenses = self._finances(churches, members, options["years"], options["incomes_per_week"])
+            attendances = self._school(members, options["classes"], options["students_per_class"], options["attendance_weeks"])
+            events = self._events(churches, options["events"])
+
+        # bulk_create não dispara signals: dados derivados e caches são refeitos aqui
+        ledger.rebuild_ledger()
+        balances.rebuild_balances()
+        stats.refresh_all()
+        install_search_index()
+        datasets.invalidate()
+        dashboard_cache.invalidate()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Base gerada (seed {options['seed']}, até {self.end_date:%d/%m/%Y}): {len(churches)} igrejas, "
+            f"{len(members)} membros, {incomes} entradas, {expenses} saídas, {attendances} registros de "
+            f"frequência, {events} eventos."
+        ))
+
+    def _create(self, model, objects):
+        created = model.objects.bulk_create(objects, batch_size=BATCH_SIZE)
+        activity.record_many(model, created) # Registro de atividades (sem post_save no bulk_create)
+        return created
+
+    def _days_ago(self, days):
+        return self.end_date - timedelta(days=days)
+
+    def _churches(self, count):
+        return self._create(Church, [
+            Church(name="Igreja Sede" if i == 0 else f"Congregação {i}", church_type="sede" if i == 0 else "filial",
+                   founded_date=self._days_ago(self.rng.randint(365 * 5, 365 * 40)))
+            for i in range(count)
+        ])
+
+    def _cpf(self):
+        digits = f"{self.rng.randrange(10 ** 11):011d}"
+        return f"{digits[:3]}.{digits[3:6]}.{digits[6:9]}-{digits[9:]}"
+
+    def _members(self, count, churches):
+        members = []
+        for i in range(count):
+            name = f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)} {self.rng.choice(LAST_NAMES)}"
+            cpf = self._cpf()
+            phone = f"(95) 9{self.rng.randrange(10 ** 8):08d}"
+            email = f"membro{i}@exemplo.com.br"
+            visitor = self.rng.random() < 0.1
+            birth_date = self._days_ago(self.rng.randint(365 * 5, 365 * 85))
+            members.append(Member(
+                name=name, cpf=cpf, phone=phone, email=email,
+                birth_date=birth_date, birthday_key=birthday_key(birth_date),
+                gender=self.rng.choice(["M", "F"]),
+                marital_status=self.rng.choice(["solteiro", "casado", "casado", "divorciado", "viuvo"]),
+                join_date=self._days_ago(self.rng.randint(0, 365 * 20)),
+                baptism_date=None if visitor else self._days_ago(self.rng.randint(0, 365 * 20)),
+                member_type="visitante" if visitor else self.rng.choice(["membro"] * 9 + ["obreiro"]),
+                status="visitante" if visitor else self.rng.choice(["ativo"] * 17 + ["inativo", "transferido", "disciplina"]),
+                church=self.rng.choice(churches),
+                search_document=build_search_document(name, cpf, phone, email),
+            ))
+        return self._create(Member, members)
+
+    def _finances(self, churches, members, years, incomes_per_week):
+        income_categories = self._create(Category, [Category(name=n, category_type="entrada") for n in INCOME_CATEGORIES])
+        expense_categories = self._create(Category, [Category(name=n, category_type="saida") for n in EXPENSE_CATEGORIES])
+        members_by_church = {}
+        for member in members:
+            members_by_church.setdefault(member.church_id, []).append(member)
+        methods = [value for value, _ in Income.PAYMENT_METHOD_CHOICES]
+
+        incomes, expenses = [], []
+        first_day = self._days_ago(365 * years)
+        for church in churches:
+            givers = members_by_church.get(church.pk) or [None]
+            day = first_day
+            while day <= self.end_date:
+                for _ in range(incomes_per_week):
+                    category = self.rng.choice(income_categories)
+                    member = self.rng.choice(givers) if category.name == "Dízimo" else None
+                    incomes.append(Income(
+                        date=min(day + timedelta(days=self.rng.randint(0, 6)), self.end_date),
+                        amount=Decimal(self.rng.randint(1000, 150000)) / 100,
+                        description=f"{category.name} {member.name if member else 'do culto'}",
+                        category=category, church=church, member=member,
+                        payment_method=self.rng.choice(methods),
+                    ))
+                if day.day <= 7: # Despesas fixas uma vez por mês
+                    for category in expense_categories:
+                        expenses.append(Expense(
+                            date=day, amount=Decimal(self.rng.randint(5000, 400000)) / 100,
+                            description=f"{category.name} {day:%m/%Y}", category=category, church=church,
+                            payment_method=self.rng.choice(methods),
+                        ))
+                day += timedelta(days=7)
+        self._create(Income, incomes)
+        self._create(Expense, expenses)
+        return len(incomes), len(expenses)
+
+    def _school(self, members, class_count, students_per_class, weeks):
+        teachers = self.rng.sample(members, min(class_count, len(members)))
+        classes = self._create(SchoolClass, [
+            SchoolClass(name=CLASS_NAMES[i % len(CLASS_NAMES)] + (f" {i // len(CLASS_NAMES) + 1}" if i >= len(CLASS_NAMES) else ""),
+                        teacher=teachers[i] if i < len(teachers) else None, room=f"Sala {i + 1}",
+                        schedule="Domingo 09:00", max_students=students_per_class + 5)
+            for i in range(class_count)
+        ])
+        pool = self.rng.sample(members, min(len(members), class_count * students_per_class))
+        students = self._create(Student, [
+            Student(member=member, school_class=classes[i % len(classes)]) for i, member in enumerate(pool)
+        ]) if classes else []
+
+        # Domingos das últimas semanas; cada aluno tem a sua assiduidade
+        last_sunday = self.end_date - timedelta(days=(self.end_date.weekday() + 1) % 7)
+        assiduity = {student.pk: self.rng.uniform(0.4, 0.95) for student in students}
+        attendances = [
+            Attendance(student=student, school_class_id=student.school_class_id, date=last_sunday - timedelta(weeks=week),
+                       present=self.rng.random() < assiduity[student.pk])
+            for week in range(weeks) for student in students
+        ]
+        self._create(Attendance, attendances)
+        return len(attendances)
+
+    def _events(self, churches, count):
+        types = list(EVENT_TITLES)
+        events = []
+        for _ in range(count):
+            events_type = self.rng.choice(types)
+            events.append(Event(
+                title=EVENT_TITLES[events_type], events_type=events_type, church=self.rng.choice(churches),
+                date=self.end_date + timedelta(days=self.rng.randint(-365, 180)),
+                time=self.rng.choice([None, "09:00", "19:00", "19:30"]),
+            ))
+        # Cultos fixos de cada igreja: regras de repetição, não uma linha por semana
+        month_start = self._days_ago(365).replace(day=1)
+        first_sunday = month_start + timedelta(days=(6 - month_start.weekday()) % 7)
+        for church in churches:
+            events.append(Event(title="Culto de Domingo", events_type="culto", church=church, date=first_sunday,
+                                time="19:00", recurrence=Event.RECURRENCE_WEEKLY))
+            events.append(Event(title="Santa Ceia", events_type="culto", church=church, date=first_sunday,
+                                time="09:00", recurrence=Event.RECURRENCE_MONTHLY_WEEKDAY))
+        self._create(Event, events)
+        return len(events)
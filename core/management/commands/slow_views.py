@@ -0,0 +1,96 @@
+import json
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.models import RequestProfile
+
+DEFAULT_APPS = ["dashboard", "finances", "reports", "school"]
+FIELDS = ["view_name", "total_time", "sql_time", "render_time", "query_count", "duplicate_count"]
+
+
+def percentile(values, pct):
+    """Percentil por interpolação linear (values já ordenado)."""
+    if not values:
+        return 0
+    position = (len(values) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+class Command(BaseCommand):
+    help = (
+        "Resume os perfis de requisição (QUERY_PROFILING): views mais lentas com p50/p95 "
+        "do tempo total, tempo de SQL, consultas e consultas repetidas (N+1)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--apps", nargs="+", default=DEFAULT_APPS,
+                            help="Namespaces de URL considerados (padrão: %(default)s). Use 'all' para todos.")
+        parser.add_argument("--days", type=int, default=7, help="Considera os perfis dos últimos N dias.")
+        parser.add_argument("--limit", type=int, default=20, help="Quantidade de views listadas.")
+        parser.add_argument("--log", help="Lê os perfis de um arquivo do QUERY_PROFILING_SINK=log em vez da tabela.")
+        parser.add_argument("--duplicates", action="store_true", help="Mostra as consultas repetidas de cada view.")
+
+    def handle(self, *args, **options):
+        apps = None if "all" in options["apps"] else tuple(f"{app}:" for app in options["apps"])
+        profiles = self._from_log(options["log"]) if options["log"] else self._from_table(options["days"])
+
+        views = {}
+        for profile in profiles:
+            if apps and not profile["view_name"].startswith(apps):
+                continue
+            views.setdefault(profile["view_name"], []).append(profile)
+        if not views:
+            self.stdout.write("Nenhum perfil encontrado. Ative QUERY_PROFILING=True e navegue pelo sistema.")
+            return
+
+        rows = [self._summary(name, items) for name, items in views.items()]
+        rows.sort(key=lambda row: row["p95"], reverse=True)
+
+        header = f"{'View':<45} {'Req.':>6} {'p50 ms':>9} {'p95 ms':>9} {'SQL p95':>9} {'Render p95':>10} {'Consultas':>9} {'Repetidas':>9}"
+        self.stdout.write(self.style.MIGRATE_HEADING(header))
+        for row in rows[:options["limit"]]:
+            line = (f"{row['view_name'][:45]:<45} {row['requests']:>6} {row['p50']:>9.1f} {row['p95']:>9.1f} "
+                    f"{row['sql_p95']:>9.1f} {row['render_p95']:>10.1f} {row['queries']:>9.0f} {row['duplicates']:>9}")
+            self.stdout.write(self.style.WARNING(line) if row["duplicates"] else line)
+            if options["duplicates"]:
+                for sql, count in row["duplicate_sql"]:
+                    self.stdout.write(f"    {count}x {sql[:150]}")
+
+    def _from_table(self, days):
+        since = timezone.now() - timedelta(days=days)
+        queryset = RequestProfile.objects.filter(created_at__gte=since).values(*FIELDS, "duplicates")
+        return queryset.iterator(chunk_size=2000)
+
+    def _from_log(self, path):
+        try:
+            with open(path, encoding="utf-8") as log:
+                for line in log:
+                    if line.strip():
+                        yield json.loads(line)
+        except OSError as exc:
+            raise CommandError(str(exc))
+
+    def _summary(self, name, items):
+        def values(field):
+            return sorted(item[field] for item in items)
+
+        total = values("total_time")
+        duplicate_sql = {}
+        for item in items:
+            for sql, count in item.get("duplicates") or []:
+                duplicate_sql[sql] = max(duplicate_sql.get(sql, 0), count)
+        return {
+            "view_name": name,
+            "requests": len(items),
+            "p50": percentile(total, 50),
+            "p95": percentile(total, 95),
+            "sql_p95": percentile(values("sql_time"), 95),
+            "render_p95": percentile(values("render_time"), 95),
+            "queries": percentile(values("query_count"), 50),
+            "duplicates": max(item["duplicate_count"] for item in items),
+            "duplicate_sql": sorted(duplicate_sql.items(), key=lambda item: item[1], reverse=True)[:5],
+        }
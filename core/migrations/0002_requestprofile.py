@@ -0,0 +1,35 @@
+# Generated by Django 5.2.1 on 2026-10-17 23:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Registrado em')),
+                ('method', models.CharField(max_length=10, verbose_name='Método')),
+                ('path', models.CharField(max_length=500, verbose_name='Caminho')),
+                ('view_name', models.CharField(db_index=True, max_length=200, verbose_name='View')),
+                ('status_code', models.PositiveSmallIntegerField(verbose_name='Status')),
+                ('total_time', models.FloatField(verbose_name='Tempo total (ms)')),
+                ('sql_time', models.FloatField(verbose_name='Tempo de SQL (ms)')),
+                ('render_time', models.FloatField(verbose_name='Tempo de renderização (ms)')),
+                ('query_count', models.PositiveIntegerField(verbose_name='Consultas')),
+                ('duplicate_count', models.PositiveIntegerField(verbose_name='Consultas repetidas')),
+                ('duplicates', models.JSONField(blank=True, default=list, verbose_name='Consultas repetidas (SQL, vezes)')),
+            ],
+            options={
+                'verbose_name': 'Perfil de Requisição',
+                'verbose_name_plural': 'Perfis de Requisição',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
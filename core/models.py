@@ -20,5 +20,26 @@ class ChurchConfiguration(models.Model):
             raise ValidationError("Só pode existir uma configuração de igreja. Edite a existente.")
         return super(ChurchConfiguration, self).save(*args, **kwargs)
 
-# Create your models here.
+
+# Perfil de uma requisição (gravado por core.profiling quando QUERY_PROFILING está ativo)
+class RequestProfile(models.Model):
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True, verbose_name="Registrado em")
+    method = models.CharField(max_length=10, verbose_name="Método")
+    path = models.CharField(max_length=500, verbose_name="Caminho")
+    view_name = models.CharField(max_length=200, db_index=True, verbose_name="View")
+    status_code = models.PositiveSmallIntegerField(verbose_name="Status")
+    total_time = models.FloatField(verbose_name="Tempo total (ms)")
+    sql_time = models.FloatField(verbose_name="Tempo de SQL (ms)")
+    render_time = models.FloatField(verbose_name="Tempo de renderização (ms)")
+    query_count = models.PositiveIntegerField(verbose_name="Consultas")
+    duplicate_count = models.PositiveIntegerField(verbose_name="Consultas repetidas")
+    duplicates = models.JSONField(default=list, blank=True, verbose_name="Consultas repetidas (SQL, vezes)")
+
+    def __str__(self):
+        return f"{self.method} {self.path} - {self.total_time:.0f} ms, {self.query_count} consultas"
+
+    class Meta:
+        verbose_name = "Perfil de Requisição"
+        verbose_name_plural = "Perfis de Requisição"
+        ordering = ["-created_at"]
 
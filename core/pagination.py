@@ -0,0 +1,70 @@
+"""
+Paginação por chave (keyset) sobre (data, id).
+
+Em vez de OFFSET, cada página é buscada a partir do último registro exibido
+("after") ou do primeiro ("before"), então o custo não cresce com o número da
+página. O cursor tem o formato "AAAA-MM-DD_<id>" ou, para campos de data e
+hora, "AAAA-MM-DDTHH:MM:SS.ffffffZ_<id>" (em UTC, sem "+" para não virar
+espaço na URL).
+"""
+from datetime import date, datetime, timezone
+
+from django.db.models import Q
+
+
+class KeysetPage:
+    def __init__(self, object_list, has_next, has_previous, date_field):
+        self.object_list = object_list
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.next_cursor = _cursor(object_list[-1], date_field) if object_list else None
+        self.previous_cursor = _cursor(object_list[0], date_field) if object_list else None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def _cursor(obj, date_field):
+    value = getattr(obj, date_field)
+    if isinstance(value, datetime):
+        return f"{value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")}_{obj.pk}"
+    return f"{value.isoformat()}_{obj.pk}"
+
+
+def _parse_cursor(value):
+    try:
+        day, pk = value.split("_")
+        return datetime.fromisoformat(day) if "T" in day else date.fromisoformat(day), int(pk)
+    except (AttributeError, ValueError):
+        return None
+
+
+def keyset_paginate(queryset, params, page_size=50, date_field="date", descending=True):
+    """
+    Retorna a KeysetPage indicada por params["after"] ou params["before"]
+    (ex.: request.GET). Sem cursor, retorna a primeira página.
+    """
+    after = _parse_cursor(params.get("after"))
+    before = None if after else _parse_cursor(params.get("before"))
+    forward_order = (f"-{date_field}", "-pk") if descending else (date_field, "pk")
+    backward_order = (date_field, "pk") if descending else (f"-{date_field}", "-pk")
+    past, future = ("lt", "gt") if descending else ("gt", "lt")
+
+    if before:
+        day, pk = before
+        rows = list(queryset.filter(
+            Q(**{f"{date_field}__{future}": day}) | Q(**{date_field: day, f"pk__{future}": pk})
+        ).order_by(*backward_order)[:page_size + 1])
+        has_previous = len(rows) > page_size
+        return KeysetPage(rows[:page_size][::-1], True, has_previous, date_field)
+
+    if after:
+        day, pk = after
+        queryset = queryset.filter(
+            Q(**{f"{date_field}__{past}": day}) | Q(**{date_field: day, f"pk__{past}": pk})
+        )
+    rows = list(queryset.order_by(*forward_order)[:page_size + 1])
+    return KeysetPage(rows[:page_size], len(rows) > page_size, bool(after), date_field)
@@ -0,0 +1,150 @@
+"""
+Perfil de requisições (opcional, QUERY_PROFILING=True).
+
+Para cada requisição o middleware registra quantas consultas foram feitas, o
+tempo gasto no banco (via connection.execute_wrapper, sem depender de DEBUG),
+o tempo de renderização dos templates e as consultas repetidas: o SQL é
+reduzido a uma "impressão digital" (literais e listas do IN trocados por ?),
+e a mesma impressão executada várias vezes na mesma requisição costuma ser um
+N+1. O resultado vai para a tabela core.RequestProfile (mantida com no máximo
+QUERY_PROFILING_MAX_ROWS linhas) ou, com QUERY_PROFILING_SINK="log", para o
+logger core.profiling em JSON. O comando slow_views resume os dados.
+"""
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.base import Template
+
+logger = logging.getLogger(__name__)
+
+MAX_DUPLICATES = 10 # Impressões repetidas guardadas por requisição
+TRIM_EVERY = 100 # A cada quantas gravações os perfis excedentes são descartados
+
+_current = ContextVar("request_profile", default=None)
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_NUMBERS = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r"\bIN\s*\((?:\s*(?:\?|%s)\s*,?)+\)", re.IGNORECASE)
+
+
+def fingerprint(sql):
+    """SQL sem os valores: duas consultas iguais a menos dos parâmetros têm a mesma impressão."""
+    sql = _STRINGS.sub("?", sql)
+    sql = _NUMBERS.sub("?", sql)
+    sql = _IN_LISTS.sub("IN (...)", sql)
+    return " ".join(sql.split())
+
+
+class _Profile:
+    def __init__(self):
+        self.queries = Counter()
+        self.sql_time = 0.0
+        self.render_time = 0.0
+        self.render_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - started
+            self.queries[fingerprint(sql)] += 1
+
+    def duplicates(self):
+        return [[sql, count] for sql, count in self.queries.most_common() if count > 1]
+
+
+def _instrumented_render(render):
+    # include/extends renderizam templates dentro de templates: só o mais externo conta o tempo
+    def wrapper(self, context):
+        profile = _current.get()
+        if profile is None:
+            return render(self, context)
+        profile.render_depth += 1
+        started = time.perf_counter()
+        try:
+            return render(self, context)
+        finally:
+            profile.render_depth -= 1
+            if not profile.render_depth:
+                profile.render_time += time.perf_counter() - started
+    wrapper.profiled = True
+    return wrapper
+
+
+class QueryProfilingMiddleware:
+    def __init__(self, get_response):
+        if not settings.QUERY_PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.saved = 0
+        # Arquivos estáticos e uploads não passam pelo perfil
+        self.skip_prefixes = tuple("/" + p.lstrip("/") for p in (settings.STATIC_URL, settings.MEDIA_URL) if p)
+        if not getattr(Template._render, "profiled", False):
+            Template._render = _instrumented_render(Template._render)
+
+    def __call__(self, request):
+        if request.path.startswith(self.skip_prefixes):
+            return self.get_response(request)
+        profile = _Profile()
+        token = _current.set(profile)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile))
+                response = self.get_response(request)
+                # TemplateResponse só renderiza depois das views; força aqui para medir junto
+                if hasattr(response, "render") and not getattr(response, "is_rendered", True):
+                    response.render()
+        finally:
+            _current.reset(token)
+        self.record(request, response, profile, time.perf_counter() - started)
+        return response
+
+    def record(self, request, response, profile, elapsed):
+        match = request.resolver_match
+        duplicates = profile.duplicates()
+        data = {
+            "method": request.method,
+            "path": request.path[:500],
+            "view_name": (match.view_name if match else request.path)[:200],
+            "status_code": response.status_code,
+            "total_time": round(elapsed * 1000, 2),
+            "sql_time": round(profile.sql_time * 1000, 2),
+            "render_time": round(profile.render_time * 1000, 2),
+            "query_count": sum(profile.queries.values()),
+            "duplicate_count": sum(count - 1 for _, count in duplicates),
+            "duplicates": duplicates[:MAX_DUPLICATES],
+        }
+        if settings.QUERY_PROFILING_SINK == "log":
+            logger.info(json.dumps(data, ensure_ascii=False))
+            return
+        from .models import RequestProfile
+
+        try:
+            RequestProfile.objects.create(**data)
+            self.saved += 1
+            if self.saved % TRIM_EVERY == 0:
+                trim_profiles()
+        except Exception:
+            # O perfil nunca deve derrubar a requisição (ex.: migração ainda não aplicada)
+            logger.exception("Falha ao gravar o perfil da requisição %s", request.path)
+
+
+def trim_profiles(max_rows=None):
+    """Descarta os perfis mais antigos além de QUERY_PROFILING_MAX_ROWS."""
+    from .models import RequestProfile
+
+    max_rows = settings.QUERY_PROFILING_MAX_ROWS if max_rows is None else max_rows
+    cutoff = list(RequestProfile.objects.order_by("-id").values_list("id", flat=True)[max_rows:max_rows + 1])
+    if not cutoff:
+        return 0
+    return RequestProfile.objects.filter(id__lte=cutoff[0]).delete()[0]
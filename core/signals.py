@@ -0,0 +1,17 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import Signal
+
+from .models import ChurchConfiguration
+from . import config
+
+# Enviado pelo core.importer após gravar cada bloco com bulk_create (que não dispara post_save).
+# Argumentos: objects (instâncias criadas)
+rows_imported = Signal()
+
+
+def invalidate_church_configuration(sender, **kwargs):
+    config.invalidate()
+
+
+post_save.connect(invalidate_church_configuration, sender=ChurchConfiguration, dispatch_uid="core_config_save")
+post_delete.connect(invalidate_church_configuration, sender=ChurchConfiguration, dispatch_uid="core_config_delete")
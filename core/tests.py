@@ -1,3 +1,25 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
 
-# Create your tests here.
+from core import benchmarks
+
+
+class QueryBudgetTests(TestCase):
+    """Os limites de consultas de core.benchmarks valem também no manage.py test (guarda contra N+1)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command("seed_data", "--members=60", "--years=1", "--churches=2", "--classes=2",
+                     "--students-per-class=8", "--attendance-weeks=4", "--events=20",
+                     "--incomes-per-week=5", "--seed=7", verbosity=0)
+        cls.user = get_user_model().objects.create_superuser("benchmark", "benchmark@example.com", "senha")
+
+    def test_views_stay_within_query_budget(self):
+        client = Client()
+        client.force_login(self.user)
+        for case in benchmarks.cases():
+            with self.subTest(case.name):
+                result = benchmarks.run_case(client, case, repeat=0)
+                self.assertEqual(result["status"], 200)
+                self.assertLessEqual(result["queries"], case.max_queries)
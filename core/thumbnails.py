@@ -0,0 +1,91 @@
+"""
+Miniaturas das fotos enviadas (Member.photo, CustomUser.profile_image).
+
+Fotos de celular chegam com vários MB; as listas exibem só um avatar de 40px.
+Ao salvar um registro com foto nova, sync_thumbnail() gera uma miniatura
+quadrada de THUMBNAIL_SIZE px (WebP, ou JPEG se o Pillow não tiver suporte a
+WebP) ao lado do original ("foto.jpg" -> "foto_jpg_thumb.webp", mantendo a
+extensão para foto.jpg e foto.png não disputarem o mesmo arquivo) e grava o
+caminho no campo de miniatura com um UPDATE direto, sem disparar o save() de
+novo. O arquivo é gravado pelo storage com um nome livre (nunca sobrescreve a
+miniatura de outro registro) e só a miniatura anterior do próprio registro é
+apagada. Os templates usam a miniatura e caem no original enquanto ela não
+existir; o comando generate_thumbnails gera as que faltam para fotos antigas.
+"""
+import logging
+import os
+import re
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_SIZE = 128 # px (lado do quadrado); 2x o maior avatar exibido nas listas
+THUMBNAIL_QUALITY = 80
+THUMBNAIL_FORMAT, THUMBNAIL_EXTENSION = ("WEBP", "webp") if features.check("webp") else ("JPEG", "jpg")
+
+
+def thumbnail_name(name):
+    """Caminho da miniatura de um arquivo: member_photos/foto.jpg -> member_photos/foto_jpg_thumb.webp."""
+    root, extension = os.path.splitext(name)
+    suffix = f"_{extension[1:].lower()}" if extension else ""
+    return f"{root}{suffix}_thumb.{THUMBNAIL_EXTENSION}"
+
+
+def is_thumbnail_of(name, source_name):
+    """name é a miniatura de source_name (inclusive com o sufixo aleatório que o storage acrescenta)?"""
+    root, extension = os.path.splitext(thumbnail_name(source_name))
+    return bool(name) and re.fullmatch(rf"{re.escape(root)}(_[A-Za-z0-9]{{7}})?{re.escape(extension)}", name) is not None
+
+
+def _delete_own(instance, thumbnail_field, thumbnail):
+    """Apaga a miniatura do registro, a não ser que outro registro aponte para o mesmo arquivo."""
+    shared = type(instance)._default_manager.filter(**{thumbnail_field: thumbnail.name}).exclude(pk=instance.pk).exists()
+    if not shared:
+        thumbnail.storage.delete(thumbnail.name)
+
+
+def render_thumbnail(fileobj):
+    """Bytes da miniatura: corrige a rotação do EXIF, recorta ao centro e reduz."""
+    with Image.open(fileobj) as image:
+        image = ImageOps.exif_transpose(image)
+        image.draft("RGB", (THUMBNAIL_SIZE * 2, THUMBNAIL_SIZE * 2)) # JPEG: decodifica já reduzido
+        thumbnail = ImageOps.fit(image.convert("RGB"), (THUMBNAIL_SIZE, THUMBNAIL_SIZE), Image.Resampling.LANCZOS)
+    output = BytesIO()
+    thumbnail.save(output, THUMBNAIL_FORMAT, quality=THUMBNAIL_QUALITY, optimize=True)
+    return output.getvalue()
+
+
+def sync_thumbnail(instance, source_field, thumbnail_field, force=False):
+    """
+    Gera (ou remove) a miniatura de instance.<source_field>. Retorna True se o
+    campo de miniatura mudou. Fotos ilegíveis são registradas no log e ignoradas.
+    """
+    source = getattr(instance, source_field)
+    thumbnail = getattr(instance, thumbnail_field)
+    if not source:
+        if not thumbnail:
+            return False
+        _delete_own(instance, thumbnail_field, thumbnail)
+        name = ""
+    else:
+        if is_thumbnail_of(thumbnail.name, source.name) and not force:
+            return False
+        try:
+            source.open("rb")
+            try:
+                content = render_thumbnail(source)
+            finally:
+                source.close()
+        except (OSError, UnidentifiedImageError, Image.DecompressionBombError, ValueError) as exc:
+            logger.warning("Não foi possível gerar a miniatura de %s: %s", source.name, exc)
+            return False
+        if thumbnail.name:
+            _delete_own(instance, thumbnail_field, thumbnail)
+        # storage.save escolhe um nome livre: nunca grava por cima de um arquivo existente
+        name = thumbnail.storage.save(thumbnail_name(source.name), ContentFile(content))
+    setattr(instance, thumbnail_field, name)
+    type(instance)._default_manager.filter(pk=instance.pk).update(**{thumbnail_field: name})
+    return True
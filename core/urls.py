@@ -5,5 +5,6 @@ app_name = "core"
 
 urlpatterns = [
     path("configuracao-igreja/", views.church_configuration_view, name="church_config"),
+    path("importar/", views.import_data, name="import_data"),
 ]
 
@@ -4,20 +4,25 @@ from django.contrib.auth.decorators import login_required # Ou LoginRequiredMixi
 from django.contrib.admin.views.decorators import staff_member_required # Para restringir a admins
 from django.views.generic import UpdateView, CreateView
 from django.contrib import messages
+from django.core.exceptions import PermissionDenied
 from .models import ChurchConfiguration
-from .forms import ChurchConfigurationForm
+from .config import church_configuration
+from .forms import ChurchConfigurationForm, ImportForm
+from .importer import ImportFileError, importers, read_rows
 
 # Create your views here.
 
 @login_required
 # @staff_member_required # Descomente se apenas staff/admin pode configurar
 def church_configuration_view(request):
-    # Tenta obter a configuração existente ou cria uma nova se não existir (para o primeiro acesso)
-    # A lógica de singleton no model impede múltiplas criações diretas, mas aqui garantimos que sempre haja uma para editar.
-    config, created = ChurchConfiguration.objects.get_or_create(
-        pk=1, # Assumindo que sempre usaremos pk=1 para a única configuração
-        defaults={'church_name': 'Minha Igreja (Edite este Nome)'} # Valor padrão inicial
-    )
+    # Configuração existente ou, no primeiro acesso, uma nova que só é gravada ao salvar o formulário.
+    # A lógica de singleton no model impede múltiplas criações diretas.
+    # No POST lê do banco: o formulário altera a instância, e a do cache é compartilhada pelo processo.
+    if request.method == 'POST':
+        config = ChurchConfiguration.objects.first()
+    else:
+        config = church_configuration(request)
+    config = config or ChurchConfiguration(church_name='Minha Igreja (Edite este Nome)')
     
     if request.method == 'POST':
         form = ChurchConfigurationForm(request.POST, request.FILES, instance=config)
@@ -33,3 +38,37 @@ def church_configuration_view(request):
     return render(request, "core/church_configuration_form.html", {"form": form, "config": config})
 
 
+@login_required
+def import_data(request):
+    available = importers()
+    choices = [(key, importer.label) for key, importer in available.items()
+               if request.user.has_perm(importer.permission)]
+    if not choices:
+        raise PermissionDenied
+    result = None
+    importer = None
+    if request.method == "POST":
+        form = ImportForm(request.POST, request.FILES, importer_choices=choices)
+        if form.is_valid():
+            upload = form.cleaned_data["arquivo"]
+            importer = available[form.cleaned_data["tipo"]](dry_run=form.cleaned_data["dry_run"])
+            try:
+                result = importer.run(read_rows(upload, upload.name))
+            except ImportFileError as exc:
+                form.add_error("arquivo", str(exc))
+            else:
+                if importer.dry_run:
+                    messages.info(request, f"Validação concluída: {result.imported} de {result.total} linhas sem erros.")
+                elif result.imported:
+                    messages.success(request, f"{result.imported} de {result.total} linhas importadas com sucesso.")
+                else:
+                    messages.error(request, "Nenhuma linha importada. Verifique os erros abaixo.")
+    else:
+        form = ImportForm(initial={"tipo": request.GET.get("tipo")}, importer_choices=choices)
+
+    return render(request, "core/import_form.html", {
+        "form": form,
+        "result": result,
+        "importer": importer,
+        "active_menu": "import",
+    })
@@ -0,0 +1,39 @@
+from django import forms
+
+
+class AutocompleteSelect(forms.Widget):
+    """
+    Substitui o <select> de um ModelChoiceField por uma caixa de busca que
+    consulta um endpoint JSON ({"results": [{"id": ..., "name": ...}]}) enquanto
+    o usuário digita. Só o item selecionado é lido do banco para exibição; as
+    opções nunca são renderizadas na página.
+    """
+    template_name = "core/widgets/autocomplete_select.html"
+    min_chars = 2
+    delay = 300 # ms de espera após a última tecla antes de consultar
+
+    def __init__(self, url, attrs=None, placeholder="Digite para buscar..."):
+        super().__init__(attrs)
+        self.url = url
+        self.placeholder = placeholder
+
+    def _selected_label(self, value):
+        queryset = getattr(getattr(self, "choices", None), "queryset", None)
+        if value in (None, "") or queryset is None:
+            return ""
+        try:
+            obj = queryset.filter(pk=value).first()
+        except (ValueError, TypeError):
+            return ""
+        return str(obj) if obj else ""
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context["widget"].update({
+            "url": str(self.url),
+            "placeholder": self.placeholder,
+            "label": self._selected_label(value),
+            "min_chars": self.min_chars,
+            "delay": self.delay,
+        })
+        return context
@@ -0,0 +1,94 @@
+"""
+Registro de atividades recentes (dashboard.models.Activity).
+
+Cada membro, entrada, saída ou evento cadastrado (e cada evento alterado)
+grava uma linha no registro pelos signals de dashboard.signals; importações
+de planilha gravam em bloco pelo sinal rows_imported. A linha guarda a igreja,
+o usuário que fez a alteração e uma cópia do que o feed exibe, então o feed do
+dashboard é uma única consulta com LIMIT pelo índice (created_at, id) ou
+(church, created_at, id), e o histórico completo é paginado por chave.
+
+O usuário vem do ActivityActorMiddleware, que guarda request.user num
+ContextVar durante a requisição; fora de uma requisição (comandos, shell)
+fica vazio, a não ser que o registro tenha created_by.
+"""
+from contextvars import ContextVar
+
+from events.models import Event
+from finances.models import Expense, Income
+from members.models import Member
+from .models import Activity
+
+RECENT_ACTIVITY_LIMIT = 5
+ACTIVITY_BATCH_SIZE = 1000
+
+_actor = ContextVar("activity_actor", default=None)
+
+
+class ActivityActorMiddleware:
+    """Deixa o usuário da requisição disponível para os signals do registro."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _actor.set(getattr(request, "user", None))
+        try:
+            return self.get_response(request)
+        finally:
+            _actor.reset(token)
+
+
+def current_actor_id():
+    user = _actor.get()
+    return user.pk if user is not None and user.is_authenticated else None
+
+
+def activity_type(model, created):
+    """Tipo da atividade para um save de model (None: não registrado)."""
+    if model is Event:
+        return Activity.EVENT_CREATED if created else Activity.EVENT_UPDATED
+    if not created:
+        return None
+    return {Member: Activity.NEW_MEMBER, Income: Activity.INCOME, Expense: Activity.EXPENSE}.get(model)
+
+
+def build(type, instance):
+    """Activity (não salva) para instance, com o horário do próprio registro quando for um cadastro."""
+    activity = Activity(type=type, church_id=instance.church_id, object_id=instance.pk,
+                        actor_id=current_actor_id() or getattr(instance, "created_by_id", None))
+    if type == Activity.EVENT_UPDATED:
+        activity.created_at = instance.updated_at
+    elif instance.created_at:
+        activity.created_at = instance.created_at
+    if isinstance(instance, Member):
+        activity.summary = instance.name
+    elif isinstance(instance, Event):
+        activity.summary, activity.event_date = instance.title, instance.date
+    else:
+        activity.summary, activity.amount = instance.description, instance.amount
+    activity.summary = activity.summary[:255]
+    return activity
+
+
+def record(model, instance, created):
+    type = activity_type(model, created)
+    if type:
+        build(type, instance).save()
+
+
+def record_many(model, objects):
+    """Registra de uma vez os cadastros feitos com bulk_create (importação, seed_data)."""
+    type = activity_type(model, True)
+    if type:
+        Activity.objects.bulk_create((build(type, obj) for obj in objects), batch_size=ACTIVITY_BATCH_SIZE)
+
+
+def for_church(church_id=None):
+    activities = Activity.objects.select_related("church", "actor")
+    return activities.filter(church_id=church_id) if church_id else activities
+
+
+def recent(church_id=None, limit=RECENT_ACTIVITY_LIMIT):
+    """As últimas atividades (de uma igreja ou de todas) numa consulta só."""
+    return list(for_church(church_id).order_by("-created_at", "-id")[:limit])
@@ -1,3 +1,22 @@
 from django.contrib import admin
 
 # Register your models here.
+from .models import Activity
+
+
+@admin.register(Activity)
+class ActivityAdmin(admin.ModelAdmin):
+    list_display = ["created_at", "type", "summary", "church", "actor"]
+    list_filter = ["type", "church"]
+    search_fields = ["summary"]
+    list_select_related = ["church", "actor"]
+
+    # Registro somente de inclusão: gravado pelos signals, não pelo admin
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.core import checks
 
 
 class DashboardConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'dashboard'
+
+    def ready(self):
+        from . import signals  # Invalidação do cache do dashboard e registro de atividades
+        from core.checks import shared_cache_check
+        checks.register(shared_cache_check("dashboard"), checks.Tags.caches)
@@ -0,0 +1,53 @@
+"""
+Cache do snapshot do dashboard.
+
+O contexto calculado por dashboard.views._build_snapshot fica no cache por
+escopo (igreja ou "all") e por dia, durante DASHBOARD_CACHE_TIMEOUT segundos.
+Qualquer alteração em membros, igrejas, finanças ou eventos troca a versão
+(ver dashboard.signals), o que invalida todos os snapshots de uma vez.
+
+A versão fica no cache padrão, então ele precisa ser compartilhado por todos os
+processos (workers do gunicorn, run_report_jobs): com um cache por processo a
+troca de versão só valeria para quem gravou. O check dashboard.E001 recusa o
+LocMemCache fora do DEBUG.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+VERSION_KEY = "dashboard:version"
+HITS_KEY = "dashboard:hits"
+MISSES_KEY = "dashboard:misses"
+
+
+def _version():
+    return cache.get_or_set(VERSION_KEY, time.time_ns(), None)
+
+
+def invalidate():
+    cache.set(VERSION_KEY, time.time_ns(), None)
+
+
+def _count(key):
+    if not cache.add(key, 1, None):
+        cache.incr(key)
+
+
+def get_snapshot(scope, today, builder):
+    """Retorna (contexto, veio_do_cache), calculando com builder() em caso de miss."""
+    key = f"dashboard:snapshot:{_version()}:{scope}:{today.isoformat()}"
+    snapshot = cache.get(key)
+    if snapshot is not None:
+        _count(HITS_KEY)
+        return snapshot, True
+    _count(MISSES_KEY)
+    snapshot = builder()
+    cache.set(key, snapshot, settings.DASHBOARD_CACHE_TIMEOUT)
+    return snapshot, False
+
+
+def hit_ratio():
+    stats = cache.get_many([HITS_KEY, MISSES_KEY])
+    hits, misses = stats.get(HITS_KEY, 0), stats.get(MISSES_KEY, 0)
+    return hits / (hits + misses) if hits + misses else 0.0
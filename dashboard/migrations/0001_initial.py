@@ -0,0 +1,76 @@
+# Generated by Django 5.2.1 on 2026-10-17 23:42
+
+from datetime import timedelta
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def fill_activity_log(apps, schema_editor):
+    # Cadastros já existentes entram no registro com o horário em que foram criados
+    Activity = apps.get_model("dashboard", "Activity")
+    sources = [
+        ("new_member", apps.get_model("members", "Member").objects.all(), "created_at",
+         lambda obj: {"summary": obj.name, "actor_id": obj.created_by_id}),
+        ("income", apps.get_model("finances", "Income").objects.all(), "created_at",
+         lambda obj: {"summary": obj.description, "amount": obj.amount}),
+        ("expense", apps.get_model("finances", "Expense").objects.all(), "created_at",
+         lambda obj: {"summary": obj.description, "amount": obj.amount}),
+        ("event_created", apps.get_model("events", "Event").objects.all(), "created_at",
+         lambda obj: {"summary": obj.title, "event_date": obj.date}),
+        # updated_at e created_at do cadastro diferem por microssegundos: só conta alteração depois de 1 s
+        ("event_updated", apps.get_model("events", "Event").objects.filter(updated_at__gt=F("created_at") + timedelta(seconds=1)),
+         "updated_at",
+         lambda obj: {"summary": obj.title, "event_date": obj.date}),
+    ]
+    for type, queryset, timestamp, fields in sources:
+        batch = []
+        for obj in queryset.order_by("pk").iterator(chunk_size=2000):
+            values = fields(obj)
+            values["summary"] = values["summary"][:255]
+            batch.append(Activity(type=type, church_id=obj.church_id, object_id=obj.pk,
+                                  created_at=getattr(obj, timestamp), **values))
+            if len(batch) == 1000:
+                Activity.objects.bulk_create(batch)
+                batch = []
+        Activity.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('churches', '0001_initial'),
+        ('events', '0005_event_recurrence'),
+        ('finances', '0006_dailybalance'),
+        ('members', '0008_member_birthday_key'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Activity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='Registrado em')),
+                ('type', models.CharField(choices=[('new_member', 'Novo membro'), ('income', 'Entrada'), ('expense', 'Saída'), ('event_created', 'Evento criado'), ('event_updated', 'Evento atualizado')], max_length=20, verbose_name='Tipo')),
+                ('object_id', models.PositiveBigIntegerField(blank=True, null=True, verbose_name='ID do Registro')),
+                ('summary', models.CharField(max_length=255, verbose_name='Resumo')),
+                ('amount', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True, verbose_name='Valor')),
+                ('event_date', models.DateField(blank=True, null=True, verbose_name='Data do Evento')),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='activities', to=settings.AUTH_USER_MODEL, verbose_name='Usuário')),
+                ('church', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='activities', to='churches.church', verbose_name='Igreja')),
+            ],
+            options={
+                'verbose_name': 'Atividade',
+                'verbose_name_plural': 'Atividades',
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['created_at', 'id'], name='activity_created_idx'), models.Index(fields=['church', 'created_at', 'id'], name='activity_church_created_idx')],
+            },
+        ),
+        migrations.RunPython(fill_activity_log, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,48 @@
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+from churches.models import Church
+
+
+# Registro de atividades (somente inclusão), gravado pelos signals em dashboard.signals
+class Activity(models.Model):
+    NEW_MEMBER = "new_member"
+    INCOME = "income"
+    EXPENSE = "expense"
+    EVENT_CREATED = "event_created"
+    EVENT_UPDATED = "event_updated"
+    TYPE_CHOICES = [
+        (NEW_MEMBER, "Novo membro"),
+        (INCOME, "Entrada"),
+        (EXPENSE, "Saída"),
+        (EVENT_CREATED, "Evento criado"),
+        (EVENT_UPDATED, "Evento atualizado"),
+    ]
+
+    created_at = models.DateTimeField(default=timezone.now, editable=False, verbose_name="Registrado em")
+    type = models.CharField(max_length=20, choices=TYPE_CHOICES, verbose_name="Tipo")
+    church = models.ForeignKey(Church, on_delete=models.SET_NULL, null=True, blank=True, related_name="activities", verbose_name="Igreja")
+    actor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="activities", verbose_name="Usuário")
+    object_id = models.PositiveBigIntegerField(null=True, blank=True, verbose_name="ID do Registro")
+    # Cópia do que é exibido, para o feed não depender do registro original (que pode ter sido excluído)
+    summary = models.CharField(max_length=255, verbose_name="Resumo")
+    amount = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, verbose_name="Valor")
+    event_date = models.DateField(null=True, blank=True, verbose_name="Data do Evento")
+
+    def __str__(self):
+        return f"{self.get_type_display()}: {self.summary}"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("O registro de atividades só aceita inclusões.")
+        return super().save(*args, **kwargs)
+
+    class Meta:
+        verbose_name = "Atividade"
+        verbose_name_plural = "Atividades"
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="activity_created_idx"),
+            models.Index(fields=["church", "created_at", "id"], name="activity_church_created_idx"),
+        ]
@@ -0,0 +1,40 @@
+from django.db.models.signals import post_save, post_delete
+
+from core.signals import rows_imported
+
+from members.models import Member
+from churches.models import Church
+from events.models import Event
+from finances.models import Income, Expense
+from . import activity
+from . import cache as dashboard_cache
+
+# Modelos cujos dados aparecem no dashboard: qualquer alteração invalida o snapshot
+DASHBOARD_MODELS = (Member, Church, Event, Income, Expense)
+# Modelos que gravam no registro de atividades (ver dashboard.activity)
+ACTIVITY_MODELS = (Member, Event, Income, Expense)
+
+
+def invalidate_dashboard(sender, **kwargs):
+    dashboard_cache.invalidate()
+
+
+def log_activity(sender, instance, created, raw=False, **kwargs):
+    if not raw:  # loaddata: não é uma atividade de usuário
+        activity.record(sender, instance, created)
+
+
+def log_imported_rows(sender, objects, **kwargs):
+    activity.record_many(sender, objects)
+
+
+for model in DASHBOARD_MODELS:
+    post_save.connect(invalidate_dashboard, sender=model, dispatch_uid=f"dashboard_save_{model.__name__}")
+    post_delete.connect(invalidate_dashboard, sender=model, dispatch_uid=f"dashboard_delete_{model.__name__}")
+
+for model in ACTIVITY_MODELS:
+    post_save.connect(log_activity, sender=model, dispatch_uid=f"dashboard_activity_{model.__name__}")
+
+# Importação de planilhas grava com bulk_create, sem post_save
+rows_imported.connect(invalidate_dashboard, dispatch_uid="dashboard_rows_imported")
+rows_imported.connect(log_imported_rows, dispatch_uid="dashboard_activity_rows_imported")
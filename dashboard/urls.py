@@ -5,5 +5,6 @@ app_name = 'dashboard'
 
 urlpatterns = [
     path('', views.index, name='index'),
+    path('atividades/', views.activity_list, name='activity_list'),
 ]
 
@@ -4,10 +4,18 @@
 echo "Aplicando migrações do banco de dados..."
 python manage.py migrate --noinput
 
+# Taxas de frequência das últimas 4/12 semanas (dependem do dia); agende também uma vez por dia
+echo "Atualizando estatísticas de frequência..."
+python manage.py refresh_attendance_stats --stale
+
 # Coleta arquivos estáticos
 echo "Coletando arquivos estáticos..."
 python manage.py collectstatic --noinput --clear
 
+# Inicia o worker das exportações de relatórios em segundo plano
+echo "Iniciando worker de relatórios..."
+python manage.py run_report_jobs &
+
 # Inicia o servidor Gunicorn
 echo "Iniciando Gunicorn..."
 exec gunicorn templo_digital_django.wsgi:application --bind 0.0.0.0:8000 --workers 3
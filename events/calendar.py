@@ -0,0 +1,100 @@
+"""
+Janelas de datas para o calendário de eventos.
+
+Toda consulta do calendário é limitada ao intervalo exibido (um mês ou uma
+semana, ou o intervalo pedido pelo feed JSON), usando o índice em date, e traz
+a igreja no mesmo SELECT; eventos recorrentes entram como regra e são
+expandidos em ocorrências por events.recurrence. O feed aceita no máximo
+MAX_FEED_DAYS dias por requisição, para que um cliente não peça anos de
+cultos de uma vez.
+"""
+import calendar
+from datetime import date, timedelta
+
+from django.urls import reverse
+
+from . import recurrence
+from .models import Event
+
+MAX_FEED_DAYS = 62
+WEEKDAY_NAMES = ["Dom", "Seg", "Ter", "Qua", "Qui", "Sex", "Sáb"]
+MONTH_NAMES = ["", "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho", "Julho",
+               "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"]
+
+# Semanas começando no domingo, como no calendário impresso da igreja
+_calendar = calendar.Calendar(firstweekday=calendar.SUNDAY)
+
+
+def parse_date(value, default=None):
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def week_range(day):
+    """Domingo a sábado da semana de day."""
+    start = day - timedelta(days=(day.weekday() + 1) % 7)
+    return start, start + timedelta(days=6)
+
+
+def month_range(day):
+    """Primeiro e último dia do mês de day."""
+    return day.replace(day=1), day.replace(day=calendar.monthrange(day.year, day.month)[1])
+
+
+def shift(day, view, step):
+    """Mesmo dia uma semana/um mês antes (step=-1) ou depois (step=1)."""
+    if view == "week":
+        return day + timedelta(weeks=step)
+    month = day.month - 1 + step
+    year = day.year + month // 12
+    month = month % 12 + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def events_between(start, end, church=None):
+    """Ocorrências de start a end (inclusive), em ordem de data e hora."""
+    events = Event.objects.all()
+    if church:
+        events = events.filter(church=church)
+    return recurrence.between(events, start, end)
+
+
+def _by_day(events):
+    days = {}
+    for event in events:
+        days.setdefault(event.date, []).append(event)
+    return days
+
+
+def month_grid(day, events):
+    """Semanas do mês de day: [[(data, eventos do dia, é do mês?), ...7], ...]."""
+    days = _by_day(events)
+    return [
+        [(d, days.get(d, []), d.month == day.month) for d in week]
+        for week in _calendar.monthdatescalendar(day.year, day.month)
+    ]
+
+
+def week_days(day, events):
+    """[(data, eventos do dia)] de domingo a sábado."""
+    days = _by_day(events)
+    start, _ = week_range(day)
+    return [(start + timedelta(days=i), days.get(start + timedelta(days=i), [])) for i in range(7)]
+
+
+def feed_item(event):
+    """Evento no formato dos widgets de calendário (start/end em ISO 8601)."""
+    start = f"{event.date.isoformat()}T{event.time.strftime("%H:%M")}" if event.time else event.date.isoformat()
+    return {
+        "id": event.pk,
+        "title": event.title,
+        "start": start,
+        "allDay": event.time is None,
+        "type": event.events_type,
+        "type_display": event.get_events_type_display() if event.events_type else None,
+        "church": event.church.name,
+        "recurring": event.is_recurring,
+        "url": reverse("events:event_detail", args=[event.pk]),
+    }
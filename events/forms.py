@@ -1,17 +1,94 @@
+import datetime
+import re
+
 from django import forms
+from django.db.models import Q
+from churches.choices import use_cached_church_choices
+from churches.models import Church
 from .models import Event
+from .recurrence import active_rules
+
+class DateListField(forms.CharField):
+    """Datas separadas por vírgula ou linha (dd/mm/aaaa), guardadas como lista ISO."""
+    widget = forms.Textarea(attrs={'rows': 2})
+
+    def prepare_value(self, value):
+        if isinstance(value, list):
+            return ", ".join(datetime.date.fromisoformat(day).strftime('%d/%m/%Y') for day in value)
+        return value
+
+    def to_python(self, value):
+        days = set()
+        for item in re.split(r'[,;\s]+', super().to_python(value) or ''):
+            if not item:
+                continue
+            try:
+                days.add(datetime.datetime.strptime(item, '%d/%m/%Y').date())
+            except ValueError:
+                raise forms.ValidationError(f'Data inválida: "{item}". Use dd/mm/aaaa.')
+        return [day.isoformat() for day in sorted(days)]
+
 
 class EventForm(forms.ModelForm):
+    recurrence_exceptions = DateListField(required=False, label="Datas canceladas", help_text="Ocorrências que não vão acontecer, ex.: 25/12/2026, 01/01/2027.")
+
     class Meta:
         model = Event
-        fields = ['title', 'date', 'time', 'description', 'events_type', 'church']
+        fields = ['title', 'date', 'time', 'description', 'events_type', 'church',
+                  'recurrence', 'recurrence_interval', 'recurrence_until', 'recurrence_exceptions']
         widgets = {
             'date': forms.DateInput(attrs={'type': 'date', 'class': 'form-control'}),
             'time': forms.TimeInput(attrs={'type': 'time', 'class': 'form-control'}),
             'description': forms.Textarea(attrs={'rows': 4, 'class': 'form-control'}),
+            'recurrence_until': forms.DateInput(attrs={'type': 'date', 'class': 'form-control'}, format='%Y-%m-%d'),
         }
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.fields['date'].label = "Data (primeira ocorrência, se repetir)"
         for field_name, field in self.fields.items():
             field.widget.attrs.update({'class': 'form-control'})
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start = cleaned_data.get('date')
+        until = cleaned_data.get('recurrence_until')
+        if not cleaned_data.get('recurrence'):
+            # Evento avulso: campos da regra voltam ao padrão
+            cleaned_data['recurrence_interval'] = 1
+            cleaned_data['recurrence_until'] = None
+            cleaned_data['recurrence_exceptions'] = []
+        elif start and until and until < start:
+            self.add_error('recurrence_until', "A data final da repetição deve ser posterior à primeira ocorrência.")
+        if not cleaned_data.get('recurrence_interval'):
+            cleaned_data['recurrence_interval'] = 1
+        return cleaned_data
+
+
+class EventFilterForm(forms.Form):
+    """
+    Filtros da lista de eventos (todos opcionais; sem data inicial, a lista
+    começa hoje). Eventos recorrentes aparecem enquanto a regra estiver ativa.
+    """
+    start_date = forms.DateField(required=False, label="De", widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}))
+    end_date = forms.DateField(required=False, label="Até", widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}))
+    church = forms.ModelChoiceField(queryset=Church.objects.all(), required=False, label="Igreja", empty_label="Todas", widget=forms.Select(attrs={'class': 'form-control'}))
+    events_type = forms.ChoiceField(choices=[('', 'Todos')] + Event.EVENT_TYPE_CHOICES, required=False, label="Tipo", widget=forms.Select(attrs={'class': 'form-control'}))
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        use_cached_church_choices(self.fields['church'], empty_label="Todas")
+
+    def filter(self, queryset):
+        if not self.is_valid():
+            return queryset
+        data = self.cleaned_data
+        if data['start_date']:
+            queryset = queryset.filter(Q(date__gte=data['start_date']) | active_rules(data['start_date']))
+        if data['end_date']:
+            queryset = queryset.filter(date__lte=data['end_date'])
+        if data['church']:
+            queryset = queryset.filter(church=data['church'])
+        if data['events_type']:
+            queryset = queryset.filter(events_type=data['events_type'])
+        return queryset
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from events.recurrence import COLLAPSE_MIN_OCCURRENCES, collapse_weekly_series
+
+
+class Command(BaseCommand):
+    help = "Converte séries de eventos semanais cadastrados um a um em eventos recorrentes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--min-occurrences", type=int, default=COLLAPSE_MIN_OCCURRENCES,
+                            help="Semanas seguidas para uma série virar regra.")
+        parser.add_argument("--dry-run", action="store_true", help="Só informa o que seria convertido.")
+
+    def handle(self, *args, **options):
+        rules, removed = collapse_weekly_series(options["min_occurrences"], options["dry_run"])
+        prefix = "Simulação: " if options["dry_run"] else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}{rules} série(s) convertida(s) em eventos recorrentes; {removed} evento(s) avulso(s) removido(s)."
+        ))
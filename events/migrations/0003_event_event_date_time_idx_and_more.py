@@ -0,0 +1,22 @@
+# Generated by Django 5.2.1 on 2026-10-17 23:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('churches', '0001_initial'),
+        ('events', '0002_alter_event_events_type'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['date', 'time'], name='event_date_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['church', 'date'], name='event_church_date_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-17 23:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('churches', '0001_initial'),
+        ('events', '0003_event_event_date_time_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['date', 'id'], name='event_date_id_idx'),
+        ),
+    ]
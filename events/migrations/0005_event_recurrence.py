@@ -0,0 +1,38 @@
+# Generated by Django 5.2.1 on 2026-10-17 23:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('churches', '0001_initial'),
+        ('events', '0004_event_date_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='recurrence',
+            field=models.CharField(blank=True, choices=[('', 'Não se repete'), ('semanal', 'Semanal'), ('mensal_dia', 'Mensal (mesmo dia do mês)'), ('mensal_semana', 'Mensal (mesma semana e dia da semana)')], default='', max_length=20, verbose_name='Repetição'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='recurrence_exceptions',
+            field=models.JSONField(blank=True, default=list, verbose_name='Datas canceladas'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='recurrence_interval',
+            field=models.PositiveSmallIntegerField(default=1, help_text='Número de semanas ou meses entre as ocorrências.', verbose_name='Repetir a cada'),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='recurrence_until',
+            field=models.DateField(blank=True, null=True, verbose_name='Repetir até'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(condition=models.Q(('recurrence', ''), _negated=True), fields=['date'], name='event_rule_date_idx'),
+        ),
+    ]
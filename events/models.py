@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 from churches.models import Church
 
 class Event(models.Model):
@@ -11,6 +12,15 @@ class Event(models.Model):
         ("reuniao", "Reunião"),
         ("outro", "Outro"),
     ]
+    RECURRENCE_WEEKLY = "semanal"
+    RECURRENCE_MONTHLY_DAY = "mensal_dia"
+    RECURRENCE_MONTHLY_WEEKDAY = "mensal_semana"
+    RECURRENCE_CHOICES = [
+        ("", "Não se repete"),
+        (RECURRENCE_WEEKLY, "Semanal"),
+        (RECURRENCE_MONTHLY_DAY, "Mensal (mesmo dia do mês)"),
+        (RECURRENCE_MONTHLY_WEEKDAY, "Mensal (mesma semana e dia da semana)"),
+    ]
 
     title = models.CharField(max_length=255, verbose_name="Título")
     date = models.DateField(verbose_name="Data")
@@ -18,6 +28,11 @@ class Event(models.Model):
     description = models.TextField(blank=True, null=True, verbose_name="Descrição")
     events_type = models.CharField(max_length=50, choices=EVENT_TYPE_CHOICES, blank=True, null=True, verbose_name="Tipo de Evento")
     church = models.ForeignKey(Church, on_delete=models.CASCADE, related_name="events", verbose_name="Igreja")
+    # Regra de repetição (ver events.recurrence): date é a primeira ocorrência
+    recurrence = models.CharField(max_length=20, choices=RECURRENCE_CHOICES, blank=True, default="", verbose_name="Repetição")
+    recurrence_interval = models.PositiveSmallIntegerField(default=1, verbose_name="Repetir a cada", help_text="Número de semanas ou meses entre as ocorrências.")
+    recurrence_until = models.DateField(blank=True, null=True, verbose_name="Repetir até")
+    recurrence_exceptions = models.JSONField(default=list, blank=True, verbose_name="Datas canceladas")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Criado em")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Atualizado em")
 
@@ -28,4 +43,10 @@ class Event(models.Model):
         verbose_name = "Evento"
         verbose_name_plural = "Eventos"
         ordering = ["date", "time"]
+        indexes = [
+            models.Index(fields=["date", "time"], name="event_date_time_idx"),
+            models.Index(fields=["date", "id"], name="event_date_id_idx"),
+            models.Index(fields=["church", "date"], name="event_church_date_idx"),
+            models.Index(fields=["date"], condition=~Q(recurrence=""), name="event_rule_date_idx"),
+        ]
 
@@ -0,0 +1,250 @@
+"""
+Eventos recorrentes guardados como regra, expandidos sob demanda.
+
+Um culto semanal é um único Event com recurrence="semanal" (ou mensal), a data
+da primeira ocorrência em date, recurrence_interval (a cada N semanas/meses),
+recurrence_until opcional e recurrence_exceptions (datas canceladas). Para um
+intervalo de datas, window() busca numa única consulta os eventos avulsos do
+intervalo e as regras ativas nele; expand() gera as ocorrências.
+
+iter_dates() é um gerador que salta direto para a primeira ocorrência do
+intervalo, sem percorrer as anteriores, e upcoming() mescla os geradores para
+ler só as próximas N ocorrências. As datas de cada (regra, intervalo) ficam num
+lru_cache pequeno; a chave inclui todos os campos da regra, então editar o
+evento simplesmente gera uma chave nova.
+
+collapse_weekly_series() (comando collapse_recurring_events) converte as
+séries semanais já cadastradas uma a uma em regras.
+"""
+import heapq
+from datetime import date, time, timedelta
+from functools import lru_cache
+from itertools import count, islice, takewhile
+
+from django.db import transaction
+from django.db.models import F, Q
+
+from .models import Event
+
+OCCURRENCE_CACHE_SIZE = 512
+COLLAPSE_MIN_OCCURRENCES = 4 # Semanas seguidas para uma série virar regra
+WEEKDAYS = ["segunda-feira", "terça-feira", "quarta-feira", "quinta-feira", "sexta-feira", "sábado", "domingo"]
+
+
+class Occurrence:
+    """Uma data de um evento; os demais atributos (pk, title, church...) vêm do próprio Event."""
+
+    def __init__(self, event, date):
+        self.event = event
+        self.date = date
+
+    def __getattr__(self, name):
+        # "event" ausente só acontece durante o unpickle (snapshot do dashboard em cache)
+        if name == "event" or name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.event, name)
+
+    @property
+    def is_recurring(self):
+        return bool(self.event.recurrence)
+
+    def sort_key(self):
+        return (self.date, self.event.time or time.min, self.event.pk)
+
+
+def _add_months(year, month, months):
+    month = month - 1 + months
+    return year + month // 12, month % 12 + 1
+
+
+def _last_day(year, month):
+    return (date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)).day
+
+
+def _nth_weekday(year, month, weekday, nth):
+    """Data do n-ésimo dia da semana do mês (nth=-1: o último)."""
+    if nth == -1:
+        last = date(year, month, _last_day(year, month))
+        return last - timedelta(days=(last.weekday() - weekday) % 7)
+    first = date(year, month, 1)
+    return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (nth - 1))
+
+
+def _week_of_month(day):
+    """1º a 4º; a 5ª semana vira "último" para existir em todos os meses."""
+    nth = (day.day - 1) // 7 + 1
+    return -1 if nth == 5 else nth
+
+
+def iter_dates(first, recurrence, interval=1, until=None, exceptions=(), start=None):
+    """
+    Gera as datas da regra em ordem, a partir de start (ou de first), sem fim
+    se until for None. Dias 29-31 em "mensal_dia" caem no último dia dos meses
+    mais curtos.
+    """
+    interval = max(interval or 1, 1)
+    start = max(start or first, first)
+    if not recurrence:
+        if first >= start and (until is None or first <= until) and first not in exceptions:
+            yield first
+        return
+    if recurrence == Event.RECURRENCE_WEEKLY:
+        step = timedelta(weeks=interval)
+        skip = -(-(start - first).days // step.days) # Arredonda para cima: 1ª ocorrência >= start
+        candidates = (first + step * n for n in count(skip))
+    else:
+        months = (start.year - first.year) * 12 + start.month - first.month
+        skip = max(months // interval - 1, 0) # Um período antes: a data do mês pode cair antes de start
+        weekday, nth = first.weekday(), _week_of_month(first)
+
+        def monthly():
+            for n in count(skip):
+                year, month = _add_months(first.year, first.month, n * interval)
+                if recurrence == Event.RECURRENCE_MONTHLY_WEEKDAY:
+                    yield _nth_weekday(year, month, weekday, nth)
+                else:
+                    yield date(year, month, min(first.day, _last_day(year, month)))
+        candidates = monthly()
+    for day in candidates:
+        if until is not None and day > until:
+            return
+        if day >= start and day not in exceptions:
+            yield day
+
+
+def _rule_key(event):
+    return (event.date, event.recurrence, event.recurrence_interval, event.recurrence_until,
+            tuple(sorted(event.recurrence_exceptions or [])))
+
+
+@lru_cache(maxsize=OCCURRENCE_CACHE_SIZE)
+def _dates_between(rule_key, start, end):
+    first, recurrence, interval, until, exceptions = rule_key
+    exceptions = {date.fromisoformat(day) for day in exceptions}
+    dates = iter_dates(first, recurrence, interval, until, exceptions, start)
+    return tuple(takewhile(lambda day: day <= end, dates))
+
+
+def occurrence_dates(event, start, end):
+    """Datas do evento entre start e end (inclusive), lidas do cache quando possível."""
+    return _dates_between(_rule_key(event), start, end)
+
+
+def occurrences(event, start):
+    """Gerador sem fim das ocorrências do evento a partir de start."""
+    exceptions = {date.fromisoformat(day) for day in event.recurrence_exceptions or []}
+    for day in iter_dates(event.date, event.recurrence, event.recurrence_interval,
+                          event.recurrence_until, exceptions, start):
+        yield Occurrence(event, day)
+
+
+def active_rules(start, end=None):
+    """Filtro das regras que têm ocorrências possíveis entre start e end."""
+    rules = ~Q(recurrence="") & (Q(recurrence_until__isnull=True) | Q(recurrence_until__gte=start))
+    return rules & Q(date__lte=end) if end else rules
+
+
+def window(queryset, start, end):
+    """Eventos avulsos do intervalo + regras ativas nele, numa única consulta."""
+    # Sem ORDER BY: a ordem vem de expand(), e assim o banco pode usar o índice parcial das regras
+    return queryset.filter(Q(recurrence="", date__range=(start, end)) | active_rules(start, end)).order_by()
+
+
+def expand(events, start, end):
+    """Ocorrências dos eventos entre start e end, em ordem de data e hora."""
+    result = [Occurrence(event, day) for event in events for day in occurrence_dates(event, start, end)]
+    result.sort(key=Occurrence.sort_key)
+    return result
+
+
+def between(queryset, start, end):
+    return expand(window(queryset.select_related("church"), start, end), start, end)
+
+
+def upcoming(queryset, start, limit=5):
+    """
+    As próximas limit ocorrências a partir de start: no máximo limit eventos
+    avulsos e as regras ativas, mesclados de forma preguiçosa.
+    """
+    queryset = queryset.select_related("church")
+    # Mesma ordem de Occurrence.sort_key (sem hora primeiro), exigida pelo heapq.merge
+    singles = queryset.filter(recurrence="", date__gte=start)\
+                      .order_by("date", F("time").asc(nulls_first=True), "pk")[:limit]
+    streams = [(Occurrence(event, event.date) for event in singles)]
+    streams.extend(occurrences(rule, start) for rule in queryset.filter(active_rules(start)).order_by())
+    return list(islice(heapq.merge(*streams, key=Occurrence.sort_key), limit))
+
+
+def describe(event):
+    """Texto da regra: "Semanal", "A cada 2 meses, no 1º domingo, até 31/12/2026"..."""
+    if not event.recurrence:
+        return ""
+    interval = event.recurrence_interval or 1
+    weekday = WEEKDAYS[event.date.weekday()]
+    feminine = event.date.weekday() < 5 # "segunda-feira" x "sábado"/"domingo"
+    if event.recurrence == Event.RECURRENCE_WEEKLY:
+        text = "Semanal" if interval == 1 else f"A cada {interval} semanas"
+        text += f", {"toda" if feminine else "todo"} {weekday}"
+    else:
+        text = "Mensal" if interval == 1 else f"A cada {interval} meses"
+        if event.recurrence == Event.RECURRENCE_MONTHLY_WEEKDAY:
+            nth = _week_of_month(event.date)
+            if nth == -1:
+                ordinal = "última" if feminine else "último"
+            else:
+                ordinal = f"{nth}{"ª" if feminine else "º"}"
+            text += f", {"na" if feminine else "no"} {ordinal} {weekday}"
+        else:
+            text += f", todo dia {event.date.day}"
+    if event.recurrence_until:
+        text += f", até {event.recurrence_until.strftime('%d/%m/%Y')}"
+    return text
+
+
+def _weekly_runs(dates):
+    """Divide datas ordenadas em sequências semanais; uma semana faltando vira data cancelada."""
+    run, skipped = [dates[0]], []
+    for day in dates[1:]:
+        gap = (day - run[-1]).days
+        if gap == 7 or gap == 14:
+            if gap == 14:
+                skipped.append(day - timedelta(weeks=1))
+            run.append(day)
+            continue
+        yield run, skipped
+        run, skipped = [day], []
+    yield run, skipped
+
+
+def collapse_weekly_series(min_occurrences=COLLAPSE_MIN_OCCURRENCES, dry_run=False):
+    """
+    Troca séries de eventos avulsos semanais (mesma igreja, título, hora, tipo
+    e descrição, no mesmo dia da semana) por um único evento com regra
+    semanal. O primeiro evento da série vira a regra; os demais são excluídos.
+    Retorna (regras criadas, eventos removidos).
+    """
+    groups = {}
+    rows = Event.objects.filter(recurrence="").order_by("date", "pk")\
+                        .values_list("pk", "date", "church_id", "title", "time", "events_type", "description")
+    for pk, day, *fields in rows.iterator(chunk_size=2000):
+        groups.setdefault((*fields, day.weekday()), []).append((day, pk))
+
+    rules = removed = 0
+    for occurrences in groups.values():
+        pks = dict(occurrences) # Duas linhas na mesma data: só uma entra na série, a outra fica avulsa
+        for run, skipped in _weekly_runs(sorted(pks)):
+            if len(run) < min_occurrences:
+                continue
+            rules += 1
+            removed += len(run) - 1
+            if dry_run:
+                continue
+            with transaction.atomic():
+                Event.objects.filter(pk__in=[pks[day] for day in run[1:]]).delete()
+                rule = Event.objects.get(pk=pks[run[0]])
+                rule.recurrence = Event.RECURRENCE_WEEKLY
+                rule.recurrence_interval = 1
+                rule.recurrence_until = run[-1]
+                rule.recurrence_exceptions = [day.isoformat() for day in skipped]
+                rule.save()
+    return rules, removed
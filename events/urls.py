@@ -5,6 +5,8 @@ app_name = 'events'
 
 urlpatterns = [
     path('', views.event_list, name='event_list'),
+    path('calendario/', views.event_calendar, name='event_calendar'),
+    path('calendario/feed/', views.event_feed, name='event_feed'),
     path('novo/', views.event_create, name='event_create'),
     path('<int:pk>/', views.event_detail, name='event_detail'),
     path('<int:pk>/editar/', views.event_update, name='event_update'),
@@ -1,22 +1,104 @@
+from datetime import timedelta
+from itertools import islice
+
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.utils import timezone
+from churches.choices import church_choices
+from core.pagination import keyset_paginate
 from .models import Event
-from .forms import EventForm
+from .forms import EventForm, EventFilterForm
+from . import calendar, recurrence
+
+EVENTS_PAGE_SIZE = 50
+NEXT_OCCURRENCES = 8
+
+def _church_param(request):
+    church = request.GET.get('church', '')
+    return int(church) if church.isdigit() else None
 
+@login_required
 def event_list(request):
-    events = Event.objects.all().order_by('date', 'time')
+    params = request.GET.copy()
+    # Sem data inicial, a lista começa nos eventos de hoje
+    if 'start_date' not in params:
+        params['start_date'] = timezone.localdate().isoformat()
+    filter_form = EventFilterForm(params)
+    events = filter_form.filter(Event.objects.select_related('church'))
+    page = keyset_paginate(events, request.GET, EVENTS_PAGE_SIZE, descending=False)
+
+    params.pop('after', None)
+    params.pop('before', None)
     return render(request, 'events/event_list.html', {
-        'events': events,
+        'events': page,
+        'page': page,
+        'filter_form': filter_form,
+        'pagination_query_string': params.urlencode(),
+        'active_menu': 'events',
+    })
+
+@login_required
+def event_calendar(request):
+    """Calendário mensal (padrão) ou semanal; só os eventos do intervalo exibido são lidos."""
+    view = 'week' if request.GET.get('view') == 'week' else 'month'
+    day = calendar.parse_date(request.GET.get('date'), timezone.localdate())
+    church = _church_param(request)
+    if view == 'week':
+        start, end = calendar.week_range(day)
+        title = f"{start.strftime('%d/%m')} a {end.strftime('%d/%m/%Y')}"
+    else:
+        start, end = calendar.month_range(day)
+        title = f"{calendar.MONTH_NAMES[day.month]} {day.year}"
+    events = calendar.events_between(start, end, church)
+
+    return render(request, 'events/event_calendar.html', {
+        'view': view,
+        'day': day,
+        'title': title,
+        'weeks': calendar.month_grid(day, events) if view == 'month' else None,
+        'week_days': calendar.week_days(day, events) if view == 'week' else None,
+        'weekday_names': calendar.WEEKDAY_NAMES,
+        'previous_date': calendar.shift(day, view, -1),
+        'next_date': calendar.shift(day, view, 1),
+        'today': timezone.localdate(),
+        'churches': church_choices(),
+        'selected_church': church,
+        'event_count': len(events),
         'active_menu': 'events',
     })
 
+@login_required
+def event_feed(request):
+    """
+    Eventos de start (inclusivo) a end (exclusivo) em JSON, no formato dos
+    widgets de calendário. Aceita datas ISO, com ou sem horário.
+    """
+    start = calendar.parse_date(request.GET.get('start', '')[:10])
+    end = calendar.parse_date(request.GET.get('end', '')[:10])
+    if not start or not end or end <= start:
+        return JsonResponse({'error': 'Informe start e end (AAAA-MM-DD), com end depois de start.'}, status=400)
+    if (end - start).days > calendar.MAX_FEED_DAYS:
+        return JsonResponse({'error': f'Intervalo máximo de {calendar.MAX_FEED_DAYS} dias.'}, status=400)
+    events = calendar.events_between(start, end - timedelta(days=1), _church_param(request))
+    return JsonResponse({
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'results': [calendar.feed_item(event) for event in events],
+    })
+
+@login_required
 def event_detail(request, pk):
-    event = get_object_or_404(Event, pk=pk)
+    event = get_object_or_404(Event.objects.select_related('church'), pk=pk)
     return render(request, 'events/event_detail.html', {
         'event': event,
+        'recurrence_description': recurrence.describe(event),
+        'next_occurrences': list(islice(recurrence.occurrences(event, timezone.localdate()), NEXT_OCCURRENCES)) if event.recurrence else [],
         'active_menu': 'events',
     })
 
+@login_required
 def event_create(request):
     if request.method == 'POST':
         form = EventForm(request.POST)
@@ -33,6 +115,7 @@ def event_create(request):
         'active_menu': 'events',
     })
 
+@login_required
 def event_update(request, pk):
     event = get_object_or_404(Event, pk=pk)
     
@@ -52,6 +135,7 @@ def event_update(request, pk):
         'active_menu': 'events',
     })
 
+@login_required
 def event_delete(request, pk):
     event = get_object_or_404(Event, pk=pk)
     
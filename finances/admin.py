@@ -1,9 +1,11 @@
 from django.contrib import admin
 
 # Register your models here.
-from .models import Income, Expense, Category, Donation
+from .models import Income, Expense, Category, Donation, MonthlyLedger, DailyBalance
 
 admin.site.register(Income)
 admin.site.register(Expense)
 admin.site.register(Category)
-admin.site.register(Donation)
\ No newline at end of file
+admin.site.register(Donation)
+admin.site.register(MonthlyLedger)
+admin.site.register(DailyBalance)
@@ -0,0 +1,91 @@
+"""
+Saldo acumulado diário (DailyBalance) por igreja.
+
+Cada linha guarda as entradas e saídas do dia e o saldo de fechamento daquele
+dia (tudo que entrou menos tudo que saiu até ele, inclusive). Um lançamento no
+dia D soma o valor na linha de D e em todas as linhas posteriores da mesma
+igreja com um único UPDATE, de modo que o saldo em qualquer data é a linha mais
+recente até ela: uma consulta pelo índice (church, date), sem somar o histórico.
+"""
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+from churches.models import Church
+from .models import DailyBalance, Expense, Income
+
+
+def _apply(church_id, day, incomes, expenses):
+    """Soma entradas/saídas do dia e desloca o saldo de fechamento de D em diante."""
+    with transaction.atomic():
+        row = DailyBalance.objects.filter(church_id=church_id, date=day).first()
+        if row is None:
+            if incomes <= 0 and expenses <= 0:
+                # Estorno sem linha (ex.: igreja sendo excluída em cascata): nada a ajustar
+                return
+            previous = DailyBalance.objects.filter(church_id=church_id, date__lt=day)\
+                                           .order_by("-date").values_list("closing_balance", flat=True).first()
+            DailyBalance.objects.create(church_id=church_id, date=day, closing_balance=previous or 0)
+        DailyBalance.objects.filter(church_id=church_id, date=day).update(
+            incomes=F("incomes") + incomes,
+            expenses=F("expenses") + expenses,
+        )
+        DailyBalance.objects.filter(church_id=church_id, date__gte=day).update(
+            closing_balance=F("closing_balance") + incomes - expenses,
+        )
+
+
+def _split(model, amount):
+    """(entradas, saídas) do dia para um valor de Income ou Expense."""
+    return (amount, Decimal("0")) if model is Income else (Decimal("0"), amount)
+
+
+def apply_delta(model, values, sign):
+    """Soma (sign=1) ou estorna (sign=-1) um lançamento (valores de ledger.ledger_values)."""
+    incomes, expenses = _split(model, Decimal(values["amount"]) * sign)
+    _apply(values["church_id"], values["date"], incomes, expenses)
+
+
+def apply_many(model, instances):
+    """Lançamentos criados em massa: um ajuste por igreja e dia."""
+    totals = {}
+    for instance in instances:
+        key = (instance.church_id, instance.date)
+        totals[key] = totals.get(key, Decimal("0")) + Decimal(instance.amount)
+    with transaction.atomic():
+        for (church_id, day), amount in sorted(totals.items()):
+            _apply(church_id, day, *_split(model, amount))
+
+
+def rebuild_balances():
+    """Recalcula todas as linhas a partir dos lançamentos (backfill)."""
+    days = {}
+    for model in (Income, Expense):
+        for row in model.objects.values("church_id", "date").annotate(total=Sum("amount")).order_by():
+            day = days.setdefault((row["church_id"], row["date"]), {Income: Decimal("0"), Expense: Decimal("0")})
+            day[model] += row["total"]
+    rows, running = [], {}
+    for (church_id, day), totals in sorted(days.items()):
+        incomes, expenses = totals[Income], totals[Expense]
+        running[church_id] = running.get(church_id, Decimal("0")) + incomes - expenses
+        rows.append(DailyBalance(church_id=church_id, date=day, incomes=incomes, expenses=expenses,
+                                 closing_balance=running[church_id]))
+    with transaction.atomic():
+        DailyBalance.objects.all().delete()
+        DailyBalance.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+def closing_balance(end_date, church=None):
+    """Saldo acumulado até end_date (inclusive), de uma igreja ou somado de todas."""
+    latest = DailyBalance.objects.filter(church=OuterRef("pk"), date__lte=end_date)\
+                                 .order_by("-date").values("closing_balance")[:1]
+    churches = Church.objects.all()
+    if church:
+        churches = churches.filter(pk=getattr(church, "pk", church))
+    balance = churches.annotate(balance=Coalesce(Subquery(latest), Value(Decimal("0"))))\
+                      .aggregate(total=Sum("balance"))["total"]
+    # Arredondado aos centavos: no SQLite os UPDATE com F() acumulam em ponto flutuante
+    return (balance or Decimal("0")).quantize(Decimal("0.01"))
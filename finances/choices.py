@@ -0,0 +1,39 @@
+"""
+Opções de categoria para os formulários e filtros, lidas do cache.
+
+Mesmo esquema de churches.choices: a lista (pk, nome, tipo) fica no cache por
+CHOICES_CACHE_TIMEOUT segundos e é descartada a cada alteração em Category (ver
+finances.signals); o filtro por tipo é feito sobre a lista em memória.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Category
+
+CATEGORY_CHOICES_KEY = "finances:category_choices"
+
+
+def categories():
+    """[(pk, nome, tipo)] de todas as categorias, ordenadas pelo nome."""
+    return cache.get_or_set(
+        CATEGORY_CHOICES_KEY,
+        lambda: list(Category.objects.order_by("name").values_list("pk", "name", "category_type")),
+        settings.CHOICES_CACHE_TIMEOUT,
+    )
+
+
+def category_choices(category_type=None):
+    """(pk, nome) das categorias; com category_type, só as desse tipo e as de tipo "ambos"."""
+    return [
+        (pk, name) for pk, name, kind in categories()
+        if category_type is None or kind in (category_type, "ambos")
+    ]
+
+
+def invalidate():
+    cache.delete(CATEGORY_CHOICES_KEY)
+
+
+def use_cached_category_choices(field, category_type=None, empty_label="---------"):
+    """Troca as opções do ModelChoiceField pela lista em cache (a validação continua pelo queryset)."""
+    field.choices = [("", empty_label), *category_choices(category_type)]
@@ -1,4 +1,9 @@
 from django import forms
+from django.urls import reverse_lazy
+from churches.choices import use_cached_church_choices
+from churches.models import Church
+from core.widgets import AutocompleteSelect
+from .choices import use_cached_category_choices
 from .models import Income, Expense, Category
 
 class IncomeForm(forms.ModelForm):
@@ -11,11 +16,18 @@ class IncomeForm(forms.ModelForm):
             'description': forms.TextInput(attrs={'class': 'form-control'}),
             'category': forms.Select(attrs={'class': 'form-control'}),
             'church': forms.Select(attrs={'class': 'form-control'}),
-            'member': forms.Select(attrs={'class': 'form-control'}),
+            'member': AutocompleteSelect(reverse_lazy('members:member_search'), attrs={'class': 'form-control'}, placeholder='Nome, CPF ou telefone do membro...'),
             'payment_method': forms.Select(attrs={'class': 'form-control'}),
             'receipt': forms.FileInput(attrs={'class': 'form-control'}),
         }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if 'church' in self.fields:
+            use_cached_church_choices(self.fields['church'])
+        if 'category' in self.fields:
+            use_cached_category_choices(self.fields['category'])
+
 class ExpenseForm(forms.ModelForm):
     class Meta:
         model = Expense
@@ -30,6 +42,13 @@ class ExpenseForm(forms.ModelForm):
             'receipt': forms.FileInput(attrs={'class': 'form-control'}),
         }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if 'church' in self.fields:
+            use_cached_church_choices(self.fields['church'])
+        if 'category' in self.fields:
+            use_cached_category_choices(self.fields['category'])
+
 class CategoryForm(forms.ModelForm):
     class Meta:
         model = Category
@@ -39,3 +58,34 @@ class CategoryForm(forms.ModelForm):
             'category_type': forms.Select(attrs={'class': 'form-control'}),
             'description': forms.Textarea(attrs={'class': 'form-control', 'rows': 3}),
         }
+
+class TransactionFilterForm(forms.Form):
+    """Filtros das listas de Entradas/Saídas (todos opcionais)."""
+    start_date = forms.DateField(required=False, label="De", widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}))
+    end_date = forms.DateField(required=False, label="Até", widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}))
+    church = forms.ModelChoiceField(queryset=Church.objects.all(), required=False, label="Igreja", empty_label="Todas", widget=forms.Select(attrs={'class': 'form-control'}))
+    category = forms.ModelChoiceField(queryset=Category.objects.all(), required=False, label="Categoria", empty_label="Todas", widget=forms.Select(attrs={'class': 'form-control'}))
+    payment_method = forms.ChoiceField(choices=[('', 'Todas')] + Income.PAYMENT_METHOD_CHOICES, required=False, label="Forma de Pagamento", widget=forms.Select(attrs={'class': 'form-control'}))
+
+    def __init__(self, *args, category_type=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        use_cached_church_choices(self.fields['church'], empty_label="Todas")
+        if category_type:
+            self.fields['category'].queryset = Category.objects.filter(category_type__in=[category_type, 'ambos'])
+        use_cached_category_choices(self.fields['category'], category_type, empty_label="Todas")
+
+    def filter(self, queryset):
+        if not self.is_valid():
+            return queryset
+        data = self.cleaned_data
+        if data['start_date']:
+            queryset = queryset.filter(date__gte=data['start_date'])
+        if data['end_date']:
+            queryset = queryset.filter(date__lte=data['end_date'])
+        if data['church']:
+            queryset = queryset.filter(church=data['church'])
+        if data['category']:
+            queryset = queryset.filter(category=data['category'])
+        if data['payment_method']:
+            queryset = queryset.filter(payment_method=data['payment_method'])
+        return queryset
@@ -0,0 +1,43 @@
+from churches.models import Church
+from core.importer import BaseImporter
+from members.models import Member
+from members.search import only_digits
+from .forms import ExpenseForm, IncomeForm
+from .models import Category, Expense, Income
+
+
+class ExpenseImporter(BaseImporter):
+    model = Expense
+    form_class = ExpenseForm
+    label = "Saídas"
+    permission = "finances.add_expense"
+    fields = ["date", "amount", "description", "payment_method"]
+    aliases = {"payment_method": ["pagamento"], "description": ["historico"]}
+    lookups = {
+        "category": (Category, ["categoria"]),
+        "church": (Church, ["igreja"]),
+    }
+
+
+class IncomeImporter(ExpenseImporter):
+    model = Income
+    form_class = IncomeForm
+    label = "Entradas"
+    permission = "finances.add_income"
+    lookups = {
+        **ExpenseImporter.lookups,
+        "member": (Member, ["membro", "cpf do membro"]),
+    }
+
+    def build_lookups(self):
+        # Membro pode vir pelo nome ou pelo CPF (com ou sem pontuação)
+        maps = super().build_lookups()
+        for pk, cpf in Member.objects.exclude(cpf__isnull=True).exclude(cpf="").values_list("pk", "cpf"):
+            maps["member"][only_digits(cpf)] = pk
+        return maps
+
+    def resolve(self, name, value):
+        pk = super().resolve(name, value)
+        if pk is None and name == "member" and only_digits(value):
+            pk = self.lookup_maps[name].get(only_digits(value))
+        return pk
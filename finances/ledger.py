@@ -0,0 +1,173 @@
+"""
+Consolidado mensal (MonthlyLedger) de Entradas e Saídas.
+
+As views financeiras leem os totais por aqui em vez de varrer Income/Expense.
+Meses completos do período vêm do consolidado; os trechos parciais nas bordas
+(ex.: do dia 1 até hoje) são somados direto nos lançamentos, de modo que os
+valores retornados são idênticos aos da agregação sobre as tabelas originais.
+"""
+from decimal import Decimal
+
+from dateutil.relativedelta import relativedelta
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncMonth
+
+from .models import Income, Expense, MonthlyLedger
+
+LEDGER_KINDS = {Income: "entrada", Expense: "saida"}
+LEDGER_FIELDS = ("date", "amount", "church_id", "category_id", "payment_method")
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def month_end(day):
+    return month_start(day) + relativedelta(months=1, days=-1)
+
+
+def ledger_values(instance):
+    return {field: getattr(instance, field) for field in LEDGER_FIELDS}
+
+
+def _ledger_key(model, values):
+    return {
+        "kind": LEDGER_KINDS[model],
+        "month": month_start(values["date"]),
+        "church_id": values["church_id"],
+        "category_id": values["category_id"],
+        "payment_method": values["payment_method"],
+    }
+
+
+def apply_delta(model, values, sign):
+    """Soma (sign=1) ou estorna (sign=-1) um lançamento no consolidado."""
+    key = _ledger_key(model, values)
+    with transaction.atomic():
+        if sign > 0:
+            MonthlyLedger.objects.get_or_create(**key)
+        # Estornos só atualizam linhas existentes: numa exclusão em cascata
+        # (ex.: igreja removida) a linha do consolidado também está sendo apagada.
+        MonthlyLedger.objects.filter(**key).update(
+            total=F("total") + values["amount"] * sign,
+            entries=F("entries") + sign,
+        )
+
+
+def apply_many(model, instances):
+    """
+    Soma ao consolidado lançamentos criados em massa (bulk_create não dispara
+    signals). Agrupa antes por linha do consolidado: um UPDATE por mês/igreja/
+    categoria/forma de pagamento, não por lançamento.
+    """
+    deltas = {}
+    for instance in instances:
+        values = ledger_values(instance)
+        key = tuple(_ledger_key(model, values).items())
+        total, entries = deltas.get(key, (Decimal("0"), 0))
+        deltas[key] = (total + Decimal(values["amount"]), entries + 1)
+    with transaction.atomic():
+        for key, (total, entries) in deltas.items():
+            key = dict(key)
+            MonthlyLedger.objects.get_or_create(**key)
+            MonthlyLedger.objects.filter(**key).update(total=F("total") + total, entries=F("entries") + entries)
+
+
+def rebuild_ledger():
+    """Recalcula o consolidado inteiro a partir dos lançamentos."""
+    rows = []
+    for model, kind in LEDGER_KINDS.items():
+        grouped = (
+            model.objects.annotate(month=TruncMonth("date"))
+            .values("month", "church_id", "category_id", "payment_method")
+            .annotate(total=Sum("amount"), entries=Count("id"))
+            .order_by()
+        )
+        rows.extend(MonthlyLedger(kind=kind, **row) for row in grouped)
+    with transaction.atomic():
+        MonthlyLedger.objects.all().delete()
+        MonthlyLedger.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+def _split_period(start, end):
+    """
+    Divide o período [start, end] em meses completos e trechos parciais.
+    Retorna (filtro para o consolidado ou None, lista de intervalos parciais).
+    start/end = None significam período aberto naquela ponta.
+    """
+    if start and end:
+        if start > end:
+            return None, []
+        if month_start(start) == month_start(end):
+            if start.day == 1 and end == month_end(end):
+                return {"month": start}, []
+            return None, [(start, end)]
+
+    full, partials = {}, []
+    if start:
+        if start.day == 1:
+            full["month__gte"] = start
+        else:
+            partials.append((start, month_end(start)))
+            full["month__gte"] = month_start(start) + relativedelta(months=1)
+    if end:
+        if end == month_end(end):
+            full["month__lte"] = month_start(end)
+        else:
+            partials.append((month_start(end), end))
+            full["month__lte"] = month_start(end) - relativedelta(months=1)
+    if "month__gte" in full and "month__lte" in full and full["month__gte"] > full["month__lte"]:
+        full = None
+    return full, partials
+
+
+def _sources(model, start, end, church):
+    full, partials = _split_period(start, end)
+    if full is None:
+        ledger = MonthlyLedger.objects.none()
+    else:
+        ledger = MonthlyLedger.objects.filter(kind=LEDGER_KINDS[model], entries__gt=0, **full)
+    if partials:
+        ranges = Q()
+        for range_start, range_end in partials:
+            ranges |= Q(date__gte=range_start, date__lte=range_end)
+        raw = model.objects.filter(ranges)
+    else:
+        raw = model.objects.none()
+    if church:
+        ledger = ledger.filter(church=church)
+        raw = raw.filter(church=church)
+    return ledger, raw.order_by()
+
+
+def period_total(model, start=None, end=None, church=None):
+    """Total de Income/Expense no período (datas inclusivas)."""
+    ledger, raw = _sources(model, start, end, church)
+    return (ledger.aggregate(total=Sum("total"))["total"] or 0) + (raw.aggregate(total=Sum("amount"))["total"] or 0)
+
+
+def monthly_totals(model, start=None, end=None, church=None):
+    """Totais por mês no período: {primeiro dia do mês: valor}."""
+    ledger, raw = _sources(model, start, end, church)
+    totals = {}
+    for row in ledger.values("month").annotate(total=Sum("total")).order_by():
+        totals[row["month"]] = totals.get(row["month"], Decimal("0.00")) + row["total"]
+    for row in raw.annotate(month=TruncMonth("date")).values("month").annotate(total=Sum("amount")):
+        totals[row["month"]] = totals.get(row["month"], Decimal("0.00")) + row["total"]
+    return dict(sorted(totals.items()))
+
+
+def category_totals(model, start=None, end=None, church=None):
+    """Totais por categoria no período, no formato values("category__name").annotate(total=...)."""
+    ledger, raw = _sources(model, start, end, church)
+    totals = {}
+    for row in ledger.values("category__name").annotate(total=Sum("total")).order_by():
+        totals[row["category__name"]] = totals.get(row["category__name"], Decimal("0.00")) + row["total"]
+    for row in raw.values("category__name").annotate(total=Sum("amount")):
+        totals[row["category__name"]] = totals.get(row["category__name"], Decimal("0.00")) + row["total"]
+    return [
+        {"category__name": name, "total": total}
+        for name, total in sorted(totals.items(), key=lambda item: item[1], reverse=True)
+    ]
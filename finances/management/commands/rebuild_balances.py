@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from finances.balances import rebuild_balances
+
+
+class Command(BaseCommand):
+    help = "Reconstrói os saldos diários (DailyBalance) por igreja a partir de todas as Entradas e Saídas."
+
+    def handle(self, *args, **options):
+        rows = rebuild_balances()
+        self.stdout.write(self.style.SUCCESS(f"Saldos diários reconstruídos: {rows} dias."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from finances.ledger import rebuild_ledger
+
+
+class Command(BaseCommand):
+    help = "Reconstrói o consolidado mensal (MonthlyLedger) a partir de todas as Entradas e Saídas."
+
+    def handle(self, *args, **options):
+        rows = rebuild_ledger()
+        self.stdout.write(self.style.SUCCESS(f"Consolidado mensal reconstruído: {rows} linhas."))
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.1 on 2026-10-17 22:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+
+def populate_ledger(apps, schema_editor):
+    MonthlyLedger = apps.get_model('finances', 'MonthlyLedger')
+    rows = []
+    for model_name, kind in (('Income', 'entrada'), ('Expense', 'saida')):
+        model = apps.get_model('finances', model_name)
+        grouped = model.objects.annotate(month=TruncMonth('date')).values(
+            'month', 'church_id', 'category_id', 'payment_method'
+        ).annotate(total=Sum('amount'), entries=Count('id')).order_by()
+        rows.extend(MonthlyLedger(kind=kind, **row) for row in grouped)
+    MonthlyLedger.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('churches', '0001_initial'),
+        ('finances', '0003_alter_donation_reference_date'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyLedger',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('entrada', 'Entrada'), ('saida', 'Saída')], max_length=10, verbose_name='Tipo')),
+                ('month', models.DateField(verbose_name='Mês')),
+                ('payment_method', models.CharField(max_length=15, verbose_name='Forma de Pagamento')),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Total')),
+                ('entries', models.IntegerField(default=0, verbose_name='Lançamentos')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ledger_entries', to='finances.category', verbose_name='Categoria')),
+                ('church', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ledger_entries', to='churches.church', verbose_name='Igreja')),
+            ],
+            options={
+                'verbose_name': 'Consolidado Mensal',
+                'verbose_name_plural': 'Consolidados Mensais',
+                'ordering': ['-month', 'kind'],
+                'unique_together': {('kind', 'month', 'church', 'category', 'payment_method')},
+            },
+        ),
+        migrations.RunPython(populate_ledger, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.1 on 2026-10-17 23:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('churches', '0001_initial'),
+        ('finances', '0004_monthlyledger'),
+        ('members', '0004_member_created_by_id_member_observations_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['date', 'id'], name='expense_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['church', 'date'], name='expense_church_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['category', 'date'], name='expense_category_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='income',
+            index=models.Index(fields=['date', 'id'], name='income_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='income',
+            index=models.Index(fields=['church', 'date'], name='income_church_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='income',
+            index=models.Index(fields=['category', 'date'], name='income_category_date_idx'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.1 on 2026-10-17 23:20
+
+import django.db.models.deletion
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def populate_balances(apps, schema_editor):
+    DailyBalance = apps.get_model('finances', 'DailyBalance')
+    days = {}
+    for model_name, sign in (('Income', 1), ('Expense', -1)):
+        model = apps.get_model('finances', model_name)
+        for row in model.objects.values('church_id', 'date').annotate(total=Sum('amount')).order_by():
+            day = days.setdefault((row['church_id'], row['date']), [Decimal('0'), Decimal('0')])
+            day[0 if sign > 0 else 1] += row['total']
+    rows, running = [], {}
+    for (church_id, day), (incomes, expenses) in sorted(days.items()):
+        running[church_id] = running.get(church_id, Decimal('0')) + incomes - expenses
+        rows.append(DailyBalance(church_id=church_id, date=day, incomes=incomes, expenses=expenses,
+                                 closing_balance=running[church_id]))
+    DailyBalance.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('churches', '0001_initial'),
+        ('finances', '0005_expense_expense_date_id_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Data')),
+                ('incomes', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Entradas do Dia')),
+                ('expenses', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Saídas do Dia')),
+                ('closing_balance', models.DecimalField(decimal_places=2, default=0, max_digits=16, verbose_name='Saldo de Fechamento')),
+                ('church', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_balances', to='churches.church', verbose_name='Igreja')),
+            ],
+            options={
+                'verbose_name': 'Saldo Diário',
+                'verbose_name_plural': 'Saldos Diários',
+                'ordering': ['-date', 'church'],
+                'unique_together': {('church', 'date')},
+            },
+        ),
+        migrations.RunPython(populate_balances, migrations.RunPython.noop),
+    ]
@@ -50,6 +50,11 @@ class Income(models.Model):
         verbose_name = "Entrada"
         verbose_name_plural = "Entradas"
         ordering = ['-date']
+        indexes = [
+            models.Index(fields=['date', 'id'], name='income_date_id_idx'),
+            models.Index(fields=['church', 'date'], name='income_church_date_idx'),
+            models.Index(fields=['category', 'date'], name='income_category_date_idx'),
+        ]
 
 class Expense(models.Model):
     PAYMENT_METHOD_CHOICES = [
@@ -78,6 +83,11 @@ class Expense(models.Model):
         verbose_name = "Saída"
         verbose_name_plural = "Saídas"
         ordering = ['-date']
+        indexes = [
+            models.Index(fields=['date', 'id'], name='expense_date_id_idx'),
+            models.Index(fields=['church', 'date'], name='expense_church_date_idx'),
+            models.Index(fields=['category', 'date'], name='expense_category_date_idx'),
+        ]
 
 # Mantendo o modelo Donation para compatibilidade com código existente
 class Donation(models.Model):
@@ -96,3 +106,45 @@ class Donation(models.Model):
         verbose_name = "Registro Financeiro Mensal"
         verbose_name_plural = "Registros Financeiros Mensais"
         ordering = ["-reference_date", "church"]
+
+# Consolidado mensal de Entradas/Saídas (mantido por finances.signals)
+class MonthlyLedger(models.Model):
+    KIND_CHOICES = [
+        ('entrada', 'Entrada'),
+        ('saida', 'Saída'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES, verbose_name="Tipo")
+    month = models.DateField(verbose_name="Mês")  # Sempre o primeiro dia do mês
+    church = models.ForeignKey(Church, on_delete=models.CASCADE, related_name="ledger_entries", verbose_name="Igreja")
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name="ledger_entries", verbose_name="Categoria")
+    payment_method = models.CharField(max_length=15, verbose_name="Forma de Pagamento")
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0, verbose_name="Total")
+    entries = models.IntegerField(default=0, verbose_name="Lançamentos")
+
+    def __str__(self):
+        return f"{self.get_kind_display()} {self.month.strftime('%m/%Y')} - R$ {self.total}"
+
+    class Meta:
+        verbose_name = "Consolidado Mensal"
+        verbose_name_plural = "Consolidados Mensais"
+        ordering = ["-month", "kind"]
+        unique_together = [("kind", "month", "church", "category", "payment_method")]
+
+# Saldo de fechamento diário por igreja (mantido por finances.signals)
+class DailyBalance(models.Model):
+    church = models.ForeignKey(Church, on_delete=models.CASCADE, related_name="daily_balances", verbose_name="Igreja")
+    date = models.DateField(verbose_name="Data")
+    incomes = models.DecimalField(max_digits=14, decimal_places=2, default=0, verbose_name="Entradas do Dia")
+    expenses = models.DecimalField(max_digits=14, decimal_places=2, default=0, verbose_name="Saídas do Dia")
+    closing_balance = models.DecimalField(max_digits=16, decimal_places=2, default=0, verbose_name="Saldo de Fechamento")
+
+    def __str__(self):
+        return f"{self.church} {self.date.strftime('%d/%m/%Y')} - R$ {self.closing_balance}"
+
+    class Meta:
+        verbose_name = "Saldo Diário"
+        verbose_name_plural = "Saldos Diários"
+        ordering = ["-date", "church"]
+        # Também é o índice da consulta "último saldo até a data" por igreja
+        unique_together = [("church", "date")]
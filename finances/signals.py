@@ -0,0 +1,52 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from core.signals import rows_imported
+from .models import Income, Expense, Category
+from . import balances, choices, ledger
+
+# Mantém o MonthlyLedger e o DailyBalance em dia a cada Entrada/Saída salva ou excluída.
+# Operações em massa (queryset.update/bulk_create) não disparam signals:
+# após elas rode `python manage.py rebuild_ledger` e `rebuild_balances` (a importação de planilhas
+# já atualiza o consolidado pelo sinal rows_imported).
+
+@receiver(pre_save, sender=Income)
+@receiver(pre_save, sender=Expense)
+def remember_ledger_values(sender, instance, raw=False, **kwargs):
+    instance._ledger_previous = None
+    if instance.pk and not raw:
+        instance._ledger_previous = sender.objects.filter(pk=instance.pk).values(*ledger.LEDGER_FIELDS).first()
+
+@receiver(post_save, sender=Income)
+@receiver(post_save, sender=Expense)
+def update_ledger_on_save(sender, instance, raw=False, **kwargs):
+    if raw:  # loaddata: o consolidado é reconstruído pelo comando
+        return
+    previous = getattr(instance, "_ledger_previous", None)
+    current = ledger.ledger_values(instance)
+    if previous == current:
+        return
+    if previous:
+        ledger.apply_delta(sender, previous, -1)
+        balances.apply_delta(sender, previous, -1)
+    ledger.apply_delta(sender, current, 1)
+    balances.apply_delta(sender, current, 1)
+
+@receiver(post_delete, sender=Income)
+@receiver(post_delete, sender=Expense)
+def update_ledger_on_delete(sender, instance, **kwargs):
+    values = ledger.ledger_values(instance)
+    ledger.apply_delta(sender, values, -1)
+    balances.apply_delta(sender, values, -1)
+
+@receiver(rows_imported, sender=Income)
+@receiver(rows_imported, sender=Expense)
+def update_ledger_on_import(sender, objects, **kwargs):
+    ledger.apply_many(sender, objects)
+    balances.apply_many(sender, objects)
+
+# Opções de categoria em cache (finances.choices)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_choices(sender, **kwargs):
+    choices.invalidate()
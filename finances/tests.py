@@ -1,3 +1,116 @@
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db.models import Sum
 from django.test import TestCase
 
-# Create your tests here.
+from churches.models import Church
+from . import balances, ledger
+from .models import Category, Expense, Income
+
+# Períodos com bordas no meio do mês, meses completos, um mês só e pontas abertas
+RANGES = [
+    (date(2026, 1, 1), date(2026, 3, 31)),
+    (date(2026, 1, 15), date(2026, 3, 10)),
+    (date(2026, 2, 1), date(2026, 2, 28)),
+    (date(2026, 2, 5), date(2026, 2, 20)),
+    (date(2026, 2, 10), date(2026, 4, 30)),
+    (date(2025, 12, 20), date(2026, 1, 31)),
+    (date(2026, 3, 1), date(2026, 3, 1)),
+    (date(2026, 3, 31), date(2026, 2, 1)),
+    (None, date(2026, 2, 14)),
+    (date(2026, 2, 14), None),
+    (None, None),
+]
+
+
+class LedgerTests(TestCase):
+    """Os totais do consolidado (finances.ledger) são os mesmos da agregação direta sobre Income/Expense."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.churches = [Church.objects.create(name=name) for name in ("Sede", "Filial", "Congregação")]
+        cls.categories = [Category.objects.create(name=name) for name in ("Dízimo", "Oferta", "Manutenção")]
+
+    def setUp(self):
+        self.rng = random.Random(7)
+
+    def random_values(self):
+        return {
+            "date": date(2025, 12, 1) + timedelta(days=self.rng.randrange(150)),
+            "amount": Decimal(self.rng.randint(1, 100000)) / 100,
+            "church": self.rng.choice(self.churches),
+            "category": self.rng.choice(self.categories),
+            "payment_method": self.rng.choice(["dinheiro", "pix", "cartao"]),
+        }
+
+    def create_entries(self, count=120):
+        for n in range(count):
+            model = self.rng.choice([Income, Expense])
+            model.objects.create(description=f"Lançamento {n}", **self.random_values())
+        # Lançamentos nos próprios dias das bordas e nos vizinhos
+        days = {day + timedelta(days=offset) for period in RANGES for day in period if day for offset in (-1, 0, 1)}
+        for day in sorted(days):
+            for model in (Income, Expense):
+                model.objects.create(description="Borda", **{**self.random_values(), "date": day})
+
+    def assertMatchesRawSum(self):
+        for model in (Income, Expense):
+            for start, end in RANGES:
+                for church in [None, *self.churches]:
+                    with self.subTest(model=model.__name__, start=start, end=end, church=church):
+                        raw = model.objects.all()
+                        if start:
+                            raw = raw.filter(date__gte=start)
+                        if end:
+                            raw = raw.filter(date__lte=end)
+                        if church:
+                            raw = raw.filter(church=church)
+                        expected = raw.aggregate(total=Sum("amount"))["total"] or 0
+                        self.assertEqual(ledger.period_total(model, start, end, church), expected)
+
+    def test_created_entries(self):
+        self.create_entries()
+        self.assertMatchesRawSum()
+
+    def test_edited_entries(self):
+        self.create_entries()
+        entries = list(Income.objects.all()) + list(Expense.objects.all())
+        for entry in self.rng.sample(entries, 60):
+            field = self.rng.choice(["date", "amount", "church", "category"])
+            setattr(entry, field, self.random_values()[field])
+            entry.save()
+        self.assertMatchesRawSum()
+
+    def test_deleted_entries(self):
+        self.create_entries()
+        for model in (Income, Expense):
+            pks = list(model.objects.values_list("pk", flat=True))
+            model.objects.filter(pk__in=self.rng.sample(pks, len(pks) // 3)).delete()
+        self.assertMatchesRawSum()
+
+    def test_church_deleted_in_cascade(self):
+        self.create_entries()
+        self.churches[1].delete()
+        self.churches = [self.churches[0], self.churches[2]]
+        self.assertMatchesRawSum()
+
+
+class ClosingBalanceTests(LedgerTests):
+    """Os mesmos cenários, conferindo o saldo acumulado (finances.balances) em cada data das bordas."""
+
+    def assertMatchesRawSum(self):
+        days = sorted({day for period in RANGES for day in period if day})
+        for day in days:
+            for church in [None, *self.churches]:
+                with self.subTest(day=day, church=church):
+                    totals = {}
+                    for model in (Income, Expense):
+                        raw = model.objects.filter(date__lte=day)
+                        if church:
+                            raw = raw.filter(church=church)
+                        totals[model] = raw.aggregate(total=Sum("amount"))["total"] or 0
+                    balance = balances.closing_balance(day, church)
+                    self.assertEqual(balance, totals[Income] - totals[Expense])
+                    self.assertEqual(balance.as_tuple().exponent, -2)  # centavos, como no balanco.html
@@ -1,28 +1,50 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Sum
+from django.db.models import Sum, Count
 from django.utils import timezone
 from .models import Income, Expense, Category
-from .forms import IncomeForm, ExpenseForm, CategoryForm
+from .forms import IncomeForm, ExpenseForm, CategoryForm, TransactionFilterForm
+from . import ledger
+from core.pagination import keyset_paginate
+
+TRANSACTIONS_PAGE_SIZE = 50
+
+def _transaction_list(request, queryset, category_type):
+    """Aplica os filtros da lista, soma no banco e pagina por (data, id)."""
+    filter_form = TransactionFilterForm(request.GET or None, category_type=category_type)
+    transactions = filter_form.filter(queryset)
+    filtered = transactions.aggregate(total=Sum('amount'), count=Count('id'))
+    page = keyset_paginate(transactions, request.GET, TRANSACTIONS_PAGE_SIZE)
+
+    pagination_params = request.GET.copy()
+    pagination_params.pop('after', None)
+    pagination_params.pop('before', None)
+    return {
+        'page': page,
+        'filter_form': filter_form,
+        'filtered_total': filtered['total'] or 0,
+        'filtered_count': filtered['count'],
+        'pagination_query_string': pagination_params.urlencode(),
+    }
 
 @login_required
 def income_list(request):
-    incomes = Income.objects.all().order_by('-date')
+    context = _transaction_list(request, Income.objects.select_related('category', 'church', 'member'), 'entrada')
     
-    # Calcular totais
-    total_incomes = Income.objects.aggregate(total=Sum('amount'))['total'] or 0
-    total_expenses = Expense.objects.aggregate(total=Sum('amount'))['total'] or 0
+    # Calcular totais (consolidado mensal)
+    total_incomes = ledger.period_total(Income)
+    total_expenses = ledger.period_total(Expense)
     balance = total_incomes - total_expenses
     
     # Entradas do mês atual
     today = timezone.now().date()
     first_day_month = today.replace(day=1)
-    incomes_month = Income.objects.filter(date__gte=first_day_month, date__lte=today)
-    total_month_income = sum(income.amount for income in incomes_month)
+    total_month_income = ledger.period_total(Income, first_day_month, today)
 
     return render(request, 'finances/income_list.html', {
-        "incomes": incomes, 
+        **context,
+        "incomes": context["page"], 
         "total_incomes": total_incomes,
         "total_expenses": total_expenses,
         "balance": balance, 
@@ -91,18 +113,18 @@ def income_delete(request, pk):
 
 @login_required
 def expense_list(request):
-    expenses = Expense.objects.all().order_by('-date')
-    # Calcular totais
-    total_expenses = Expense.objects.aggregate(total=Sum('amount'))['total'] or 0
+    context = _transaction_list(request, Expense.objects.select_related('category', 'church'), 'saida')
+    # Calcular totais (consolidado mensal)
+    total_expenses = ledger.period_total(Expense)
  
     # Saídas do mês atual
     today = timezone.now().date()
     first_day_month = today.replace(day=1)
-    expenses_month = Expense.objects.filter(date__gte=first_day_month, date__lte=today)
-    total_month_expense = sum(expense.amount for expense in expenses_month)
+    total_month_expense = ledger.period_total(Expense, first_day_month, today)
     
     return render(request, 'finances/expense_list.html', {
-        "expenses": expenses, 
+        **context,
+        "expenses": context["page"], 
         "total_expenses": total_expenses,
         "total_month_expense": total_month_expense, 
         "active_menu": "finances",
@@ -227,44 +249,43 @@ def category_delete(request, pk):
     })
 
 # remanejar abaixo para relatorio financeiro
+def _category_breakdown(queryset):
+    """Soma por categoria em uma única consulta; retorna (total, {categoria: valor > 0})."""
+    rows = queryset.values('category__name').annotate(total=Sum('amount')).order_by('-total')
+    total = sum((row['total'] for row in rows), 0)
+    breakdown = {row['category__name']: row['total'] for row in rows if row['total'] > 0}
+    return total, breakdown
+
 @login_required
 def report_finance(request):
-    # Obter date atual e primeiro dia do mês
+    # Período padrão: do primeiro dia do mês atual até hoje
     hoje = timezone.now().date()
     primeiro_dia_mes = hoje.replace(day=1)
-    
-    # Incomes e saídas do mês atual
-    incomes_mes = Income.objects.filter(date__gte=primeiro_dia_mes, date__lte=hoje)
-    expenses_mes = Expense.objects.filter(date__gte=primeiro_dia_mes, date__lte=hoje)
-    
-    # Calcular totais
-    total_incomes = sum(income.amount for income in incomes_mes)
-    total_expenses = sum(expense.amount for expense in expenses_mes)
+
+    filter_form = TransactionFilterForm(request.GET or None)
+    filters = filter_form.cleaned_data if filter_form.is_valid() else {}
+    start_date = filters.get('start_date') or primeiro_dia_mes
+    end_date = filters.get('end_date') or hoje
+
+    incomes_mes = Income.objects.filter(date__gte=start_date, date__lte=end_date)
+    expenses_mes = Expense.objects.filter(date__gte=start_date, date__lte=end_date)
+    for field in ('church', 'category', 'payment_method'):
+        if filters.get(field):
+            incomes_mes = incomes_mes.filter(**{field: filters[field]})
+            expenses_mes = expenses_mes.filter(**{field: filters[field]})
+
+    # Totais e quebra por categoria calculados no banco (uma consulta por lado)
+    total_incomes, incomes_por_category = _category_breakdown(incomes_mes)
+    total_expenses, expenses_por_category = _category_breakdown(expenses_mes)
     saldo_mes = total_incomes - total_expenses
-    
-    # Entradas por category
-    categorys = Category.objects.all()
-    incomes_por_category = {}
-    for category in categorys:
-        amount = sum(income.amount for income in incomes_mes if income.category == category)
-        if amount > 0:
-            incomes_por_category[category.name] = amount
-    
-    # Saídas por category
-    expenses_por_category = {}
-    for category in categorys:
-        amount = sum(expense.amount for expense in expenses_mes if expense.category == category)
-        if amount > 0:
-            expenses_por_category[category.name] = amount
-    
+
     return render(request, 'finances/report_finance.html', {
-        'mes_atual': primeiro_dia_mes.strftime('%B/%Y'),
+        'start_date': start_date,
+        'end_date': end_date,
+        'filter_form': filter_form,
         'total_incomes': total_incomes,
         'total_expenses': total_expenses,
         'saldo_mes': saldo_mes,
-        'incomes_por_category': incomes_por_category,
-        'expenses_por_category': expenses_por_category,
-        'incomes_mes': incomes_mes,
-        'expenses_mes': expenses_mes,
+        'category_sections': [('Entradas', incomes_por_category), ('Saídas', expenses_por_category)],
         'active_menu': 'finances',
     })
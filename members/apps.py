@@ -1,6 +1,21 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_migrate
 
 
 class MembersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'members'
+
+    def ready(self):
+        from . import signals  # Miniatura da foto
+        # Índice de busca (pg_trgm/FTS5) criado fora das migrações, ver members.search
+        post_migrate.connect(create_search_index, sender=self, dispatch_uid="members_install_search_index")
+        from .search import set_trigram_threshold
+        connection_created.connect(set_trigram_threshold, dispatch_uid="members_trigram_threshold")
+
+
+def create_search_index(sender, using, **kwargs):
+    from . import search
+
+    search.install_search_index(using)
@@ -0,0 +1,72 @@
+"""
+Aniversariantes por janela de datas, pelo índice em birthday_key.
+
+Cada membro guarda em birthday_key o mês e o dia do nascimento como um número
+(mês * 100 + dia: 15/03 -> 315), mantido em Member.save(). Qualquer janela de
+dias (hoje, esta semana, próximos N dias, um mês) vira um intervalo desse
+número, consultado pelo índice (birthday_key, name) sem extrair mês/dia de
+cada linha. Janelas que passam de dezembro para janeiro viram dois intervalos
+e são ordenadas com os aniversários de dezembro primeiro.
+
+Nascidos em 29/02 entram em 28/02 nos anos não bissextos.
+"""
+import calendar
+from datetime import timedelta
+
+from django.db.models import Case, IntegerField, Q, Value, When
+
+MAX_WINDOW_DAYS = 366
+LEAP_DAY_KEY = 229
+
+
+def birthday_key(day):
+    """15/03/1980 -> 315; None para datas vazias."""
+    return day.month * 100 + day.day if day else None
+
+
+def _key_range(start, days):
+    days = max(1, min(days, MAX_WINDOW_DAYS))
+    end = start + timedelta(days=days - 1)
+    first, last = birthday_key(start), birthday_key(end)
+    # 28/02 de ano não bissexto também é o dia de quem nasceu em 29/02
+    if end.month == 2 and end.day == 28 and not calendar.isleap(end.year):
+        last = LEAP_DAY_KEY
+    return first, last, days >= 365
+
+
+def window_filter(start, days):
+    """Filtro dos aniversários nos `days` dias a partir de start (inclusive)."""
+    first, last, whole_year = _key_range(start, days)
+    if whole_year:
+        return Q(birthday_key__isnull=False)
+    if first <= last:
+        return Q(birthday_key__range=(first, last))
+    return Q(birthday_key__gte=first) | Q(birthday_key__lte=last)
+
+
+def between(queryset, start, days):
+    """Membros que fazem aniversário na janela, na ordem em que os aniversários acontecem."""
+    first, last, _ = _key_range(start, days)
+    queryset = queryset.filter(window_filter(start, days))
+    if first <= last:
+        return queryset.order_by("birthday_key", "name")
+    # Janela dezembro -> janeiro: primeiro os de dezembro
+    wrapped = Case(When(birthday_key__lt=first, then=Value(1)), default=Value(0), output_field=IntegerField())
+    return queryset.annotate(birthday_wrap=wrapped).order_by("birthday_wrap", "birthday_key", "name")
+
+
+def today(queryset, day):
+    return between(queryset, day, 1)
+
+
+def this_week(queryset, day):
+    """Domingo a sábado da semana de day."""
+    return between(queryset, day - timedelta(days=(day.weekday() + 1) % 7), 7)
+
+
+def next_days(queryset, day, days):
+    return between(queryset, day, days)
+
+
+def in_month(queryset, month):
+    return queryset.filter(birthday_key__range=(month * 100 + 1, month * 100 + 31)).order_by("birthday_key", "name")
@@ -0,0 +1,21 @@
+from churches.models import Church
+from core.importer import BaseImporter
+from .forms import MemberForm
+from .models import Member
+
+
+class MemberImporter(BaseImporter):
+    model = Member
+    form_class = MemberForm
+    label = "Membros"
+    permission = "members.add_member"
+    fields = [
+        "name", "cpf", "birth_date", "gender", "marital_status", "phone", "email", "address",
+        "baptism_date", "join_date", "origin_church", "role", "status", "notes", "member_type",
+    ]
+    aliases = {"name": ["nome"], "birth_date": ["nascimento"], "gender": ["sexo"], "phone": ["celular"]}
+    lookups = {"church": (Church, ["igreja", "igreja atual"])}
+
+    def prepare(self, instance):
+        instance.update_search_document()
+        instance.update_birthday_key()
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.1 on 2026-10-17 23:00
+
+import django.db.models.functions.datetime
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('churches', '0001_initial'),
+        ('members', '0004_member_created_by_id_member_observations_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='member',
+            index=models.Index(django.db.models.functions.datetime.ExtractMonth('birth_date'), django.db.models.functions.datetime.ExtractDay('birth_date'), name='member_birth_month_day_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='member',
+            index=models.Index(fields=['status', 'name'], name='member_status_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='member',
+            index=models.Index(fields=['church', 'status'], name='member_church_status_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.1 on 2026-10-17 23:12
+
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+
+# Cópia da normalização de members.search na época desta migração
+def only_digits(text):
+    return re.sub(r"\D", "", text or "")
+
+
+def search_document(member):
+    parts = [member.name, member.cpf, only_digits(member.cpf), member.phone, only_digits(member.phone), member.email]
+    text = unicodedata.normalize("NFKD", " ".join(p for p in parts if p))
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(text.lower().split())
+
+
+def fill_search_document(apps, schema_editor):
+    Member = apps.get_model("members", "Member")
+    members = list(Member.objects.only("pk", "name", "cpf", "phone", "email"))
+    for member in members:
+        member.search_document = search_document(member)
+    Member.objects.bulk_update(members, ["search_document"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0005_member_member_birth_month_day_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='member',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False, verbose_name='Texto de Busca'),
+        ),
+        migrations.RunPython(fill_search_document, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-17 23:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0006_member_search_document'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='member',
+            name='photo_thumbnail',
+            field=models.ImageField(blank=True, editable=False, upload_to='member_photos/', verbose_name='Miniatura da Foto'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.1 on 2026-10-17 23:37
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_birthday_key(apps, schema_editor):
+    Member = apps.get_model("members", "Member")
+    members = list(Member.objects.filter(birth_date__isnull=False).only("pk", "birth_date"))
+    for member in members:
+        member.birthday_key = member.birth_date.month * 100 + member.birth_date.day
+    Member.objects.bulk_update(members, ["birthday_key"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('churches', '0001_initial'),
+        ('members', '0007_member_photo_thumbnail'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='member',
+            name='member_birth_month_day_idx',
+        ),
+        migrations.AddField(
+            model_name='member',
+            name='birthday_key',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True, verbose_name='Chave de Aniversário'),
+        ),
+        migrations.AddIndex(
+            model_name='member',
+            index=models.Index(fields=['birthday_key', 'name'], name='member_birthday_key_idx'),
+        ),
+        migrations.RunPython(fill_birthday_key, migrations.RunPython.noop),
+    ]
@@ -44,17 +44,44 @@ class Member(models.Model):
     status = models.CharField(max_length=15, choices=STATUS_CHOICES, default="ativo", verbose_name="Status")
     church = models.ForeignKey(Church, on_delete=models.SET_NULL, null=True, blank=True, related_name="members", verbose_name="Igreja Atual")
     photo = models.ImageField(upload_to='member_photos/', null=True, blank=True, verbose_name="Foto")
+    photo_thumbnail = models.ImageField(upload_to='member_photos/', blank=True, editable=False, verbose_name="Miniatura da Foto") # Gerada por core.thumbnails
     notes = models.TextField(blank=True, null=True, verbose_name="Observações")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Criado em")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Atualizado em")
     created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="created_members", verbose_name="Criado por")
     updated_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name="updated_members", verbose_name="Atualizado por")
     observations = models.TextField(blank=True, null=True, verbose_name="Observações")
+    # Nome/CPF/telefone/email normalizados para a busca (ver members.search)
+    search_document = models.TextField(blank=True, default="", editable=False, verbose_name="Texto de Busca")
+    # Mês e dia do nascimento (mês * 100 + dia) para as janelas de aniversariantes (ver members.birthdays)
+    birthday_key = models.PositiveSmallIntegerField(null=True, blank=True, editable=False, verbose_name="Chave de Aniversário")
 
     def __str__(self):
         return self.name
 
+    def update_search_document(self):
+        from .search import build_search_document
+        self.search_document = build_search_document(self.name, self.cpf, self.phone, self.email)
+
+    def update_birthday_key(self):
+        from .birthdays import birthday_key
+        self.birthday_key = birthday_key(self.birth_date)
+
+    def save(self, *args, **kwargs):
+        self.update_search_document()
+        self.update_birthday_key()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "search_document", "birthday_key"}
+        return super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = "Membro"
         verbose_name_plural = "Membros"
         ordering = ["name"]
+        indexes = [
+            # Aniversariantes: janelas de birthday_key, já na ordem de exibição
+            models.Index(fields=["birthday_key", "name"], name="member_birthday_key_idx"),
+            models.Index(fields=["status", "name"], name="member_status_name_idx"),
+            models.Index(fields=["church", "status"], name="member_church_status_idx"),
+        ]
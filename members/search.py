@@ -0,0 +1,171 @@
+"""
+Busca de membros por nome, CPF, telefone ou email.
+
+Cada membro guarda em search_document um texto normalizado (minúsculas, sem
+acentos, CPF/telefone também só com dígitos), mantido em Member.save(). A busca
+normaliza o termo do mesmo jeito e usa o índice disponível no banco:
+
+- PostgreSQL: índice GIN pg_trgm em search_document; o filtro usa só
+  operadores que o índice atende (LIKE e <% de similaridade de palavras, com o
+  limite pg_trgm.word_similarity_threshold ajustado em cada conexão) e a
+  similaridade é calculada apenas para ordenar as linhas que passaram.
+- SQLite: tabela FTS5 members_member_fts (tokenizer trigram) sincronizada por
+  triggers, ordenada pelo bm25; termos com menos de 3 letras caem no LIKE.
+
+Os índices ficam fora do estado das migrações (dependem do banco) e são
+criados/recriados por install_search_index() após cada migrate. No SQLite isso
+também recria os triggers, que se perdem quando uma migração reconstrói a
+tabela members_member.
+"""
+import re
+import unicodedata
+
+from django.db import OperationalError, connection, connections
+from django.db.models import Case, IntegerField, Q, Value, When
+
+from .models import Member
+
+SEARCH_MAX_RESULTS = 200
+TRIGRAM_SIMILARITY = 0.3
+FTS_TABLE = "members_member_fts"
+FTS_TRIGGERS = {
+    "members_member_fts_ai": f"""
+        AFTER INSERT ON members_member BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, search_document) VALUES (new.id, new.search_document);
+        END""",
+    "members_member_fts_ad": f"""
+        AFTER DELETE ON members_member BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_document) VALUES ('delete', old.id, old.search_document);
+        END""",
+    "members_member_fts_au": f"""
+        AFTER UPDATE OF search_document ON members_member BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_document) VALUES ('delete', old.id, old.search_document);
+            INSERT INTO {FTS_TABLE}(rowid, search_document) VALUES (new.id, new.search_document);
+        END""",
+}
+
+
+def normalize(text):
+    """Minúsculas, sem acentos e com espaços simples: "JOSÉ  da Silva" -> "jose da silva"."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(text.lower().split())
+
+
+def only_digits(text):
+    return re.sub(r"\D", "", text or "")
+
+
+def build_search_document(name, cpf=None, phone=None, email=None):
+    parts = [name, cpf, only_digits(cpf), phone, only_digits(phone), email]
+    return normalize(" ".join(p for p in parts if p))
+
+
+def normalize_query(query):
+    """Termos só com números e pontuação (CPF, telefone) são comparados pelos dígitos."""
+    query = normalize(query)
+    if query and not re.search(r"[a-z]", query) and only_digits(query):
+        return only_digits(query)
+    return query
+
+
+def _fts_available():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+        return cursor.fetchone() is not None
+
+
+def _ordered_by_ids(queryset, ids):
+    if not ids:
+        return queryset.none()
+    ranking = Case(*[When(pk=pk, then=Value(pos)) for pos, pk in enumerate(ids)], output_field=IntegerField())
+    return queryset.filter(pk__in=ids).annotate(search_rank=ranking).order_by("search_rank")
+
+
+def _like_search(queryset, term):
+    for word in term.split():
+        queryset = queryset.filter(search_document__contains=word)
+    starts = Case(When(search_document__startswith=term, then=Value(0)), default=Value(1), output_field=IntegerField())
+    return queryset.annotate(search_rank=starts).order_by("search_rank", "name")
+
+
+def set_trigram_threshold(sender, connection, **kwargs):
+    """connection_created: limite do operador <% (padrão do pg_trgm é 0.6) igual a TRIGRAM_SIMILARITY."""
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT set_config('pg_trgm.word_similarity_threshold', %s, false)", [str(TRIGRAM_SIMILARITY)])
+
+
+def _postgres_search(queryset, term):
+    from django.contrib.postgres.search import TrigramWordSimilarity
+
+    # trigram_word_similar (<%) e contains (LIKE) usam o índice GIN; um filtro sobre a
+    # similaridade anotada calcularia a função em todas as linhas
+    return queryset.filter(Q(search_document__contains=term) | Q(search_document__trigram_word_similar=term))\
+                   .annotate(similarity=TrigramWordSimilarity(term, "search_document"))\
+                   .order_by("-similarity", "name")
+
+
+def _sqlite_search(queryset, words, short_words):
+    # Cada palavra vira uma frase FTS5 (aspas duplicadas escapam); todas precisam casar
+    match = " ".join('"{}"'.format(word.replace('"', '""')) for word in words)
+    # Palavras curtas demais para o trigram são conferidas com LIKE nas linhas já casadas
+    like = "".join(" AND search_document LIKE %s ESCAPE '\\'" for _ in short_words)
+    like_params = ["%{}%".format(re.sub(r"([%_\\])", r"\\\1", word)) for word in short_words]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s{like} ORDER BY bm25({FTS_TABLE}) LIMIT %s",
+            [match, *like_params, SEARCH_MAX_RESULTS],
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+    return _ordered_by_ids(queryset, ids)
+
+
+def search_members(query, queryset=None):
+    """Membros que casam com o termo, do mais relevante para o menos relevante."""
+    queryset = Member.objects.all() if queryset is None else queryset
+    term = normalize_query(query)
+    if not term:
+        return queryset.none()
+    if connection.vendor == "postgresql":
+        return _postgres_search(queryset, term)
+    # O tokenizer trigram do FTS5 só casa palavras com 3 caracteres ou mais
+    words = [word for word in term.split() if len(word) >= 3]
+    if connection.vendor == "sqlite" and words and _fts_available():
+        return _sqlite_search(queryset, words, [word for word in term.split() if len(word) < 3])
+    return _like_search(queryset, term)
+
+
+def install_search_index(using="default"):
+    """Cria (se faltar) o índice de busca do banco: pg_trgm no PostgreSQL, FTS5 no SQLite."""
+    conn = connections[using]
+    table = Member._meta.db_table
+    with conn.cursor() as cursor:
+        # migrate parcial (tabela ou coluna ainda não criadas): nada a fazer
+        if table not in conn.introspection.table_names(cursor):
+            return
+        if "search_document" not in {col.name for col in conn.introspection.get_table_description(cursor, table)}:
+            return
+        if conn.vendor == "postgresql":
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS member_search_trgm_idx "
+                "ON members_member USING gin (search_document gin_trgm_ops)"
+            )
+        elif conn.vendor == "sqlite":
+            cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger') AND name LIKE %s",
+                           [f"{FTS_TABLE}%"])
+            existing = {row[0] for row in cursor.fetchall()}
+            if {FTS_TABLE, *FTS_TRIGGERS} <= existing:
+                return
+            try:
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+                    "search_document, content='members_member', content_rowid='id', tokenize='trigram')"
+                )
+            except OperationalError:
+                return # SQLite sem FTS5/trigram: a busca usa LIKE
+            for name, body in FTS_TRIGGERS.items():
+                cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+            # Triggers ausentes = índice possivelmente desatualizado: reconstrói a partir da tabela
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
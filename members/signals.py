@@ -0,0 +1,12 @@
+from django.db.models.signals import post_save
+
+from core.thumbnails import sync_thumbnail
+from .models import Member
+
+
+def update_photo_thumbnail(sender, instance, raw=False, **kwargs):
+    if not raw:
+        sync_thumbnail(instance, "photo", "photo_thumbnail")
+
+
+post_save.connect(update_photo_thumbnail, sender=Member, dispatch_uid="members_photo_thumbnail")
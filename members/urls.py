@@ -5,6 +5,7 @@ app_name = "members"
 
 urlpatterns = [
     path("", views.MemberListView.as_view(), name="member_list"),
+    path("buscar/", views.member_search, name="member_search"),
     path("<int:pk>/", views.MemberDetailView.as_view(), name="member_detail"),
     path("adicionar/", views.MemberCreateView.as_view(), name="member_add"),
     path("<int:pk>/editar/", views.MemberUpdateView.as_view(), name="member_edit"),
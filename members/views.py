@@ -1,11 +1,15 @@
 from django.shortcuts import render, get_object_or_404
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
 from django.contrib.auth.decorators import login_required, permission_required
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
 from django.utils.decorators import method_decorator
+from django.http import JsonResponse
 from .models import Member
 from .forms import MemberForm
+from .search import search_members
+
+MEMBER_SEARCH_LIMIT = 10
 
 # MemberListView e MemberDetailView já usam @method_decorator(login_required, name='dispatch')
 # Todos os perfis (Admin, Secretário, Tesoureiro) podem visualizar membros.
@@ -17,13 +21,38 @@ class MemberListView(LoginRequiredMixin, ListView):
 
     def get_queryset(self):
         queryset = super().get_queryset().select_related("church")
+        query = self.request.GET.get("q", "").strip()
+        if query:
+            # Resultados ordenados por relevância (ver members.search)
+            return search_members(query, queryset)
         return queryset.order_by("name")
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['active_menu'] = 'members'
+        context['search_query'] = self.request.GET.get("q", "").strip()
         return context
 
+@login_required
+def member_search(request):
+    """Busca rápida de membros em JSON (nome, CPF, telefone ou email), mais relevantes primeiro."""
+    query = request.GET.get("q", "").strip()
+    members = search_members(query, Member.objects.select_related("church"))[:MEMBER_SEARCH_LIMIT] if query else []
+    return JsonResponse({
+        "query": query,
+        "results": [
+            {
+                "id": member.pk,
+                "name": member.name,
+                "church": member.church.name if member.church else None,
+                "email": member.email,
+                "phone": member.phone,
+                "url": reverse("members:member_detail", args=[member.pk]),
+            }
+            for member in members
+        ],
+    })
+
 class MemberDetailView(LoginRequiredMixin, DetailView):
     model = Member
     template_name = "members/member_detail.html"
@@ -1,7 +1,8 @@
 from django.contrib import admin
 
 # Register your models here.
-from .models import AccountabilityReport, AccountabilityDocument
+from .models import AccountabilityReport, AccountabilityDocument, ReportJob
 
 admin.site.register(AccountabilityReport)
 admin.site.register(AccountabilityDocument)
+admin.site.register(ReportJob)
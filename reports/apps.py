@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.core import checks
 
 
 class ReportsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reports'
+
+    def ready(self):
+        from . import signals  # Invalidação do cache dos conjuntos de dados dos relatórios
+        from core.checks import shared_cache_check
+        checks.register(shared_cache_check("reports"), checks.Tags.caches)
@@ -0,0 +1,162 @@
+"""
+Conjuntos de dados dos relatórios.
+
+Cada função calcula os números de um relatório uma única vez por conjunto de
+filtros; a tela HTML e as exportações XLSX/PDF consomem o mesmo dicionário.
+O resultado fica no cache por REPORT_CACHE_TIMEOUT segundos, com chave pelos
+filtros e por uma versão trocada a cada alteração nos dados de origem (ver
+reports.signals). Listas sem limite de tamanho (lançamentos do mês) não entram
+no cache: os renderizadores iteram os querysets de movimentacoes_querysets().
+
+A versão fica no cache padrão, compartilhado por todos os processos: os
+workers do gunicorn e o run_report_jobs, que gera as exportações da fila,
+precisam ver a mesma troca de versão (o check reports.E001 recusa o
+LocMemCache fora do DEBUG).
+"""
+import time
+from datetime import date
+
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Sum
+
+from finances import balances, ledger
+from finances.models import Expense, Income
+from members.models import Member
+from school.models import Attendance, SchoolClass, Student
+
+VERSION_KEY = "reports:dataset:version"
+
+
+def _version():
+    return cache.get_or_set(VERSION_KEY, time.time_ns(), None)
+
+
+def invalidate():
+    cache.set(VERSION_KEY, time.time_ns(), None)
+
+
+def _cached(name, params, builder):
+    key = f"reports:dataset:{_version()}:{name}:{":".join(str(p) for p in params)}"
+    dataset = cache.get(key)
+    if dataset is None:
+        dataset = builder()
+        cache.set(key, dataset, settings.REPORT_CACHE_TIMEOUT)
+    return dataset
+
+
+# --- Financeiros ---
+def movimentacoes_querysets(first_day_month):
+    last_day_month = first_day_month + relativedelta(months=1) - relativedelta(days=1)
+    incomes = Income.objects.filter(date__gte=first_day_month, date__lte=last_day_month)\
+                            .select_related("category", "member").order_by("date", "id")
+    expenses = Expense.objects.filter(date__gte=first_day_month, date__lte=last_day_month)\
+                              .select_related("category").order_by("date", "id")
+    return incomes, expenses
+
+
+def movimentacoes(first_day_month):
+    def build():
+        incomes, expenses = movimentacoes_querysets(first_day_month)
+        total_incomes = incomes.aggregate(total=Sum("amount"))["total"] or 0
+        total_expenses = expenses.aggregate(total=Sum("amount"))["total"] or 0
+        return {
+            "total_incomes": total_incomes,
+            "total_expenses": total_expenses,
+            "month_balance": total_incomes - total_expenses,
+        }
+    return _cached("movimentacoes", [first_day_month], build)
+
+
+def dre(year):
+    def build():
+        first_day_year = date(year, 1, 1)
+        last_day_year = date(year, 12, 31)
+        incomes_by_category = ledger.category_totals(Income, first_day_year, last_day_year)
+        expenses_by_category = ledger.category_totals(Expense, first_day_year, last_day_year)
+        total_revenue = sum(item["total"] for item in incomes_by_category) or 0
+        total_expenditure = sum(item["total"] for item in expenses_by_category) or 0
+        return {
+            "incomes_by_category": incomes_by_category,
+            "expenses_by_category": expenses_by_category,
+            "total_revenue": total_revenue,
+            "total_expenditure": total_expenditure,
+            "net_result": total_revenue - total_expenditure,
+        }
+    return _cached("dre", [year], build)
+
+
+def balanco(end_date):
+    def build():
+        accumulated_balance = balances.closing_balance(end_date)
+        assets = {"Caixa/Banco (Saldo Acumulado)": accumulated_balance}
+        liabilities_equity = {"Patrimônio Líquido (Resultado Acumulado)": accumulated_balance}
+        return {
+            "assets": assets,
+            "liabilities_equity": liabilities_equity,
+            "total_assets": sum(assets.values()),
+            "total_liabilities_equity": sum(liabilities_equity.values()),
+        }
+    return _cached("balanco", [end_date], build)
+
+
+# --- Escola Dominical ---
+def alunos_por_turma():
+    def build():
+        classes = SchoolClass.objects.select_related("teacher")\
+                                     .annotate(num_students=Count("students")).order_by("name")
+        return {
+            "classes": list(classes),
+            "total_students": Student.objects.count(),
+        }
+    return _cached("alunos_por_turma", [], build)
+
+
+def frequencia(class_id, class_date):
+    def build():
+        attendances = Attendance.objects.filter(date=class_date).select_related("student__member", "school_class")
+        selected_class = SchoolClass.objects.filter(pk=class_id).first() if str(class_id or "").isdigit() else None
+        classes = SchoolClass.objects.order_by("name")
+        if selected_class:
+            attendances = attendances.filter(school_class=selected_class)
+            classes = classes.filter(pk=selected_class.pk)
+        # Taxas por aluno/turma vêm dos contadores pré-calculados (school.stats), só lidos aqui
+        attendances = list(attendances.order_by("school_class__name", "student__member__name"))
+        total_present = sum(1 for att in attendances if att.present)
+        return {
+            "selected_class_id": str(selected_class.pk) if selected_class else None,
+            "selected_class_name": selected_class.name if selected_class else "Todas as Turmas",
+            "attendances": attendances,
+            "total_present": total_present,
+            "total_absent": len(attendances) - total_present,
+            "total_records": len(attendances),
+            "class_stats": list(classes),
+        }
+    return _cached("frequencia", [class_id, class_date], build)
+
+
+# --- Membros ---
+# Rótulos das opções dos campos agrupados, montados uma vez por processo
+MEMBER_CHOICE_LABELS = {
+    field: dict(Member._meta.get_field(field).flatchoices)
+    for field in ("status", "gender", "marital_status", "member_type")
+}
+
+
+def membros_estatisticas():
+    def build():
+        def grouped(field):
+            labels = MEMBER_CHOICE_LABELS[field]
+            rows = Member.objects.values(field).annotate(count=Count("id")).order_by("-count")
+            return [(labels.get(item[field], item[field]), item["count"]) for item in rows]
+
+        return {
+            "total_members": Member.objects.count(),
+            "active_members": Member.objects.filter(status="ativo").count(),
+            "members_by_status": grouped("status"),
+            "members_by_gender": grouped("gender"),
+            "members_by_marital_status": grouped("marital_status"),
+            "members_by_type": grouped("member_type"),
+        }
+    return _cached("membros_estatisticas", [], build)
@@ -0,0 +1,112 @@
+"""
+Fila de exportações em segundo plano, guardada no próprio banco.
+
+A tela enfileira um ReportJob com a query string dos filtros; o comando
+run_report_jobs pega os jobs pendentes, chama a mesma view de exportação usada
+no download direto e grava o arquivo em MEDIA_ROOT, registrando tamanho e
+duração. Não depende de broker externo.
+
+Um job que fica "processando" por mais de STALE_AFTER (o worker morreu no meio,
+num deploy ou por falta de memória) é dado como interrompido na próxima vez que
+um worker busca trabalho: vai para "erro", e o usuário pode enfileirar de novo.
+Não volta para a fila sozinho para que uma exportação que derruba o worker não
+fique se repetindo.
+"""
+import os
+import re
+import tempfile
+import time
+from datetime import timedelta
+
+from django.core.files import File
+from django.http import HttpRequest, QueryDict
+from django.utils import timezone
+
+from . import views
+from .models import ReportJob
+
+EXPORT_VIEWS = {
+    "movimentacoes_mensais_xlsx": views.export_movimentacoes_mensais_xlsx,
+    "movimentacoes_mensais_pdf": views.export_movimentacoes_mensais_pdf,
+    "dre_xlsx": views.export_dre_xlsx,
+    "dre_pdf": views.export_dre_pdf,
+    "balanco_xlsx": views.export_balanco_xlsx,
+    "balanco_pdf": views.export_balanco_pdf,
+    "alunos_por_turma_xlsx": views.export_alunos_por_turma_xlsx,
+    "alunos_por_turma_pdf": views.export_alunos_por_turma_pdf,
+    "frequencia_xlsx": views.export_frequencia_xlsx,
+    "frequencia_pdf": views.export_frequencia_pdf,
+    "membros_estatisticas_xlsx": views.export_membros_estatisticas_xlsx,
+    "membros_estatisticas_pdf": views.export_membros_estatisticas_pdf,
+    "contribuicoes_anuais_csv": views.export_contribuicoes_anuais_csv,
+}
+
+FILENAME_RE = re.compile(r'filename="?([^";]+)"?')
+
+STALE_AFTER = timedelta(minutes=30)
+
+
+def release_stale(stale_after=STALE_AFTER):
+    """Marca como erro os jobs "processando" há mais de stale_after. Retorna quantos."""
+    now = timezone.now()
+    return ReportJob.objects.filter(status=ReportJob.STATUS_RUNNING, started_at__lt=now - stale_after)\
+                            .update(status=ReportJob.STATUS_FAILED, finished_at=now,
+                                    error="Interrompido: o processamento não terminou (o worker foi encerrado).")
+
+
+def claim_next(stale_after=STALE_AFTER):
+    """
+    Marca o job pendente mais antigo como "processando" e o retorna. O UPDATE
+    condicional garante que dois workers não peguem o mesmo job. Antes, encerra
+    os jobs abandonados por um worker que morreu (release_stale).
+    """
+    release_stale(stale_after)
+    while True:
+        job = ReportJob.objects.filter(status=ReportJob.STATUS_PENDING).order_by("created_at").first()
+        if job is None:
+            return None
+        claimed = ReportJob.objects.filter(pk=job.pk, status=ReportJob.STATUS_PENDING)\
+                                   .update(status=ReportJob.STATUS_RUNNING, started_at=timezone.now())
+        if claimed:
+            job.refresh_from_db()
+            return job
+
+
+def _build_request(job):
+    request = HttpRequest()
+    request.method = "GET"
+    request.GET = QueryDict(job.params)
+    request.user = job.user
+    return request
+
+
+def _filename(job, response):
+    match = FILENAME_RE.search(response.get("Content-Disposition", ""))
+    return os.path.basename(match.group(1)) if match else f"{job.report}_{job.pk}"
+
+
+def run(job):
+    """Gera o arquivo do job, gravando o resultado (ou o erro) no próprio registro."""
+    started = time.monotonic()
+    response = None
+    try:
+        response = EXPORT_VIEWS[job.report](_build_request(job))
+        chunks = response.streaming_content if response.streaming else [response.content]
+        with tempfile.TemporaryFile() as spool:
+            for chunk in chunks:
+                spool.write(chunk)
+            spool.seek(0)
+            job.file.save(_filename(job, response), File(spool), save=False)
+        job.size = job.file.size
+        job.status = ReportJob.STATUS_DONE
+        job.error = ""
+    except Exception as e:
+        job.status = ReportJob.STATUS_FAILED
+        job.error = f"{type(e).__name__}: {e}"
+    finally:
+        if response is not None:
+            response.close()
+    job.duration = time.monotonic() - started
+    job.finished_at = timezone.now()
+    job.save()
+    return job
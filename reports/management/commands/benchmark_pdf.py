@@ -0,0 +1,43 @@
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+
+from core.config import church_configuration
+from reports import pdf
+
+
+class Command(BaseCommand):
+    help = "Mede páginas/s do PDF de movimentações com linhas sintéticas (padrão: 5.000 linhas)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=5000, help="Linhas da tabela de receitas.")
+        parser.add_argument("--repeat", type=int, default=3, help="Quantas vezes gerar o relatório.")
+        parser.add_argument("--seed", type=int, default=1, help="Semente das linhas sintéticas.")
+
+    def rows(self, count, seed):
+        rng = random.Random(seed)
+        start = date(2024, 1, 1)
+        categories = ["Dízimos", "Ofertas", "Missões", "Construção", "Eventos"]
+        for i in range(count):
+            yield (
+                start + timedelta(days=i % 31),
+                f"Lançamento {i + 1} - {rng.choice(categories).lower()} do culto de domingo",
+                rng.choice(categories),
+                f"Membro {rng.randint(1, 2000)}",
+                Decimal(rng.randint(500, 500000)) / 100,
+            )
+
+    def handle(self, *args, **options):
+        church_config = church_configuration()
+        best = None
+        for run in range(1, options["repeat"] + 1):
+            # Gerador: as linhas são produzidas enquanto a tabela é desenhada, como no .iterator() da view
+            pages, elapsed, size = pdf.benchmark(self.rows(options["rows"], options["seed"]), church_config)
+            rate = pages / elapsed if elapsed else 0
+            self.stdout.write(f"#{run}: {pages} páginas em {elapsed:.2f}s ({rate:.1f} páginas/s, {size // 1024} KB)")
+            best = max(best or 0, rate)
+        self.stdout.write(self.style.SUCCESS(
+            f"{options["rows"]} linhas: melhor resultado {best:.1f} páginas/s"
+        ))
@@ -0,0 +1,36 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from reports import jobs
+
+
+class Command(BaseCommand):
+    help = "Processa as exportações de relatórios enfileiradas (ReportJob)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Processa os jobs pendentes e encerra.")
+        parser.add_argument("--interval", type=float, default=5, help="Segundos entre consultas à fila quando vazia.")
+        parser.add_argument("--stale-after", type=float, default=jobs.STALE_AFTER.total_seconds() / 60,
+                            help="Minutos em processamento após os quais um job é dado como interrompido.")
+
+    def handle(self, *args, **options):
+        stale_after = timedelta(minutes=options["stale_after"])
+        try:
+            while True:
+                job = jobs.claim_next(stale_after)
+                if job is None:
+                    if options["once"]:
+                        return
+                    time.sleep(options["interval"])
+                    continue
+                jobs.run(job)
+                if job.status == job.STATUS_DONE:
+                    self.stdout.write(self.style.SUCCESS(
+                        f"#{job.pk} {job.get_report_display()}: {job.size} bytes em {job.duration:.2f}s"
+                    ))
+                else:
+                    self.stderr.write(f"#{job.pk} {job.get_report_display()}: {job.error}")
+        except KeyboardInterrupt:
+            pass
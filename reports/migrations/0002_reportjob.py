@@ -0,0 +1,39 @@
+# Generated by Django 5.2.1 on 2026-10-17 23:07
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('report', models.CharField(choices=[('movimentacoes_mensais_xlsx', 'Movimentações Mensais (Excel)'), ('movimentacoes_mensais_pdf', 'Movimentações Mensais (PDF)'), ('dre_xlsx', 'DRE (Excel)'), ('dre_pdf', 'DRE (PDF)'), ('balanco_xlsx', 'Balanço (Excel)'), ('balanco_pdf', 'Balanço (PDF)'), ('alunos_por_turma_xlsx', 'Alunos por Turma (Excel)'), ('alunos_por_turma_pdf', 'Alunos por Turma (PDF)'), ('frequencia_xlsx', 'Frequência (Excel)'), ('frequencia_pdf', 'Frequência (PDF)'), ('membros_estatisticas_xlsx', 'Estatísticas de Membros (Excel)'), ('membros_estatisticas_pdf', 'Estatísticas de Membros (PDF)'), ('contribuicoes_anuais_csv', 'Contribuições Anuais (CSV)')], max_length=60, verbose_name='Relatório')),
+                ('params', models.CharField(blank=True, max_length=1000, verbose_name='Filtros')),
+                ('status', models.CharField(choices=[('pendente', 'Na fila'), ('processando', 'Processando'), ('concluido', 'Concluído'), ('erro', 'Erro')], default='pendente', max_length=15, verbose_name='Situação')),
+                ('file', models.FileField(blank=True, null=True, upload_to='relatorios/%Y/%m/', verbose_name='Arquivo')),
+                ('size', models.PositiveBigIntegerField(blank=True, null=True, verbose_name='Tamanho (bytes)')),
+                ('duration', models.FloatField(blank=True, null=True, verbose_name='Duração (s)')),
+                ('error', models.TextField(blank=True, verbose_name='Erro')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Iniciado em')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Finalizado em')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='report_jobs', to=settings.AUTH_USER_MODEL, verbose_name='Usuário')),
+            ],
+            options={
+                'verbose_name': 'Exportação em Segundo Plano',
+                'verbose_name_plural': 'Exportações em Segundo Plano',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='reportjob_status_created_idx')],
+            },
+        ),
+    ]
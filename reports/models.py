@@ -1,4 +1,5 @@
 from django.db import models
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 import os
@@ -47,3 +48,59 @@ class AccountabilityDocument(models.Model):
         verbose_name_plural = _("Documentos de Prestação de Contas")
         ordering = ["uploaded_at"]
 
+
+# Exportação gerada em segundo plano pelo comando run_report_jobs
+class ReportJob(models.Model):
+    STATUS_PENDING = "pendente"
+    STATUS_RUNNING = "processando"
+    STATUS_DONE = "concluido"
+    STATUS_FAILED = "erro"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, _("Na fila")),
+        (STATUS_RUNNING, _("Processando")),
+        (STATUS_DONE, _("Concluído")),
+        (STATUS_FAILED, _("Erro")),
+    ]
+    # Chaves de reports.jobs.EXPORT_VIEWS
+    REPORT_CHOICES = [
+        ("movimentacoes_mensais_xlsx", _("Movimentações Mensais (Excel)")),
+        ("movimentacoes_mensais_pdf", _("Movimentações Mensais (PDF)")),
+        ("dre_xlsx", _("DRE (Excel)")),
+        ("dre_pdf", _("DRE (PDF)")),
+        ("balanco_xlsx", _("Balanço (Excel)")),
+        ("balanco_pdf", _("Balanço (PDF)")),
+        ("alunos_por_turma_xlsx", _("Alunos por Turma (Excel)")),
+        ("alunos_por_turma_pdf", _("Alunos por Turma (PDF)")),
+        ("frequencia_xlsx", _("Frequência (Excel)")),
+        ("frequencia_pdf", _("Frequência (PDF)")),
+        ("membros_estatisticas_xlsx", _("Estatísticas de Membros (Excel)")),
+        ("membros_estatisticas_pdf", _("Estatísticas de Membros (PDF)")),
+        ("contribuicoes_anuais_csv", _("Contribuições Anuais (CSV)")),
+    ]
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="report_jobs", verbose_name=_("Usuário"))
+    report = models.CharField(_("Relatório"), max_length=60, choices=REPORT_CHOICES)
+    params = models.CharField(_("Filtros"), max_length=1000, blank=True) # Query string da tela do relatório
+    status = models.CharField(_("Situação"), max_length=15, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    file = models.FileField(_("Arquivo"), upload_to="relatorios/%Y/%m/", null=True, blank=True)
+    size = models.PositiveBigIntegerField(_("Tamanho (bytes)"), null=True, blank=True)
+    duration = models.FloatField(_("Duração (s)"), null=True, blank=True)
+    error = models.TextField(_("Erro"), blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Criado em"))
+    started_at = models.DateTimeField(_("Iniciado em"), null=True, blank=True)
+    finished_at = models.DateTimeField(_("Finalizado em"), null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.get_report_display()} - {self.get_status_display()}"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_DONE, self.STATUS_FAILED)
+
+    class Meta:
+        verbose_name = _("Exportação em Segundo Plano")
+        verbose_name_plural = _("Exportações em Segundo Plano")
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="reportjob_status_created_idx"),
+        ]
@@ -0,0 +1,262 @@
+"""
+Exportação PDF com fpdf2.
+
+PDFReport desenha o cabeçalho da igreja, o título e as tabelas direto no
+documento, sem HTML intermediário. As linhas das tabelas chegam de um iterável
+(querysets lidos com .iterator()) e são desenhadas uma a uma: quando a próxima
+linha não cabe, a página é fechada e o cabeçalho da tabela é repetido na nova.
+
+Recursos caros ficam prontos uma vez por processo:
+- fonte: a Helvetica nativa do PDF, cujas métricas o fpdf2 carrega uma única
+  vez e que não precisa ser embutida no arquivo (cobre o português via latin-1);
+- logo da igreja: decodificado pelo Pillow, reduzido e guardado em PNG na
+  memória, chaveado pelo arquivo e sua data de modificação (trocar o logo
+  gera uma nova chave).
+"""
+import io
+import logging
+import os
+import time
+
+from django.http import HttpResponse
+from django.utils import timezone
+from fpdf import FPDF
+from fpdf.enums import XPos, YPos
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+PDF_CHUNK_SIZE = 2000 # Linhas por ida ao banco ao iterar querysets
+FONT = "Helvetica"
+LOGO_MAX_PIXELS = 300 # Lado maior do logo guardado em memória
+LOGO_HEIGHT = 18 # mm
+ROW_HEIGHT = 6 # mm
+CELL_PADDING = 1 # mm
+HEADER_FILL = (233, 233, 233)
+TOTAL_FILL = (242, 242, 242)
+BORDER_COLOR = (204, 204, 204)
+MONEY_SEPARATORS = str.maketrans(",.", ".,")
+
+_logo_cache = {} # (caminho, mtime) -> PNG em bytes (None se o arquivo for inválido)
+
+
+def _logo_png(logo):
+    """PNG reduzido do logo, decodificado só na primeira vez em cada processo."""
+    if not logo:
+        return None
+    try:
+        path = logo.path
+        key = (path, os.path.getmtime(path))
+    except (OSError, ValueError, NotImplementedError):
+        return None
+    if key not in _logo_cache:
+        try:
+            with Image.open(path) as image:
+                image.thumbnail((LOGO_MAX_PIXELS, LOGO_MAX_PIXELS))
+                buffer = io.BytesIO()
+                image.convert("RGBA").save(buffer, "PNG", optimize=True)
+            png = buffer.getvalue()
+        except (OSError, ValueError) as e:
+            logger.warning("Logo da igreja inválido (%s): %s", path, e)
+            png = None
+        # Uma versão por arquivo: descarta a anterior do mesmo caminho
+        for old_key in [k for k in _logo_cache if k[0] == path]:
+            del _logo_cache[old_key]
+        _logo_cache[key] = png
+    return _logo_cache[key]
+
+
+def money(value):
+    """R$ 1.234,56 (mesmo formato fixo das planilhas, sem depender do locale ativo)."""
+    return "R$ " + f"{value or 0:,.2f}".translate(MONEY_SEPARATORS)
+
+
+def text(value):
+    """Valor de célula como texto aceito pela fonte nativa (latin-1)."""
+    if value is None or value == "":
+        return "-"
+    if hasattr(value, "strftime"):
+        return value.strftime("%d/%m/%Y")
+    return str(value).encode("latin-1", "replace").decode("latin-1")
+
+
+class PDFReport(FPDF):
+    """
+    Relatório A4 com cabeçalho da igreja na primeira página e numeração
+    "Página X de Y" no rodapé de todas. As colunas de uma tabela são passadas
+    como (rótulo, largura em mm, alinhamento "L"/"C"/"R").
+    """
+
+    def __init__(self, title, church_config=None, subtitle=None, orientation="P"):
+        super().__init__(orientation=orientation, unit="mm", format="A4")
+        self.report_title = text(title)
+        self.subtitle = text(subtitle) if subtitle else None
+        self.church_config = church_config
+        self.generated_at = timezone.localtime()
+        self.columns = None
+        self.row_count = 0
+        self.set_margins(15, 15, 15)
+        self.set_auto_page_break(True, margin=15)
+        self.set_title(self.report_title)
+        self.set_draw_color(*BORDER_COLOR)
+        self.set_line_width(0.2)
+        self.set_font(FONT, size=10)
+        self.add_page()
+        self._church_header()
+        self._title()
+
+    # --- Cabeçalho e rodapé ---
+    def _church_header(self):
+        config = self.church_config
+        if not config:
+            return
+        top = self.get_y()
+        logo = _logo_png(config.logo)
+        if logo:
+            self.image(io.BytesIO(logo), x=self.l_margin, y=top, h=LOGO_HEIGHT)
+        self.set_font(FONT, "B", 14)
+        self.cell(0, 7, text(config.church_name or "Nome da Igreja"), align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        self.set_font(FONT, size=9)
+        self.cell(0, 5, text(f"Pastor Presidente: {config.president_pastor_name or "-"}"), align="C",
+                  new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        self.cell(0, 5, text(f"Tesoureiro(a): {config.treasurer_name or "-"}"), align="C",
+                  new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        self.set_y(max(self.get_y(), top + (LOGO_HEIGHT if logo else 0)) + 2)
+
+    def _title(self):
+        self.set_font(FONT, "B", 16)
+        self.cell(0, 9, self.report_title, align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        if self.subtitle:
+            self.set_font(FONT, "B", 12)
+            self.cell(0, 7, self.subtitle, align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        self.ln(4)
+        self.set_font(FONT, size=10)
+
+    def footer(self):
+        self.set_y(-12)
+        self.set_font(FONT, size=8)
+        self.cell(0, 5, f"Gerado em {self.generated_at.strftime("%d/%m/%Y %H:%M")}")
+        self.set_x(self.l_margin)
+        self.cell(0, 5, f"Página {self.page_no()} de {{nb}}", align="R")
+
+    # --- Conteúdo ---
+    def section(self, title):
+        if self.will_page_break(ROW_HEIGHT * 3):
+            self.add_page()
+        self.ln(2)
+        self.set_font(FONT, "B", 12)
+        self.cell(0, 8, text(title), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        self.set_font(FONT, size=10)
+
+    def paragraph(self, value):
+        self.set_font(FONT, size=10)
+        self.multi_cell(0, ROW_HEIGHT, text(value), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+    def _fit(self, value, width):
+        """
+        (texto, largura em mm), cortando o texto mais largo que a coluna para a
+        linha manter a altura fixa. Mede pela tabela de larguras da fonte nativa.
+        """
+        widths = self.current_font.cw
+        scale = self.font_size / 1000
+        used = sum(widths.get(c, 0) for c in value)
+        limit = (width - 2 * CELL_PADDING) / scale
+        if used <= limit:
+            return value, used * scale
+        limit -= 3 * widths["."]
+        used = 0
+        for end, char in enumerate(value):
+            if used + widths.get(char, 0) > limit:
+                return value[:end] + "...", (used + 3 * widths["."]) * scale
+            used += widths.get(char, 0)
+        return value, used * scale
+
+    def _row(self, values, style="", fill=None):
+        """
+        Desenha a linha com rect() + text(): bem mais leve que cell(), que
+        refaz o layout completo do texto a cada célula.
+        """
+        self.set_font(FONT, style, 10)
+        if fill:
+            self.set_fill_color(*fill)
+        x, y = self.l_margin, self.get_y()
+        baseline = y + ROW_HEIGHT / 2 + 0.3 * self.font_size
+        for (_, width, align), value in zip(self.columns, values):
+            self.rect(x, y, width, ROW_HEIGHT, style="DF" if fill else "D")
+            value, text_width = self._fit(text(value), width)
+            if align == "R":
+                left = x + width - CELL_PADDING - text_width
+            elif align == "C":
+                left = x + (width - text_width) / 2
+            else:
+                left = x + CELL_PADDING
+            self.text(left, baseline, value)
+            x += width
+        self.set_xy(self.l_margin, y + ROW_HEIGHT)
+
+    def _table_header(self):
+        self._row([label for label, _, _ in self.columns], style="B", fill=HEADER_FILL)
+
+    def table(self, columns, rows, money_columns=(), empty_message=None):
+        """
+        Desenha a tabela linha a linha a partir de um iterável qualquer.
+        money_columns usa índices a partir de 1, como em StreamingXLSX.
+        """
+        self.columns = columns
+        if self.will_page_break(ROW_HEIGHT * 2):
+            self.add_page()
+        self._table_header()
+        drawn = 0
+        for values in rows:
+            if self.will_page_break(ROW_HEIGHT):
+                self.add_page()
+                self._table_header()
+            if money_columns:
+                values = [money(v) if i in money_columns else v for i, v in enumerate(values, 1)]
+            self._row(values)
+            drawn += 1
+        if not drawn and empty_message:
+            self.set_font(FONT, "I", 10)
+            self.cell(sum(width for _, width, _ in columns), ROW_HEIGHT, text(empty_message), border=1, align="C")
+            self.ln(ROW_HEIGHT)
+        self.row_count += drawn
+        return drawn
+
+    def total(self, label, value, is_money=True):
+        """Linha de total alinhada à tabela atual: rótulo até a penúltima coluna, valor na última."""
+        columns = self.columns or [("", 120, "L"), ("", 60, "R")]
+        if self.will_page_break(ROW_HEIGHT):
+            self.add_page()
+        self.set_font(FONT, "B", 10)
+        self.set_fill_color(*TOTAL_FILL)
+        self.cell(sum(width for _, width, _ in columns[:-1]), ROW_HEIGHT, text(label), border=1, align="R", fill=True)
+        self.cell(columns[-1][1], ROW_HEIGHT, money(value) if is_money else text(value), border=1,
+                  align=columns[-1][2], fill=True)
+        self.ln(ROW_HEIGHT)
+        self.set_font(FONT, size=10)
+
+    def render(self):
+        return bytes(self.output())
+
+    def response(self, filename):
+        response = HttpResponse(self.render(), content_type="application/pdf")
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+# Colunas da tabela de movimentações (A4 retrato: 180 mm úteis)
+MOVEMENT_COLUMNS = [("Data", 22, "C"), ("Descrição", 58, "L"), ("Categoria", 35, "L"),
+                    ("Membro", 37, "L"), ("Valor", 28, "R")]
+
+
+def benchmark(rows, church_config=None):
+    """
+    Gera um relatório de movimentações com as linhas dadas e retorna
+    (páginas, segundos, tamanho em bytes). Usado por manage.py benchmark_pdf.
+    """
+    started = time.monotonic()
+    report = PDFReport("Relatório de Movimentações Mensais", church_config, subtitle="Benchmark")
+    report.section("Receitas")
+    report.table(MOVEMENT_COLUMNS, rows, money_columns={5})
+    content = report.render()
+    return report.pages_count, time.monotonic() - started, len(content)
@@ -0,0 +1,27 @@
+from django.db.models.signals import post_save, post_delete
+
+from core.signals import rows_imported
+
+from finances.models import Income, Expense, Category
+from members.models import Member
+from school.models import SchoolClass, Student, Attendance
+from school.signals import attendance_recorded
+from . import datasets
+
+# Modelos lidos pelos conjuntos de dados dos relatórios: qualquer alteração troca a versão do cache
+REPORT_MODELS = (Income, Expense, Category, Member, SchoolClass, Student, Attendance)
+
+
+def invalidate_reports(sender, **kwargs):
+    datasets.invalidate()
+
+
+for model in REPORT_MODELS:
+    post_save.connect(invalidate_reports, sender=model, dispatch_uid=f"reports_save_{model.__name__}")
+    post_delete.connect(invalidate_reports, sender=model, dispatch_uid=f"reports_delete_{model.__name__}")
+
+# Frequência gravada em lote não passa pelo post_save
+attendance_recorded.connect(invalidate_reports, dispatch_uid="reports_attendance_recorded")
+
+# Importação de planilhas grava com bulk_create, sem post_save
+rows_imported.connect(invalidate_reports, dispatch_uid="reports_rows_imported")
@@ -36,9 +36,17 @@ urlpatterns = [
 #    path("membros/aniversariantes/export/xlsx/", views.export_aniversariantes_xlsx, name="export_aniversariantes_xlsx"),
 #    path("membros/aniversariantes/export/pdf/", views.export_aniversariantes_pdf, name="export_aniversariantes_pdf"),
     path("membros/contribuicoes-anuais/", views.relatorio_contribuicoes_anuais, name="contribuicoes_anuais"),
+    path("membros/contribuicoes-anuais/export/csv/", views.export_contribuicoes_anuais_csv, name="export_contribuicoes_anuais_csv"),
 #    path("membros/contribuicoes-anuais/export/xlsx/", views.export_contribuicoes_anuais_xlsx, name="export_contribuicoes_anuais_xlsx"),
 #    path("membros/contribuicoes-anuais/export/pdf/", views.export_contribuicoes_anuais_pdf, name="export_contribuicoes_anuais_pdf"),
 
+    # Background exports
+    path("exportacoes/", views.report_job_list, name="job_list"),
+    path("exportacoes/nova/", views.report_job_create, name="job_create"),
+    path("exportacoes/<int:pk>/", views.report_job_detail, name="job_detail"),
+    path("exportacoes/<int:pk>/status/", views.report_job_status, name="job_status"),
+    path("exportacoes/<int:pk>/download/", views.report_job_download, name="job_download"),
+
     # Accountability Reports 
     path("prestacao-contas/", views.AccountabilityReportListView.as_view(), name="accountability_list"),
     path("prestacao-contas/nova/", views.AccountabilityReportCreateView.as_view(), name="accountability_create"),
@@ -1,39 +1,40 @@
-from django.shortcuts import render
+from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
 from django.utils.decorators import method_decorator
 from django.db import transaction # Import transaction
 
 # Updated model imports
 from finances.models import Income, Expense
-from school.models import SchoolClass, Student, Attendance
+from finances.choices import category_choices
+from school.models import SchoolClass
 from members.models import Member
-from core.models import ChurchConfiguration # Import ChurchConfiguration
+from members import birthdays
+from core.config import church_configuration
 from django.utils import timezone
 from datetime import date, timedelta # Added timedelta
 from decimal import Decimal # Added Decimal
-from dateutil.relativedelta import relativedelta
-from django.db.models import Sum, Count
-from django.db.models.functions import ExtractDay, TruncYear
+from django.db.models import Sum
+from django.db.models.functions import ExtractMonth, TruncYear
+from django.core.paginator import Paginator
 
 # Import new models and forms for Accountability
-from .models import AccountabilityReport, AccountabilityDocument
+from .models import AccountabilityReport, AccountabilityDocument, ReportJob
 from .forms import AccountabilityReportForm, AccountabilityDocumentFormSet
 
 # Imports for Export
-from django.http import HttpResponse
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment
-from openpyxl.drawing.image import Image as OpenpyxlImage # For adding images to Excel
-import io
-from django.template.loader import render_to_string
-#from fpdf import FPDF
-from django.utils.dateformat import DateFormat
+from django.http import StreamingHttpResponse, FileResponse, JsonResponse, Http404
+from django.views.decorators.http import require_POST
+from openpyxl.styles import Font
+from .xlsx import StreamingXLSX, XLSX_CHUNK_SIZE
+from .pdf import PDFReport, PDF_CHUNK_SIZE, MOVEMENT_COLUMNS
+from . import datasets
+import csv
+from itertools import islice
 from django.utils.formats import number_format
-from django.conf import settings # For MEDIA_ROOT
-import os # For path joining
+import os
 
 
 @login_required
@@ -76,7 +77,7 @@ def _get_report_filters(request):
     member_param = request.GET.get("member")
     
     # Get church configuration
-    church_config = ChurchConfiguration.objects.first()
+    church_config = church_configuration(request)
 
     return {
         "today": today,
@@ -106,22 +107,13 @@ def _get_report_filters(request):
 def relatorio_movimentacoes_mensais(request):
     filters = _get_report_filters(request)
     first_day_month = filters["filter_date"]
-    last_day_month = first_day_month + relativedelta(months=1) - relativedelta(days=1)
-    
-    incomes = Income.objects.filter(date__gte=first_day_month, date__lte=last_day_month).order_by("date")
-    expenses = Expense.objects.filter(date__gte=first_day_month, date__lte=last_day_month).order_by("date")
-
-    total_incomes = sum(i.amount for i in incomes)
-    total_expenses = sum(e.amount for e in expenses)
-    month_balance = total_incomes - total_expenses
+    incomes, expenses = datasets.movimentacoes_querysets(first_day_month)
 
     context = {
+        **datasets.movimentacoes(first_day_month),
         "active_menu": "reports",
         "incomes": incomes, 
         "expenses": expenses, 
-        "total_incomes": total_incomes, 
-        "total_expenses": total_expenses, 
-        "month_balance": month_balance, 
         "selected_month": first_day_month.month, 
         "selected_year": first_day_month.year, 
         "month_name": filters["available_months"].get(first_day_month.month),
@@ -132,187 +124,82 @@ def relatorio_movimentacoes_mensais(request):
     }
     return render(request, "reports/movimentacoes_mensais.html", context)
 
-
 @login_required
 def export_movimentacoes_mensais_xlsx(request):
     filters = _get_report_filters(request)
     church_config = filters["church_config"]
     first_day_month = filters["filter_date"]
-    last_day_month = first_day_month + relativedelta(months=1) - relativedelta(days=1)
-
-    incomes = Income.objects.filter(date__gte=first_day_month, date__lte=last_day_month).order_by("date")
-    expenses = Expense.objects.filter(date__gte=first_day_month, date__lte=last_day_month).order_by("date")
-    total_incomes = sum(i.amount for i in incomes)
-    total_expenses = sum(e.amount for e in expenses)
-    month_balance = total_incomes - total_expenses
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = f"Mov. {first_day_month.strftime("%b_%Y")}"
-    current_row = 1
-
-    # Church Info Header
-    if church_config:
-        if church_config.logo and hasattr(church_config.logo, "path") and os.path.exists(church_config.logo.path):
-            try:
-                img = OpenpyxlImage(church_config.logo.path)
-                img.height = 75 # Adjust as needed
-                img.width = 75  # Adjust as needed
-                ws.add_image(img, "A1")
-            except Exception as e:
-                print(f"Error adding logo to Excel: {e}") # Log error
-        ws.merge_cells(start_row=current_row, start_column=2, end_row=current_row, end_column=5)
-        cell = ws.cell(row=current_row, column=2, value=church_config.church_name or "Nome da Igreja")
-        cell.font = Font(bold=True, size=16)
-        cell.alignment = Alignment(horizontal="center")
-        current_row += 1
-        ws.merge_cells(start_row=current_row, start_column=2, end_row=current_row, end_column=5)
-        cell = ws.cell(row=current_row, column=2, value=f"Pastor Presidente: {church_config.president_pastor_name or "-"} | Tesoureiro(a): {church_config.treasurer_name or "-"}")
-        cell.font = Font(size=10)
-        cell.alignment = Alignment(horizontal="center")
-        current_row += 1
-
-    # Report Title
-    ws.merge_cells(start_row=current_row, start_column=1, end_row=current_row, end_column=5)
-    title_cell = ws.cell(row=current_row, column=1, value=f"Relatório de Movimentações Mensais - {filters["available_months"].get(first_day_month.month)} {first_day_month.year}")
-    title_cell.font = Font(bold=True, size=14)
-    title_cell.alignment = Alignment(horizontal="center")
-    ws.row_dimensions[current_row].height = 20
-    current_row += 1
-    
-    ws.append([]) # Spacer row
-    current_row +=1
+    incomes, expenses = datasets.movimentacoes_querysets(first_day_month)
+    dataset = datasets.movimentacoes(first_day_month)
+
+    sheet = StreamingXLSX(f"Mov. {first_day_month.strftime("%b_%Y")}", {"A": 12, "B": 35, "C": 20, "D": 20, "E": 15})
+    sheet.title(f"Relatório de Movimentações Mensais - {filters["available_months"].get(first_day_month.month)} {first_day_month.year}", church_config)
 
     # Incomes Section
-    ws.cell(row=current_row, column=1, value="Receitas").font = Font(bold=True, size=12)
-    current_row += 1
-    header_incomes = ["Data", "Descrição", "Categoria", "Membro", "Valor"]
-    ws.append(header_incomes)
-    header_font = Font(bold=True)
-    for col_idx, _ in enumerate(header_incomes, 1):
-        ws.cell(row=current_row, column=col_idx).font = header_font
-    current_row += 1
-
-    for income in incomes:
-        ws.append([
-            income.date,
-            income.description,
-            income.category.name if income.category else "",
-            income.member.name if income.member else "",
-            income.amount
-        ])
-        ws.cell(row=current_row, column=5).number_format = "R$ #,##0.00"
-        current_row += 1
-
-    ws.append(["", "", "", "Total Receitas:", total_incomes])
-    ws.cell(row=current_row, column=4).font = Font(bold=True)
-    ws.cell(row=current_row, column=5).font = Font(bold=True)
-    ws.cell(row=current_row, column=5).number_format = "R$ #,##0.00"
-    current_row += 1
+    sheet.section("Receitas")
+    sheet.header(["Data", "Descrição", "Categoria", "Membro", "Valor"])
+    sheet.rows(
+        incomes.values_list("date", "description", "category__name", "member__name", "amount").iterator(chunk_size=XLSX_CHUNK_SIZE),
+        money_columns={5},
+    )
+    sheet.append(["", "", "", "Total Receitas:", dataset["total_incomes"]], font=Font(bold=True), money_columns={5}, font_columns={4, 5})
 
     # Expenses Section
-    ws.append([]) # Spacer row
-    current_row +=1
-    ws.cell(row=current_row, column=1, value="Despesas").font = Font(bold=True, size=12)
-    current_row += 1
-    header_expenses = ["Data", "Descrição", "Categoria", "", "Valor"]
-    ws.append(header_expenses)
-    for col_idx, _ in enumerate(header_expenses, 1):
-        if ws.cell(row=current_row, column=col_idx).value: # Apply font only if cell has value
-             ws.cell(row=current_row, column=col_idx).font = header_font
-    current_row += 1
-
-    for expense in expenses:
-        ws.append([
-            expense.date,
-            expense.description,
-            expense.category.name if expense.category else "",
-            "",
-            expense.amount
-        ])
-        ws.cell(row=current_row, column=5).number_format = "R$ #,##0.00"
-        current_row += 1
-
-    ws.append(["", "", "", "Total Despesas:", total_expenses])
-    ws.cell(row=current_row, column=4).font = Font(bold=True)
-    ws.cell(row=current_row, column=5).font = Font(bold=True)
-    ws.cell(row=current_row, column=5).number_format = "R$ #,##0.00"
-    current_row += 1
+    sheet.blank()
+    sheet.section("Despesas")
+    sheet.header(["Data", "Descrição", "Categoria", "", "Valor"])
+    sheet.rows(
+        (
+            (expense_date, description, category_name, "", amount)
+            for expense_date, description, category_name, amount in expenses.values_list(
+                "date", "description", "category__name", "amount"
+            ).iterator(chunk_size=XLSX_CHUNK_SIZE)
+        ),
+        money_columns={5},
+    )
+    sheet.append(["", "", "", "Total Despesas:", dataset["total_expenses"]], font=Font(bold=True), money_columns={5}, font_columns={4, 5})
 
     # Balance Section
-    ws.append([]) # Spacer row
-    current_row += 1
-    ws.append(["", "", "", "Saldo do Mês:", month_balance])
-    ws.cell(row=current_row, column=4).font = Font(bold=True, size=12)
-    ws.cell(row=current_row, column=5).font = Font(bold=True, size=12)
-    ws.cell(row=current_row, column=5).number_format = "R$ #,##0.00"
-
-    # Adjust column widths
-    ws.column_dimensions["A"].width = 12
-    ws.column_dimensions["B"].width = 35
-    ws.column_dimensions["C"].width = 20
-    ws.column_dimensions["D"].width = 20
-    ws.column_dimensions["E"].width = 15
-
-    buffer = io.BytesIO()
-    wb.save(buffer)
-    buffer.seek(0)
-
-    response = HttpResponse(
-        buffer,
-        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    )
-    response["Content-Disposition"] = f"attachment; filename=movimentacoes_{first_day_month.strftime("%Y_%m")}.xlsx"
-    return response
+    sheet.blank()
+    sheet.append(["", "", "", "Saldo do Mês:", dataset["month_balance"]], font=Font(bold=True, size=12), money_columns={5}, font_columns={4, 5})
+
+    return sheet.response(f"movimentacoes_{first_day_month.strftime("%Y_%m")}.xlsx")
 
 @login_required
 def export_movimentacoes_mensais_pdf(request):
     filters = _get_report_filters(request)
-    church_config = filters["church_config"]
     first_day_month = filters["filter_date"]
-    last_day_month = first_day_month + relativedelta(months=1) - relativedelta(days=1)
+    incomes, expenses = datasets.movimentacoes_querysets(first_day_month)
+    dataset = datasets.movimentacoes(first_day_month)
 
-    incomes = Income.objects.filter(date__gte=first_day_month, date__lte=last_day_month).order_by("date")
-    expenses = Expense.objects.filter(date__gte=first_day_month, date__lte=last_day_month).order_by("date")
-    total_incomes = sum(i.amount for i in incomes)
-    total_expenses = sum(e.amount for e in expenses)
-    month_balance = total_incomes - total_expenses
+    report = PDFReport(
+        "Relatório de Movimentações Mensais", filters["church_config"],
+        subtitle=f"{filters["available_months"].get(first_day_month.month)} {first_day_month.year}",
+    )
+    report.section("Receitas")
+    report.table(
+        MOVEMENT_COLUMNS,
+        incomes.values_list("date", "description", "category__name", "member__name", "amount").iterator(chunk_size=PDF_CHUNK_SIZE),
+        money_columns={5}, empty_message="Nenhuma receita no período.",
+    )
+    report.total("Total Receitas:", dataset["total_incomes"])
+
+    report.section("Despesas")
+    report.table(
+        MOVEMENT_COLUMNS[:3] + [("", 37, "L"), MOVEMENT_COLUMNS[4]],
+        (
+            (expense_date, description, category_name, "", amount)
+            for expense_date, description, category_name, amount in expenses.values_list(
+                "date", "description", "category__name", "amount"
+            ).iterator(chunk_size=PDF_CHUNK_SIZE)
+        ),
+        money_columns={5}, empty_message="Nenhuma despesa no período.",
+    )
+    report.total("Total Despesas:", dataset["total_expenses"])
+    report.ln(4)
+    report.total("Saldo do Mês:", dataset["month_balance"])
 
-    context = {
-        "incomes": incomes,
-        "expenses": expenses,
-        "total_incomes": total_incomes,
-        "total_expenses": total_expenses,
-        "month_balance": month_balance,
-        "report_period": f"{filters["available_months"].get(first_day_month.month)} {first_day_month.year}",
-        "church_config": church_config,
-    }
-    html_string = render_to_string("reports/movimentacoes_mensais_pdf_template.html", context)
-    
-    # Add base_url for WeasyPrint to find static files like images if they are referenced in the template
-    # This requires MEDIA_URL and MEDIA_ROOT to be set correctly in settings.py
-    # and the image path in the template to be relative to MEDIA_ROOT or an absolute URL.
-    # For local file paths, ensure they are absolute or construct them using settings.BASE_DIR or settings.MEDIA_ROOT.
-    # Example: if church_config.logo.url is /media/church_logo/logo.png, then base_url should allow resolving it.
-    # A common approach is to use request.build_absolute_uri("/") as base_url if your static/media are served by Django dev server
-    # or configure static file serving properly for production.
-    # For direct file paths from MEDIA_ROOT:
-    base_url = settings.MEDIA_ROOT # This might not be directly usable by WeasyPrint for HTML relative paths.
-                                  # It's often better to ensure template uses full URLs or data URIs for images in PDFs.
-                                  # Or, pass the absolute path to the image in the context and use <img src="file:///path/to/image.png">
-                                  # if WeasyPrint is configured to allow local file access.
-
-    # For simplicity, if logo is stored and accessible via URL (e.g. /media/...), 
-    # and your dev server serves media, WeasyPrint might find it if you pass request to template or use absolute URLs.
-    # If logo path is local, you might need to embed it as base64 or ensure WeasyPrint can access it.
-    # We'll assume the template handles displaying the logo, possibly using church_config.logo.url
-
-    #html = HTML(string=html_string, base_url=request.build_absolute_uri("/")) # Helps resolve relative URLs for CSS/Images
-    #pdf_file = html.write_pdf()
-
-    response = HttpResponse(None, content_type="application/pdf")
-    response["Content-Disposition"] = f"attachment; filename=movimentacoes_{first_day_month.strftime("%Y_%m")}.pdf"
-    return response
+    return report.response(f"movimentacoes_{first_day_month.strftime("%Y_%m")}.pdf")
 
 
 @login_required
@@ -340,29 +227,11 @@ def relatorio_dre(request):
 
     filters = _get_report_filters(request)
     year_param = filters["year_param"]
-    first_day_year = date(year_param, 1, 1)
-    last_day_year = date(year_param, 12, 31)
-
-    incomes_by_category = Income.objects.filter(
-        date__gte=first_day_year, date__lte=last_day_year
-    ).values("category__name").annotate(total=Sum("amount")).order_by("-total")
-
-    expenses_by_category = Expense.objects.filter(
-        date__gte=first_day_year, date__lte=last_day_year
-    ).values("category__name").annotate(total=Sum("amount")).order_by("-total")
-
-    total_revenue = sum(item["total"] for item in incomes_by_category) or 0
-    total_expenditure = sum(item["total"] for item in expenses_by_category) or 0
-    net_result = total_revenue - total_expenditure
 
     context = {
+        **datasets.dre(year_param),
         "active_menu": "reports",
         "selected_year": year_param,
-        "incomes_by_category": incomes_by_category, 
-        "expenses_by_category": expenses_by_category, 
-        "total_revenue": total_revenue, 
-        "total_expenditure": total_expenditure, 
-        "net_result": net_result, 
         "available_years": filters["available_years"],
         "filters_query_string": request.GET.urlencode(),
         "church_config": filters["church_config"],
@@ -374,148 +243,60 @@ def export_dre_xlsx(request):
     filters = _get_report_filters(request)
     church_config = filters["church_config"]
     year_param = filters["year_param"]
-    first_day_year = date(year_param, 1, 1)
-    last_day_year = date(year_param, 12, 31)
-
-    incomes_by_category = Income.objects.filter(
-        date__gte=first_day_year, date__lte=last_day_year
-    ).values("category__name").annotate(total=Sum("amount")).order_by("-total")
-    expenses_by_category = Expense.objects.filter(
-        date__gte=first_day_year, date__lte=last_day_year
-    ).values("category__name").annotate(total=Sum("amount")).order_by("-total")
-    total_revenue = sum(item["total"] for item in incomes_by_category) or 0
-    total_expenditure = sum(item["total"] for item in expenses_by_category) or 0
-    net_result = total_revenue - total_expenditure
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = f"DRE {year_param}"
-    current_row = 1
-
-    if church_config:
-        if church_config.logo and hasattr(church_config.logo, "path") and os.path.exists(church_config.logo.path):
-            try:
-                img = OpenpyxlImage(church_config.logo.path)
-                img.height = 75; img.width = 75
-                ws.add_image(img, "A1")
-            except Exception as e:
-                print(f"Error adding logo to DRE Excel: {e}")
-        ws.merge_cells(start_row=current_row, start_column=2, end_row=current_row, end_column=3)
-        cell = ws.cell(row=current_row, column=2, value=church_config.church_name or "Nome da Igreja")
-        cell.font = Font(bold=True, size=16); cell.alignment = Alignment(horizontal="center")
-        current_row += 1
-        ws.merge_cells(start_row=current_row, start_column=2, end_row=current_row, end_column=3)
-        cell = ws.cell(row=current_row, column=2, value=f"Pastor: {church_config.president_pastor_name or "-"} | Tesoureiro: {church_config.treasurer_name or "-"}")
-        cell.font = Font(size=10); cell.alignment = Alignment(horizontal="center")
-        current_row += 1
-
-    ws.merge_cells(start_row=current_row, start_column=1, end_row=current_row, end_column=3)
-    title_cell = ws.cell(row=current_row, column=1, value=f"Demonstração do Resultado do Exercício - {year_param}")
-    title_cell.font = Font(bold=True, size=14); title_cell.alignment = Alignment(horizontal="center")
-    ws.row_dimensions[current_row].height = 20
-    current_row += 2
-
-    ws.cell(row=current_row, column=1, value="Receitas Operacionais").font = Font(bold=True, size=12)
-    current_row += 1
-    ws.append(["Categoria", "Valor (R$)"])
-    ws.cell(row=current_row, column=1).font = Font(bold=True)
-    ws.cell(row=current_row, column=2).font = Font(bold=True)
-    current_row += 1
-    for item in incomes_by_category:
-        ws.append([item["category__name"] or "Outras Receitas", item["total"]])
-        ws.cell(row=current_row, column=2).number_format = "R$ #,##0.00"
-        current_row += 1
-    ws.append(["Total Receitas Operacionais", total_revenue])
-    ws.cell(row=current_row, column=1).font = Font(bold=True)
-    ws.cell(row=current_row, column=2).font = Font(bold=True)
-    ws.cell(row=current_row, column=2).number_format = "R$ #,##0.00"
-    current_row += 2
-
-    ws.cell(row=current_row, column=1, value="Despesas Operacionais").font = Font(bold=True, size=12)
-    current_row += 1
-    ws.append(["Categoria", "Valor (R$)"])
-    ws.cell(row=current_row, column=1).font = Font(bold=True)
-    ws.cell(row=current_row, column=2).font = Font(bold=True)
-    current_row += 1
-    for item in expenses_by_category:
-        ws.append([item["category__name"] or "Outras Despesas", item["total"]])
-        ws.cell(row=current_row, column=2).number_format = "R$ #,##0.00"
-        current_row += 1
-    ws.append(["Total Despesas Operacionais", total_expenditure])
-    ws.cell(row=current_row, column=1).font = Font(bold=True)
-    ws.cell(row=current_row, column=2).font = Font(bold=True)
-    ws.cell(row=current_row, column=2).number_format = "R$ #,##0.00"
-    current_row += 2
-
-    ws.append(["Resultado Líquido do Exercício", net_result])
-    ws.cell(row=current_row, column=1).font = Font(bold=True, size=12)
-    ws.cell(row=current_row, column=2).font = Font(bold=True, size=12)
-    ws.cell(row=current_row, column=2).number_format = "R$ #,##0.00"
-
-    ws.column_dimensions["A"].width = 35
-    ws.column_dimensions["B"].width = 20
-    ws.column_dimensions["C"].width = 20 # For merged church info
-
-    buffer = io.BytesIO()
-    wb.save(buffer)
-    buffer.seek(0)
-    response = HttpResponse(buffer, content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-    response["Content-Disposition"] = f"attachment; filename=DRE_{year_param}.xlsx"
-    return response
+    dataset = datasets.dre(year_param)
+
+    sheet = StreamingXLSX(f"DRE {year_param}", {"A": 35, "B": 20, "C": 20})
+    sheet.title(f"Demonstração do Resultado do Exercício - {year_param}", church_config)
+
+    sheet.section("Receitas Operacionais")
+    sheet.header(["Categoria", "Valor (R$)"])
+    sheet.rows(((item["category__name"] or "Outras Receitas", item["total"]) for item in dataset["incomes_by_category"]), money_columns={2})
+    sheet.append(["Total Receitas Operacionais", dataset["total_revenue"]], font=Font(bold=True), money_columns={2})
+    sheet.blank()
+
+    sheet.section("Despesas Operacionais")
+    sheet.header(["Categoria", "Valor (R$)"])
+    sheet.rows(((item["category__name"] or "Outras Despesas", item["total"]) for item in dataset["expenses_by_category"]), money_columns={2})
+    sheet.append(["Total Despesas Operacionais", dataset["total_expenditure"]], font=Font(bold=True), money_columns={2})
+    sheet.blank()
+
+    sheet.append(["Resultado Líquido do Exercício", dataset["net_result"]], font=Font(bold=True, size=12), money_columns={2})
+
+    return sheet.response(f"DRE_{year_param}.xlsx")
 
 @login_required
 def export_dre_pdf(request):
     filters = _get_report_filters(request)
-    church_config = filters["church_config"]
     year_param = filters["year_param"]
-    first_day_year = date(year_param, 1, 1)
-    last_day_year = date(year_param, 12, 31)
-
-    incomes_by_category = Income.objects.filter(
-        date__gte=first_day_year, date__lte=last_day_year
-    ).values("category__name").annotate(total=Sum("amount")).order_by("-total")
-    expenses_by_category = Expense.objects.filter(
-        date__gte=first_day_year, date__lte=last_day_year
-    ).values("category__name").annotate(total=Sum("amount")).order_by("-total")
-    total_revenue = sum(item["total"] for item in incomes_by_category) or 0
-    total_expenditure = sum(item["total"] for item in expenses_by_category) or 0
-    net_result = total_revenue - total_expenditure
+    dataset = datasets.dre(year_param)
+    columns = [("Categoria", 120, "L"), ("Valor (R$)", 60, "R")]
 
-    context = {
-        "report_period": str(year_param),
-        "incomes_by_category": incomes_by_category,
-        "expenses_by_category": expenses_by_category,
-        "total_revenue": total_revenue,
-        "total_expenditure": total_expenditure,
-        "net_result": net_result,
-        "church_config": church_config,
-    }
-    html_string = render_to_string("reports/dre_pdf_template.html", context)
-    #html = HTML(string=html_string, base_url=request.build_absolute_uri("/"))
-    #pdf_file = html.write_pdf()
-    response = HttpResponse(None, content_type="application/pdf")
-    response["Content-Disposition"] = f"attachment; filename=DRE_{year_param}.pdf"
-    return response
+    report = PDFReport("Demonstração do Resultado do Exercício", filters["church_config"], subtitle=str(year_param))
+    report.section("Receitas Operacionais")
+    report.table(columns, ((item["category__name"] or "Outras Receitas", item["total"]) for item in dataset["incomes_by_category"]),
+                 money_columns={2}, empty_message="Nenhuma receita no ano.")
+    report.total("Total Receitas Operacionais", dataset["total_revenue"])
+
+    report.section("Despesas Operacionais")
+    report.table(columns, ((item["category__name"] or "Outras Despesas", item["total"]) for item in dataset["expenses_by_category"]),
+                 money_columns={2}, empty_message="Nenhuma despesa no ano.")
+    report.total("Total Despesas Operacionais", dataset["total_expenditure"])
+    report.ln(4)
+    report.total("Resultado Líquido do Exercício", dataset["net_result"])
+
+    return report.response(f"DRE_{year_param}.pdf")
 
 
 @login_required
 def relatorio_balanco(request):
     filters = _get_report_filters(request)
     end_date = filters["end_date"]
-    total_incomes_accumulated = Income.objects.filter(date__lte=end_date).aggregate(total=Sum("amount"))["total"] or 0
-    total_expenses_accumulated = Expense.objects.filter(date__lte=end_date).aggregate(total=Sum("amount"))["total"] or 0
-    accumulated_balance = total_incomes_accumulated - total_expenses_accumulated
-    assets = {"Caixa/Banco (Saldo Acumulado)": accumulated_balance}
-    liabilities_equity = {"Patrimônio Líquido (Resultado Acumulado)": accumulated_balance}
 
     context = {
+        **datasets.balanco(end_date),
         "active_menu": "reports",
         "end_date": end_date, 
         "end_date_str": filters["end_date_str"],
-        "assets": assets,
-        "liabilities_equity": liabilities_equity, 
-        "total_assets": sum(assets.values()),
-        "total_liabilities_equity": sum(liabilities_equity.values()), 
         "filters_query_string": request.GET.urlencode(),
         "church_config": filters["church_config"],
     }
@@ -526,120 +307,47 @@ def export_balanco_xlsx(request):
     filters = _get_report_filters(request)
     church_config = filters["church_config"]
     end_date = filters["end_date"]
-    total_incomes_accumulated = Income.objects.filter(date__lte=end_date).aggregate(total=Sum("amount"))["total"] or 0
-    total_expenses_accumulated = Expense.objects.filter(date__lte=end_date).aggregate(total=Sum("amount"))["total"] or 0
-    accumulated_balance = total_incomes_accumulated - total_expenses_accumulated
-    assets = {"Caixa/Banco (Saldo Acumulado)": accumulated_balance}
-    liabilities_equity = {"Patrimônio Líquido (Resultado Acumulado)": accumulated_balance}
-    total_assets_val = sum(assets.values())
-    total_liabilities_equity_val = sum(liabilities_equity.values())
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = f"Balanco {end_date.strftime("%Y%m%d")}"
-    current_row = 1
-
-    if church_config:
-        if church_config.logo and hasattr(church_config.logo, "path") and os.path.exists(church_config.logo.path):
-            try:
-                img = OpenpyxlImage(church_config.logo.path)
-                img.height = 75; img.width = 75
-                ws.add_image(img, "A1")
-            except Exception as e:
-                print(f"Error adding logo to Balanço Excel: {e}")
-        ws.merge_cells(start_row=current_row, start_column=2, end_row=current_row, end_column=3)
-        cell = ws.cell(row=current_row, column=2, value=church_config.church_name or "Nome da Igreja")
-        cell.font = Font(bold=True, size=16); cell.alignment = Alignment(horizontal="center")
-        current_row += 1
-        ws.merge_cells(start_row=current_row, start_column=2, end_row=current_row, end_column=3)
-        cell = ws.cell(row=current_row, column=2, value=f"Pastor: {church_config.president_pastor_name or "-"} | Tesoureiro: {church_config.treasurer_name or "-"}")
-        cell.font = Font(size=10); cell.alignment = Alignment(horizontal="center")
-        current_row += 1
-
-    ws.merge_cells(start_row=current_row, start_column=1, end_row=current_row, end_column=3)
-    title_cell = ws.cell(row=current_row, column=1, value=f"Balanço Patrimonial Simplificado - {end_date.strftime("%d/%m/%Y")}")
-    title_cell.font = Font(bold=True, size=14); title_cell.alignment = Alignment(horizontal="center")
-    ws.row_dimensions[current_row].height = 20
-    current_row += 2
-
-    ws.cell(row=current_row, column=1, value="Ativos").font = Font(bold=True, size=12)
-    current_row += 1
-    ws.append(["Conta", "Valor (R$)"])
-    ws.cell(row=current_row, column=1).font = Font(bold=True)
-    ws.cell(row=current_row, column=2).font = Font(bold=True)
-    current_row += 1
-    for conta, valor in assets.items():
-        ws.append([conta, valor])
-        ws.cell(row=current_row, column=2).number_format = "R$ #,##0.00"
-        current_row += 1
-    ws.append(["Total Ativos", total_assets_val])
-    ws.cell(row=current_row, column=1).font = Font(bold=True)
-    ws.cell(row=current_row, column=2).font = Font(bold=True)
-    ws.cell(row=current_row, column=2).number_format = "R$ #,##0.00"
-    current_row += 2
-
-    ws.cell(row=current_row, column=1, value="Passivos e Patrimônio Líquido").font = Font(bold=True, size=12)
-    current_row += 1
-    ws.append(["Conta", "Valor (R$)"])
-    ws.cell(row=current_row, column=1).font = Font(bold=True)
-    ws.cell(row=current_row, column=2).font = Font(bold=True)
-    current_row += 1
-    for conta, valor in liabilities_equity.items():
-        ws.append([conta, valor])
-        ws.cell(row=current_row, column=2).number_format = "R$ #,##0.00"
-        current_row += 1
-    ws.append(["Total Passivos e Patrimônio Líquido", total_liabilities_equity_val])
-    ws.cell(row=current_row, column=1).font = Font(bold=True)
-    ws.cell(row=current_row, column=2).font = Font(bold=True)
-    ws.cell(row=current_row, column=2).number_format = "R$ #,##0.00"
-
-    ws.column_dimensions["A"].width = 40
-    ws.column_dimensions["B"].width = 20
-    ws.column_dimensions["C"].width = 20 # For merged church info
-
-    buffer = io.BytesIO()
-    wb.save(buffer)
-    buffer.seek(0)
-    response = HttpResponse(buffer, content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-    response["Content-Disposition"] = f"attachment; filename=Balanco_{end_date.strftime("%Y%m%d")}.xlsx"
-    return response
+    dataset = datasets.balanco(end_date)
+
+    sheet = StreamingXLSX(f"Balanco {end_date.strftime("%Y%m%d")}", {"A": 40, "B": 20, "C": 20})
+    sheet.title(f"Balanço Patrimonial Simplificado - {end_date.strftime("%d/%m/%Y")}", church_config)
+
+    sheet.section("Ativos")
+    sheet.header(["Conta", "Valor (R$)"])
+    sheet.rows(dataset["assets"].items(), money_columns={2})
+    sheet.append(["Total Ativos", dataset["total_assets"]], font=Font(bold=True), money_columns={2})
+    sheet.blank()
+
+    sheet.section("Passivos e Patrimônio Líquido")
+    sheet.header(["Conta", "Valor (R$)"])
+    sheet.rows(dataset["liabilities_equity"].items(), money_columns={2})
+    sheet.append(["Total Passivos e Patrimônio Líquido", dataset["total_liabilities_equity"]], font=Font(bold=True), money_columns={2})
+
+    return sheet.response(f"Balanco_{end_date.strftime("%Y%m%d")}.xlsx")
 
 @login_required
 def export_balanco_pdf(request):
     filters = _get_report_filters(request)
-    church_config = filters["church_config"]
     end_date = filters["end_date"]
-    total_incomes_accumulated = Income.objects.filter(date__lte=end_date).aggregate(total=Sum("amount"))["total"] or 0
-    total_expenses_accumulated = Expense.objects.filter(date__lte=end_date).aggregate(total=Sum("amount"))["total"] or 0
-    accumulated_balance = total_incomes_accumulated - total_expenses_accumulated
-    assets = {"Caixa/Banco (Saldo Acumulado)": accumulated_balance}
-    liabilities_equity = {"Patrimônio Líquido (Resultado Acumulado)": accumulated_balance}
+    dataset = datasets.balanco(end_date)
+    columns = [("Conta", 120, "L"), ("Valor (R$)", 60, "R")]
 
-    context = {
-        "report_period": end_date.strftime("%d/%m/%Y"),
-        "assets": assets,
-        "liabilities_equity": liabilities_equity,
-        "total_assets": sum(assets.values()),
-        "total_liabilities_equity": sum(liabilities_equity.values()),
-        "church_config": church_config,
-    }
-    html_string = render_to_string("reports/balanco_pdf_template.html", context)
-    #html = HTML(string=html_string, base_url=request.build_absolute_uri("/"))
-    #pdf_file = html.write_pdf()
-    response = HttpResponse(None, content_type="application/pdf")
-    response["Content-Disposition"] = f"attachment; filename=Balanco_{end_date.strftime("%Y%m%d")}.pdf"
-    return response
+    report = PDFReport("Balanço Patrimonial Simplificado", filters["church_config"], subtitle=end_date.strftime("%d/%m/%Y"))
+    report.section("Ativos")
+    report.table(columns, dataset["assets"].items(), money_columns={2})
+    report.total("Total Ativos", dataset["total_assets"])
+
+    report.section("Passivos e Patrimônio Líquido")
+    report.table(columns, dataset["liabilities_equity"].items(), money_columns={2})
+    report.total("Total Passivos e Patrimônio Líquido", dataset["total_liabilities_equity"])
 
-# --- Relatórios da Escola Dominical ---
+    return report.response(f"Balanco_{end_date.strftime("%Y%m%d")}.pdf")
 @login_required
 def relatorio_alunos_por_turma(request):
     filters = _get_report_filters(request)
-    classes = SchoolClass.objects.annotate(num_students=Count("students")).order_by("name")
-    total_students = Student.objects.count()
     context = {
+        **datasets.alunos_por_turma(),
         "active_menu": "reports",
-        "classes": classes, 
-        "total_students": total_students,
         "church_config": filters["church_config"],
     }
     return render(request, "reports/alunos_por_turma.html", context)
@@ -648,218 +356,70 @@ def relatorio_alunos_por_turma(request):
 def export_alunos_por_turma_xlsx(request):
     filters = _get_report_filters(request)
     church_config = filters["church_config"]
-    classes = SchoolClass.objects.annotate(num_students=Count("students")).order_by("name")
-    total_students = Student.objects.count()
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Alunos por Turma"
-    current_row = 1
-
-    if church_config:
-        if church_config.logo and hasattr(church_config.logo, "path") and os.path.exists(church_config.logo.path):
-            try:
-                img = OpenpyxlImage(church_config.logo.path)
-                img.height = 75; img.width = 75
-                ws.add_image(img, "A1")
-            except Exception as e:
-                print(f"Error adding logo to Alunos Turma Excel: {e}")
-        ws.merge_cells(start_row=current_row, start_column=2, end_row=current_row, end_column=3)
-        cell = ws.cell(row=current_row, column=2, value=church_config.church_name or "Nome da Igreja")
-        cell.font = Font(bold=True, size=16); cell.alignment = Alignment(horizontal="center")
-        current_row += 1
-        ws.merge_cells(start_row=current_row, start_column=2, end_row=current_row, end_column=3)
-        cell = ws.cell(row=current_row, column=2, value=f"Pastor: {church_config.president_pastor_name or "-"} | Tesoureiro: {church_config.treasurer_name or "-"}")
-        cell.font = Font(size=10); cell.alignment = Alignment(horizontal="center")
-        current_row += 1
-
-    ws.merge_cells(start_row=current_row, start_column=1, end_row=current_row, end_column=3)
-    title_cell = ws.cell(row=current_row, column=1, value="Relatório de Alunos por Turma")
-    title_cell.font = Font(bold=True, size=14); title_cell.alignment = Alignment(horizontal="center")
-    ws.row_dimensions[current_row].height = 20
-    current_row += 2
-
-    ws.append(["Turma", "Nº de Alunos"])
-    ws.cell(row=current_row, column=1).font = Font(bold=True)
-    ws.cell(row=current_row, column=2).font = Font(bold=True)
-    current_row += 1
-    for c in classes:
-        ws.append([c.name, c.num_students])
-        current_row += 1
-    ws.append(["Total Geral de Alunos", total_students])
-    ws.cell(row=current_row, column=1).font = Font(bold=True)
-    ws.cell(row=current_row, column=2).font = Font(bold=True)
-
-    ws.column_dimensions["A"].width = 30
-    ws.column_dimensions["B"].width = 15
-    ws.column_dimensions["C"].width = 20 # For merged church info
-
-    buffer = io.BytesIO()
-    wb.save(buffer)
-    buffer.seek(0)
-    response = HttpResponse(buffer, content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-    response["Content-Disposition"] = "attachment; filename=alunos_por_turma.xlsx"
-    return response
+    dataset = datasets.alunos_por_turma()
+
+    sheet = StreamingXLSX("Alunos por Turma", {"A": 30, "B": 15, "C": 20})
+    sheet.title("Relatório de Alunos por Turma", church_config)
+
+    sheet.header(["Turma", "Nº de Alunos"])
+    sheet.rows((c.name, c.num_students) for c in dataset["classes"])
+    sheet.append(["Total Geral de Alunos", dataset["total_students"]], font=Font(bold=True))
+
+    return sheet.response("alunos_por_turma.xlsx")
 
 @login_required
 def export_alunos_por_turma_pdf(request):
     filters = _get_report_filters(request)
-    church_config = filters["church_config"]
-    classes = SchoolClass.objects.annotate(num_students=Count("students")).order_by("name")
-    total_students = Student.objects.count()
-    context = {
-        "classes": classes,
-        "total_students": total_students,
-        "church_config": church_config,
-        "report_period": "Geral" # Or specific if filtered
-    }
-    html_string = render_to_string("reports/alunos_por_turma_pdf_template.html", context)
-    #html = HTML(string=html_string, base_url=request.build_absolute_uri("/"))
-    #pdf_file = html.write_pdf()
-    response = HttpResponse(None, content_type="application/pdf")
-    response["Content-Disposition"] = "attachment; filename=alunos_por_turma.pdf"
-    return response
+    dataset = datasets.alunos_por_turma()
 
+    report = PDFReport("Relatório de Alunos por Turma", filters["church_config"], subtitle="Geral")
+    report.table(
+        [("Turma", 75, "L"), ("Professor(a)", 75, "L"), ("Nº de Alunos", 30, "C")],
+        ((c.name, c.teacher.name if c.teacher else "-", c.num_students) for c in dataset["classes"]),
+        empty_message="Nenhuma turma cadastrada.",
+    )
+    report.total("Total Geral de Alunos", dataset["total_students"], is_money=False)
+
+    return report.response("alunos_por_turma.pdf")
 
 
-@login_required
-def export_frequencia_xlsx(request):
-    filters = _get_report_filters(request)
-    church_config = filters["church_config"]
-    class_id = filters["class_id"]
-    class_date = filters["class_date"]
-    attendances = Attendance.objects.filter(date=class_date).select_related("student__member", "school_class")
-    selected_class_name = "Todas as Turmas"
-    if class_id:
-        try:
-            selected_class = SchoolClass.objects.get(pk=class_id)
-            attendances = attendances.filter(school_class_id=class_id)
-            selected_class_name = selected_class.name
-        except SchoolClass.DoesNotExist:
-            pass
-    attendances = attendances.order_by("school_class__name", "student__member__name")
-    total_present = attendances.filter(present=True).count()
-    total_absent = attendances.filter(present=False).count()
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = f"Frequencia {class_date.strftime("%Y%m%d")}"
-    current_row = 1
-
-    if church_config:
-        if church_config.logo and hasattr(church_config.logo, "path") and os.path.exists(church_config.logo.path):
-            try:
-                img = OpenpyxlImage(church_config.logo.path)
-                img.height = 75; img.width = 75
-                ws.add_image(img, "A1")
-            except Exception as e:
-                print(f"Error adding logo to Frequencia Excel: {e}")
-        ws.merge_cells(start_row=current_row, start_column=2, end_row=current_row, end_column=4)
-        cell = ws.cell(row=current_row, column=2, value=church_config.church_name or "Nome da Igreja")
-        cell.font = Font(bold=True, size=16); cell.alignment = Alignment(horizontal="center")
-        current_row += 1
-        ws.merge_cells(start_row=current_row, start_column=2, end_row=current_row, end_column=4)
-        cell = ws.cell(row=current_row, column=2, value=f"Pastor: {church_config.president_pastor_name or "-"} | Tesoureiro: {church_config.treasurer_name or "-"}")
-        cell.font = Font(size=10); cell.alignment = Alignment(horizontal="center")
-        current_row += 1
-
-    ws.merge_cells(start_row=current_row, start_column=1, end_row=current_row, end_column=4)
-    title_cell = ws.cell(row=current_row, column=1, value=f"Relatório de Frequência - Turma: {selected_class_name} - Data: {class_date.strftime("%d/%m/%Y")}")
-    title_cell.font = Font(bold=True, size=14); title_cell.alignment = Alignment(horizontal="center")
-    ws.row_dimensions[current_row].height = 20
-    current_row += 2
-
-    ws.append(["Turma", "Aluno", "Status", "Observação"])
-    header_font = Font(bold=True)
-    for col_idx in range(1,5):
-        ws.cell(row=current_row, column=col_idx).font = header_font
-    current_row += 1
-
-    for att in attendances:
-        ws.append([
-            att.school_class.name,
-            att.student.member.name,
-            "Presente" if att.present else "Ausente",
-            att.observation
-        ])
-        current_row += 1
-    
-    current_row += 1
-    ws.append(["", "Total Presentes:", total_present])
-    ws.cell(row=current_row, column=2).font = Font(bold=True)
-    current_row += 1
-    ws.append(["", "Total Ausentes:", total_absent])
-    ws.cell(row=current_row, column=2).font = Font(bold=True)
-
-    ws.column_dimensions["A"].width = 25
-    ws.column_dimensions["B"].width = 30
-    ws.column_dimensions["C"].width = 12
-    ws.column_dimensions["D"].width = 30
-
-    buffer = io.BytesIO()
-    wb.save(buffer)
-    buffer.seek(0)
-    response = HttpResponse(buffer, content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-    response["Content-Disposition"] = f"attachment; filename=frequencia_{class_date.strftime("%Y%m%d")}.xlsx"
-    return response
 
 @login_required
 def export_frequencia_pdf(request):
     filters = _get_report_filters(request)
-    church_config = filters["church_config"]
-    class_id = filters["class_id"]
     class_date = filters["class_date"]
-    attendances = Attendance.objects.filter(date=class_date).select_related("student__member", "school_class")
-    selected_class_name = "Todas as Turmas"
-    if class_id:
-        try:
-            selected_class = SchoolClass.objects.get(pk=class_id)
-            attendances = attendances.filter(school_class_id=class_id)
-            selected_class_name = selected_class.name
-        except SchoolClass.DoesNotExist:
-            pass
-    attendances = attendances.order_by("school_class__name", "student__member__name")
-    total_present = attendances.filter(present=True).count()
-    total_absent = attendances.filter(present=False).count()
+    dataset = datasets.frequencia(filters["class_id"], class_date)
 
-    context = {
-        "attendances": attendances,
-        "report_period": f"Turma: {selected_class_name} - Data: {class_date.strftime("%d/%m/%Y")}",
-        "total_present": total_present,
-        "total_absent": total_absent,
-        "church_config": church_config,
-    }
-    html_string = render_to_string("reports/frequencia_pdf_template.html", context)
-    #html = HTML(string=html_string, base_url=request.build_absolute_uri("/"))
-    #pdf_file = html.write_pdf()
-    response = HttpResponse(None, content_type="application/pdf")
-    response["Content-Disposition"] = f"attachment; filename=frequencia_{class_date.strftime("%Y%m%d")}.pdf"
-    return response
+    report = PDFReport(
+        "Relatório de Frequência", filters["church_config"],
+        subtitle=f"Turma: {dataset["selected_class_name"]} - Data: {class_date.strftime("%d/%m/%Y")}",
+    )
+    report.table(
+        [("Turma", 36, "L"), ("Aluno", 52, "L"), ("Status", 20, "C"), ("Freq. 4 sem.", 22, "C"),
+         ("Freq. 12 sem.", 24, "C"), ("Últ. Presença", 26, "C")],
+        (
+            (att.school_class.name, att.student.member.name, "Presente" if att.present else "Ausente",
+             f"{att.student.attendance_rate_4w}%" if att.student.attendance_rate_4w is not None else "-",
+             f"{att.student.attendance_rate_12w}%" if att.student.attendance_rate_12w is not None else "-",
+             att.student.last_seen)
+            for att in dataset["attendances"]
+        ),
+        empty_message="Nenhum registro de frequência encontrado.",
+    )
+    if dataset["attendances"]:
+        report.ln(2)
+        report.total("Total Presentes:", dataset["total_present"], is_money=False)
+        report.total("Total Ausentes:", dataset["total_absent"], is_money=False)
+        report.total("Total de Registros:", dataset["total_records"], is_money=False)
+
+    return report.response(f"frequencia_{class_date.strftime("%Y%m%d")}.pdf")
 
-# --- Relatórios de Membros ---
 @login_required
 def relatorio_membros_estatisticas(request):
     filters = _get_report_filters(request)
-    total_members = Member.objects.count()
-    active_members = Member.objects.filter(status="active").count()
-    members_by_status = Member.objects.values("status").annotate(count=Count("id")).order_by("-count")
-    members_by_gender = Member.objects.values("gender").annotate(count=Count("id")).order_by("-count")
-    members_by_marital_status = Member.objects.values("marital_status").annotate(count=Count("id")).order_by("-count")
-    members_by_type = Member.objects.values("member_type").annotate(count=Count("id")).order_by("-count")
-
-    status_map = dict(Member.STATUS_CHOICES)
-    gender_map = dict(Member.GENDER_CHOICES)
-    marital_map = dict(Member.MARITAL_STATUS_CHOICES)
-    type_map = dict(Member.MEMBER_TYPE_CHOICES)
-
     context = {
+        **datasets.membros_estatisticas(),
         "active_menu": "reports",
-        "total_members": total_members,
-        "active_members": active_members, 
-        "members_by_status": [(status_map.get(item["status"], item["status"]), item["count"]) for item in members_by_status],
-        "members_by_gender": [(gender_map.get(item["gender"], item["gender"]), item["count"]) for item in members_by_gender],
-        "members_by_marital_status": [(marital_map.get(item["marital_status"], item["marital_status"]), item["count"]) for item in members_by_marital_status],
-        "members_by_type": [(type_map.get(item["member_type"], item["member_type"]), item["count"]) for item in members_by_type],
         "church_config": filters["church_config"],
     }
     return render(request, "reports/members_estatisticas.html", context)
@@ -867,168 +427,145 @@ def relatorio_membros_estatisticas(request):
 @login_required
 def export_membros_estatisticas_xlsx(request):
     filters = _get_report_filters(request)
-    church_config = filters["church_config"]
-    total_members = Member.objects.count()
-    active_members = Member.objects.filter(status="active").count()
-    members_by_status = Member.objects.values("status").annotate(count=Count("id")).order_by("-count")
-    members_by_gender = Member.objects.values("gender").annotate(count=Count("id")).order_by("-count")
-    members_by_marital_status = Member.objects.values("marital_status").annotate(count=Count("id")).order_by("-count")
-    members_by_type = Member.objects.values("member_type").annotate(count=Count("id")).order_by("-count")
-    status_map = dict(Member.STATUS_CHOICES); gender_map = dict(Member.GENDER_CHOICES)
-    marital_map = dict(Member.MARITAL_STATUS_CHOICES); type_map = dict(Member.MEMBER_TYPE_CHOICES)
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Estatisticas Membros"
-    current_row = 1
-
-    if church_config:
-        if church_config.logo and hasattr(church_config.logo, "path") and os.path.exists(church_config.logo.path):
-            try:
-                img = OpenpyxlImage(church_config.logo.path)
-                img.height = 75; img.width = 75
-                ws.add_image(img, "A1")
-            except Exception as e:
-                print(f"Error adding logo to Estatisticas Excel: {e}")
-        ws.merge_cells(start_row=current_row, start_column=2, end_row=current_row, end_column=4) # Increased colspan for longer text
-        cell = ws.cell(row=current_row, column=2, value=church_config.church_name or "Nome da Igreja")
-        cell.font = Font(bold=True, size=16); cell.alignment = Alignment(horizontal="center")
-        current_row += 1
-        ws.merge_cells(start_row=current_row, start_column=2, end_row=current_row, end_column=4)
-        cell = ws.cell(row=current_row, column=2, value=f"Pastor: {church_config.president_pastor_name or "-"} | Tesoureiro: {church_config.treasurer_name or "-"}")
-        cell.font = Font(size=10); cell.alignment = Alignment(horizontal="center")
-        current_row += 1
-
-    ws.merge_cells(start_row=current_row, start_column=1, end_row=current_row, end_column=4)
-    title_cell = ws.cell(row=current_row, column=1, value="Relatório de Estatísticas de Membros")
-    title_cell.font = Font(bold=True, size=14); title_cell.alignment = Alignment(horizontal="center")
-    ws.row_dimensions[current_row].height = 20
-    current_row += 2
-
-    ws.append(["Total de Membros:", total_members])
-    ws.cell(row=current_row, column=1).font = Font(bold=True)
-    current_row += 1
-    ws.append(["Membros Ativos:", active_members])
-    ws.cell(row=current_row, column=1).font = Font(bold=True)
-    current_row += 2
-
-    def add_stat_section(title, data_list, key_map):
-        nonlocal current_row
-        ws.cell(row=current_row, column=1, value=title).font = Font(bold=True, size=12)
-        current_row += 1
-        ws.append(["Item", "Quantidade"])
-        ws.cell(row=current_row, column=1).font = Font(bold=True)
-        ws.cell(row=current_row, column=2).font = Font(bold=True)
-        current_row += 1
-        for item_code, count in data_list:
-            ws.append([key_map.get(item_code, item_code), count])
-            current_row += 1
-        current_row += 1 # Spacer
-
-    add_stat_section("Por Status", [(item["status"], item["count"]) for item in members_by_status], status_map)
-    add_stat_section("Por Gênero", [(item["gender"], item["count"]) for item in members_by_gender], gender_map)
-    add_stat_section("Por Estado Civil", [(item["marital_status"], item["count"]) for item in members_by_marital_status], marital_map)
-    add_stat_section("Por Tipo", [(item["member_type"], item["count"]) for item in members_by_type], type_map)
-
-    ws.column_dimensions["A"].width = 30
-    ws.column_dimensions["B"].width = 15
-    ws.column_dimensions["C"].width = 15 # For merged church info
-    ws.column_dimensions["D"].width = 15 # For merged church info
-
-    buffer = io.BytesIO()
-    wb.save(buffer)
-    buffer.seek(0)
-    response = HttpResponse(buffer, content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-    response["Content-Disposition"] = "attachment; filename=membros_estatisticas.xlsx"
-    return response
+    dataset = datasets.membros_estatisticas()
+
+    sheet = StreamingXLSX("Estatisticas Membros", {"A": 30, "B": 15, "C": 15, "D": 15})
+    sheet.title("Relatório de Estatísticas de Membros", filters["church_config"])
+
+    sheet.append(["Total de Membros:", dataset["total_members"]], font=Font(bold=True), font_columns={1})
+    sheet.append(["Membros Ativos:", dataset["active_members"]], font=Font(bold=True), font_columns={1})
+    sheet.blank()
+
+    for title, key in [("Por Status", "members_by_status"), ("Por Gênero", "members_by_gender"),
+                       ("Por Estado Civil", "members_by_marital_status"), ("Por Tipo", "members_by_type")]:
+        sheet.section(title)
+        sheet.header(["Item", "Quantidade"])
+        sheet.rows(dataset[key])
+        sheet.blank()
+
+    return sheet.response("membros_estatisticas.xlsx")
 
 @login_required
 def export_membros_estatisticas_pdf(request):
     filters = _get_report_filters(request)
-    church_config = filters["church_config"]
-    total_members = Member.objects.count()
-    active_members = Member.objects.filter(status="active").count()
-    members_by_status = Member.objects.values("status").annotate(count=Count("id")).order_by("-count")
-    members_by_gender = Member.objects.values("gender").annotate(count=Count("id")).order_by("-count")
-    members_by_marital_status = Member.objects.values("marital_status").annotate(count=Count("id")).order_by("-count")
-    members_by_type = Member.objects.values("member_type").annotate(count=Count("id")).order_by("-count")
-    status_map = dict(Member.STATUS_CHOICES); gender_map = dict(Member.GENDER_CHOICES)
-    marital_map = dict(Member.MARITAL_STATUS_CHOICES); type_map = dict(Member.MEMBER_TYPE_CHOICES)
+    dataset = datasets.membros_estatisticas()
+    columns = [("Item", 120, "L"), ("Quantidade", 60, "C")]
 
-    context = {
-        "total_members": total_members,
-        "active_members": active_members,
-        "members_by_status": [(status_map.get(item["status"], item["status"]), item["count"]) for item in members_by_status],
-        "members_by_gender": [(gender_map.get(item["gender"], item["gender"]), item["count"]) for item in members_by_gender],
-        "members_by_marital_status": [(marital_map.get(item["marital_status"], item["marital_status"]), item["count"]) for item in members_by_marital_status],
-        "members_by_type": [(type_map.get(item["member_type"], item["member_type"]), item["count"]) for item in members_by_type],
-        "church_config": church_config,
-        "report_period": "Geral"
-    }
-    html_string = render_to_string("reports/membros_estatisticas_pdf_template.html", context)
-    #html = HTML(string=html_string, base_url=request.build_absolute_uri("/"))
-    #pdf_file = html.write_pdf()
-    response = HttpResponse(None, content_type="application/pdf")
-    response["Content-Disposition"] = "attachment; filename=membros_estatisticas.pdf"
-    return response
+    report = PDFReport("Relatório de Estatísticas de Membros", filters["church_config"], subtitle="Geral")
+    report.total("Total de Membros:", dataset["total_members"], is_money=False)
+    report.total("Membros Ativos:", dataset["active_members"], is_money=False)
+
+    for title, key in [("Por Status", "members_by_status"), ("Por Gênero", "members_by_gender"),
+                       ("Por Estado Civil", "members_by_marital_status"), ("Por Tipo", "members_by_type")]:
+        report.section(title)
+        report.table(columns, dataset[key], empty_message="Nenhum membro cadastrado.")
+
+    return report.response("membros_estatisticas.pdf")
+
+BIRTHDAY_DEFAULT_DAYS = 30 # Janela padrão de "próximos dias"
 
 @login_required
 def relatorio_aniversariantes(request):
     filters = _get_report_filters(request)
     month_param = filters["month_param"]
-    birthdays = Member.objects.filter(birth_date__month=month_param)\
-                                    .annotate(day=ExtractDay("birth_date"))\
-                                    .order_by("day", "name")
+    today = timezone.localdate()
+    period = request.GET.get("periodo", "mes")
+    try:
+        days = min(max(int(request.GET.get("dias", BIRTHDAY_DEFAULT_DAYS)), 1), birthdays.MAX_WINDOW_DAYS)
+    except (ValueError, TypeError):
+        days = BIRTHDAY_DEFAULT_DAYS
+
+    members = Member.objects.all()
+    if period == "hoje":
+        members = birthdays.today(members, today)
+        period_name = f"hoje ({today.strftime('%d/%m')})"
+    elif period == "semana":
+        members = birthdays.this_week(members, today)
+        period_name = "esta semana"
+    elif period == "proximos":
+        members = birthdays.next_days(members, today, days)
+        period_name = f"os próximos {days} dias"
+    else:
+        period = "mes"
+        members = birthdays.in_month(members, month_param)
+        period_name = filters["available_months"].get(month_param, "")
     month_name = filters["available_months"].get(month_param, "")
 
     context = {
         "active_menu": "reports",
-        "birthdays": birthdays, 
+        "birthdays": members,
         "selected_month": month_param,
         "month_name": month_name,
+        "period": period,
+        "period_name": period_name,
+        "days": days,
         "available_months": filters["available_months"],
         "church_config": filters["church_config"],
     }
     return render(request, "reports/aniversariantes.html", context)
 
-@login_required
-def relatorio_contribuicoes_anuais(request):
-    filters = _get_report_filters(request)
-    year_param = filters["year_param"]
-    member_param = filters["member_param"]
+CONTRIBUTIONS_PAGE_SIZE = 50 # Membros por página no relatório de contribuições
+CONTRIBUTIONS_CHUNK_SIZE = 500 # Membros por consulta na exportação em streaming
+
+def _tithe_category_ids():
+    # Resolvido pela lista de categorias em cache, em vez de category__name__iexact em cada consulta
+    return [pk for pk, name in category_choices() if name.lower() == "dízimos"]
+
+def _contributions_members(member_param):
     all_members = Member.objects.filter(status="ativo").order_by("name")
-    contributions_data = []
     selected_member_name = "Todos"
-
     if member_param and member_param != "all":
         members_to_query = Member.objects.filter(pk=member_param)
-        if members_to_query.exists():
-            selected_member_name = members_to_query.first().name
+        selected_member = members_to_query.first()
+        if selected_member:
+            selected_member_name = selected_member.name
     else:
         members_to_query = all_members # All active members if "all" or no specific member
         member_param = "all" # Ensure it's set for template logic
+    return all_members, members_to_query, member_param, selected_member_name
 
-    for member_obj in members_to_query:
-        monthly_contributions = []
-        total_annual = Decimal("0.00")
-        for month_num in range(1, 13):
-            start_of_month = date(year_param, month_num, 1)
-            end_of_month = (start_of_month + relativedelta(months=1)) - relativedelta(days=1)
-            month_sum = Income.objects.filter(
-                member=member_obj,
-                date__gte=start_of_month,
-                date__lte=end_of_month,
-                category__name__iexact="Dízimos"  # Assuming category name for tithe
-            ).aggregate(total=Sum("amount"))["total"] or Decimal("0.00")
-            monthly_contributions.append(month_sum)
-            total_annual += month_sum
-        contributions_data.append({
-            "member_name": member_obj.name,
-            "monthly_values": monthly_contributions,
-            "total_annual": total_annual
-        })
-    
-    total_overall_contribution = sum([item["total_annual"] for item in contributions_data])  
+def _contributions_matrix(year, members, tithe_category_ids):
+    """
+    Monta as linhas (membro x 12 meses) para os membros informados (dicts com
+    id e name) com uma única consulta agrupada por membro e mês.
+    """
+    members = list(members)
+    monthly = {member["id"]: [Decimal("0.00")] * 12 for member in members}
+    monthly_sums = Income.objects.filter(
+        member_id__in=monthly.keys(),
+        category_id__in=tithe_category_ids,
+        date__gte=date(year, 1, 1),
+        date__lte=date(year, 12, 31),
+    ).values("member_id", month=ExtractMonth("date")).annotate(total=Sum("amount")).order_by()
+    for row in monthly_sums:
+        monthly[row["member_id"]][row["month"] - 1] += row["total"]
+    return [{
+        "member_name": member["name"],
+        "monthly_values": monthly[member["id"]],
+        "total_annual": sum(monthly[member["id"]], Decimal("0.00")),
+    } for member in members]
+
+@login_required
+def relatorio_contribuicoes_anuais(request):
+    filters = _get_report_filters(request)
+    year_param = filters["year_param"]
+    all_members, members_to_query, member_param, selected_member_name = _contributions_members(filters["member_param"])
+    tithe_category_ids = _tithe_category_ids()
+
+    paginator = Paginator(members_to_query.values("id", "name"), CONTRIBUTIONS_PAGE_SIZE)
+    page_obj = paginator.get_page(request.GET.get("page"))
+    contributions_data = _contributions_matrix(year_param, page_obj.object_list, tithe_category_ids)
+
+    # Total geral de todos os membros filtrados (não só da página atual)
+    total_overall_contribution = Income.objects.filter(
+        member__in=members_to_query,
+        category_id__in=tithe_category_ids,
+        date__gte=date(year_param, 1, 1),
+        date__lte=date(year_param, 12, 31),
+    ).aggregate(total=Sum("amount"))["total"] or Decimal("0.00")
+
+    pagination_params = request.GET.copy()
+    pagination_params.pop("page", None)
 
     context = {
         "active_menu": "reports",
@@ -1037,6 +574,10 @@ def relatorio_contribuicoes_anuais(request):
         "selected_member_name": selected_member_name,
         "all_members_for_filter": all_members,
         "contributions": contributions_data,
+        "page_obj": page_obj,
+        "is_paginated": page_obj.has_other_pages(),
+        "pagination_query_string": pagination_params.urlencode(),
+        "filters_query_string": request.GET.urlencode(),
         "available_years": filters["available_years"],
         "months_header": [m[1][:3] for m in filters["available_months"].items()], # Jan, Fev, Mar...
         "church_config": filters["church_config"],
@@ -1044,6 +585,35 @@ def relatorio_contribuicoes_anuais(request):
     }
     return render(request, "reports/contribuicoes_anuais.html", context)
 
+class _Echo:
+    """Buffer "falso" para o csv.writer devolver cada linha ao StreamingHttpResponse."""
+    def write(self, value):
+        return value
+
+@login_required
+def export_contribuicoes_anuais_csv(request):
+    filters = _get_report_filters(request)
+    year_param = filters["year_param"]
+    _, members_to_query, _, _ = _contributions_members(filters["member_param"])
+    tithe_category_ids = _tithe_category_ids()
+    months_header = [m[1][:3] for m in filters["available_months"].items()]
+
+    def rows():
+        writer = csv.writer(_Echo(), delimiter=";")
+        yield writer.writerow(["Membro", *months_header, "Total"])
+        members = members_to_query.values("id", "name").iterator(chunk_size=CONTRIBUTIONS_CHUNK_SIZE)
+        while chunk := list(islice(members, CONTRIBUTIONS_CHUNK_SIZE)):
+            for item in _contributions_matrix(year_param, chunk, tithe_category_ids):
+                yield writer.writerow([
+                    item["member_name"],
+                    *(number_format(value, 2) for value in item["monthly_values"]),
+                    number_format(item["total_annual"], 2),
+                ])
+
+    response = StreamingHttpResponse(rows(), content_type="text/csv; charset=utf-8")
+    response["Content-Disposition"] = f"attachment; filename=contribuicoes_{year_param}.csv"
+    return response
+
 
 # Accountability Reports Views (Prestação de Contas)
 @method_decorator(login_required, name='dispatch')
@@ -1059,7 +629,6 @@ class AccountabilityReportListView(ListView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["active_menu"] = "reports"
-        context["church_config"] = ChurchConfiguration.objects.first()
         return context
 
 @method_decorator(login_required, name='dispatch')
@@ -1071,7 +640,6 @@ class AccountabilityReportDetailView(DetailView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["active_menu"] = "reports"
-        context["church_config"] = ChurchConfiguration.objects.first()
         return context
 
 @method_decorator(login_required, name='dispatch')
@@ -1088,7 +656,6 @@ class AccountabilityReportCreateView(CreateView):
         else:
             data["documents_formset"] = AccountabilityDocumentFormSet(prefix="documents")
         data["active_menu"] = "reports"
-        data["church_config"] = ChurchConfiguration.objects.first()
         return data
 
     def form_valid(self, form):
@@ -1123,7 +690,6 @@ class AccountabilityReportUpdateView(UpdateView):
         else:
             data["documents_formset"] = AccountabilityDocumentFormSet(instance=self.object, prefix="documents")
         data["active_menu"] = "reports"
-        data["church_config"] = ChurchConfiguration.objects.first()
         return data
 
     def form_valid(self, form):
@@ -1149,7 +715,6 @@ class AccountabilityReportDeleteView(DeleteView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context["active_menu"] = "reports"
-        context["church_config"] = ChurchConfiguration.objects.first()
         return context
 
     def form_valid(self, form):
@@ -1212,34 +777,12 @@ def relatorio_financeiro_categorias(request):
 @login_required
 def relatorio_frequencia(request):
     filters = _get_report_filters(request)
-    class_id = filters["class_id"]
-    class_date = filters["class_date"]
-    classes = SchoolClass.objects.all().order_by("name")
-    attendances = Attendance.objects.filter(date=class_date).select_related("student__member", "school_class")
-    selected_class = None
-    if class_id:
-        try:
-            selected_class = SchoolClass.objects.get(pk=class_id)
-            attendances = attendances.filter(school_class_id=class_id)
-        except SchoolClass.DoesNotExist:
-            class_id = None # Reset if class not found
-
-    attendances = attendances.order_by("school_class__name", "student__member__name")
-    total_present = attendances.filter(present=True).count()
-    total_absent = attendances.filter(present=False).count()
-    total_records = attendances.count()
-
     context = {
+        **datasets.frequencia(filters["class_id"], filters["class_date"]),
         "active_menu": "reports",
-        "classes": classes,
-        "selected_class_id": class_id,
-        "selected_class_name": selected_class.name if selected_class else "Todas as Turmas",
-        "class_date": class_date,
+        "classes": SchoolClass.objects.all().order_by("name"),
+        "class_date": filters["class_date"],
         "class_date_str": filters["class_date_str"],
-        "attendances": attendances,
-        "total_present": total_present,
-        "total_absent": total_absent,
-        "total_records": total_records,
         "filters_query_string": request.GET.urlencode(),
         "church_config": filters["church_config"],
     }
@@ -1248,149 +791,78 @@ def relatorio_frequencia(request):
 @login_required
 def export_frequencia_xlsx(request):
     filters = _get_report_filters(request)
-    church_config = filters["church_config"]
-    class_id = filters["class_id"]
     class_date = filters["class_date"]
-    class_date_str = filters["class_date_str"]
-
-    selected_class = None
-    attendance_records = []
-    if class_id:
-        try:
-            selected_class = SchoolClass.objects.get(pk=class_id)
-            students_in_class = selected_class.students.all().order_by('name')
-            recorded_attendance = Attendance.objects.filter(school_class=selected_class, date=class_date)
-            present_student_ids = list(recorded_attendance.values_list('student_id', flat=True))
-            for student in students_in_class:
-                attendance_records.append({
-                    'student_name': student.name,
-                    'status': 'Presente' if student.id in present_student_ids else 'Ausente'
-                })
-        except SchoolClass.DoesNotExist:
-            pass 
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = f"Frequencia_{selected_class.name[:10] if selected_class else ''}_{class_date_str.replace('-' , '')}"
-    current_row = 1
-
-    if church_config:
-        if church_config.logo and hasattr(church_config.logo, "path") and os.path.exists(church_config.logo.path):
-            try:
-                img = OpenpyxlImage(church_config.logo.path)
-                img.height = 75; img.width = 75
-                ws.add_image(img, "A1")
-            except Exception as e:
-                print(f"Error adding logo to Frequencia Excel: {e}")
-        ws.merge_cells(start_row=current_row, start_column=2, end_row=current_row, end_column=3)
-        cell = ws.cell(row=current_row, column=2, value=church_config.church_name or "Nome da Igreja")
-        cell.font = Font(bold=True, size=16); cell.alignment = Alignment(horizontal="center")
-        current_row += 1
-        ws.merge_cells(start_row=current_row, start_column=2, end_row=current_row, end_column=3)
-        cell = ws.cell(row=current_row, column=2, value=f"Pastor: {church_config.president_pastor_name or "-"} | Tesoureiro: {church_config.treasurer_name or "-"}")
-        cell.font = Font(size=10); cell.alignment = Alignment(horizontal="center")
-        current_row += 1
-
-    report_title_str = "Relatório de Frequência"
-    if selected_class:
-        report_title_str += f" - Turma: {selected_class.name}"
-    report_title_str += f" - Data: {DateFormat(class_date).format('d/m/Y')}"
-    
-    ws.merge_cells(start_row=current_row, start_column=1, end_row=current_row, end_column=3)
-    title_cell = ws.cell(row=current_row, column=1, value=report_title_str)
-    title_cell.font = Font(bold=True, size=14); title_cell.alignment = Alignment(horizontal="center")
-    ws.row_dimensions[current_row].height = 20
-    current_row += 2
-
-    if attendance_records:
-        headers = ["Nome do Aluno", "Status"]
-        ws.append(headers)
-        header_font = Font(bold=True)
-        for col_idx, _ in enumerate(headers, 1):
-            ws.cell(row=current_row, column=col_idx).font = header_font
-        current_row += 1
-        for record in attendance_records:
-            ws.append([record['student_name'], record['status']])
-            current_row +=1
+    dataset = datasets.frequencia(filters["class_id"], class_date)
+
+    sheet = StreamingXLSX(f"Frequencia {class_date.strftime("%Y%m%d")}", {"A": 25, "B": 30, "C": 12, "D": 14, "E": 14, "F": 16})
+    sheet.title(f"Relatório de Frequência - Turma: {dataset["selected_class_name"]} - Data: {class_date.strftime("%d/%m/%Y")}", filters["church_config"])
+
+    if dataset["attendances"]:
+        sheet.header(["Turma", "Aluno", "Status", "Freq. 4 sem. (%)", "Freq. 12 sem. (%)", "Última Presença"])
+        sheet.rows(
+            (att.school_class.name, att.student.member.name, "Presente" if att.present else "Ausente",
+             att.student.attendance_rate_4w, att.student.attendance_rate_12w,
+             att.student.last_seen.strftime("%d/%m/%Y") if att.student.last_seen else "-")
+            for att in dataset["attendances"]
+        )
+        sheet.blank()
+        sheet.append(["", "Total Presentes:", dataset["total_present"]], font=Font(bold=True), font_columns={2})
+        sheet.append(["", "Total Ausentes:", dataset["total_absent"]], font=Font(bold=True), font_columns={2})
     else:
-        ws.append(["Nenhum dado de frequência para os filtros selecionados."])
+        sheet.append(["Nenhum dado de frequência para os filtros selecionados."])
 
-    ws.column_dimensions["A"].width = 40
-    ws.column_dimensions["B"].width = 15
+    return sheet.response(f"frequencia_{class_date.strftime("%Y%m%d")}.xlsx")
 
-    buffer = io.BytesIO()
-    wb.save(buffer)
-    buffer.seek(0)
-    response = HttpResponse(buffer, content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-    response["Content-Disposition"] = f"attachment; filename=frequencia_{selected_class.name.replace(' ', '') if selected_class else 'turma'}_{class_date_str.replace('-' , '')}.xlsx"
-    return response
+
+# --- Exportações em segundo plano (processadas por manage.py run_report_jobs) ---
+def _user_jobs(request):
+    if request.user.is_superuser:
+        return ReportJob.objects.select_related("user")
+    return ReportJob.objects.filter(user=request.user)
 
 @login_required
-def export_frequencia_pdf(request):
-    filters = _get_report_filters(request)
-    church_config = filters["church_config"]
-    class_id = filters["class_id"]
-    class_date = filters["class_date"]
-    
-    selected_class = None
-    attendance_records = []
-    if class_id:
-        try:
-            selected_class = SchoolClass.objects.get(pk=class_id)
-            students_in_class = selected_class.students.all().order_by('name')
-            recorded_attendance = Attendance.objects.filter(school_class=selected_class, date=class_date)
-            present_student_ids = list(recorded_attendance.values_list('student_id', flat=True))
-            for student in students_in_class:
-                attendance_records.append({
-                    'student_name': student.name,
-                    'status': 'Presente' if student.id in present_student_ids else 'Ausente'
-                })
-        except SchoolClass.DoesNotExist:
-            pass 
-
-    report_title_main = "Relatório de Frequência"
-    report_period_str = f"Turma: {selected_class.name if selected_class else 'N/A'} - Data: {DateFormat(class_date).format('d/m/Y')}"
-
-    pdf = PDFReport(church_config=church_config, 
-                    report_title=report_title_main, 
-                    report_period=report_period_str)
-    pdf.add_page()
-    current_font_family = pdf.font_family
-
-    line_height = 7
-    col_widths_attendance = {"name": 140, "status": 50}
-
-    if attendance_records:
-        pdf.set_font(current_font_family, 'B', 9)
-        pdf.set_x(pdf.l_margin)
-        pdf.cell(col_widths_attendance["name"], line_height, "Nome do Aluno", 1, 0, 'C')
-        pdf.cell(col_widths_attendance["status"], line_height, "Status", 1, 1, 'C')
-
-        pdf.set_font(current_font_family, '', 8)
-        for record in attendance_records:
-            if pdf.get_y() > (pdf.h - pdf.b_margin - line_height * 2):
-                pdf.add_page()
-                pdf.set_font(current_font_family, 'B', 9)
-                pdf.set_x(pdf.l_margin)
-                pdf.cell(col_widths_attendance["name"], line_height, "Nome do Aluno", 1, 0, 'C')
-                pdf.cell(col_widths_attendance["status"], line_height, "Status", 1, 1, 'C')
-                pdf.set_font(current_font_family, '', 8)
-            
-            start_y = pdf.get_y()
-            pdf.set_x(pdf.l_margin)
-            pdf.multi_cell(col_widths_attendance["name"], line_height, record['student_name'], 1, 'L')
-            max_y = pdf.get_y()
-            pdf.set_xy(pdf.l_margin + col_widths_attendance["name"], start_y)
-            pdf.multi_cell(col_widths_attendance["status"], line_height, record['status'], 1, 'L')
-            max_y = max(max_y, pdf.get_y())
-            pdf.set_y(max_y)
-    else:
-        pdf.set_font(current_font_family, '', 10)
-        pdf.set_x(pdf.l_margin)
-        pdf.cell(0, line_height, "Nenhum dado de frequência para os filtros selecionados.", 0, 1, 'C')
+@require_POST
+def report_job_create(request):
+    report = request.POST.get("report")
+    if report not in dict(ReportJob.REPORT_CHOICES):
+        messages.error(request, "Relatório inválido para exportação.")
+        return redirect("reports:index")
+    job = ReportJob.objects.create(user=request.user, report=report, params=request.POST.get("params", "")[:1000])
+    messages.success(request, "Exportação enfileirada. O arquivo ficará disponível nesta página assim que for gerado.")
+    return redirect("reports:job_detail", pk=job.pk)
 
-    pdf.set_font(current_font_family, '', 10)
-    pdf_output_bytes = pdf.output(dest='S')
-    response = HttpResponse(pdf_output_bytes, content_type='application/pdf')
-    response["Content-Disposition"] = f'attachment; filename="frequencia_{selected_class.name.replace(" ", "_")}_{filters["class_date_str"]}.pdf"'
+@login_required
+def report_job_list(request):
+    context = {
+        "active_menu": "reports",
+        "jobs": _user_jobs(request)[:50],
+    }
+    return render(request, "reports/report_job_list.html", context)
 
+@login_required
+def report_job_detail(request, pk):
+    context = {
+        "active_menu": "reports",
+        "job": get_object_or_404(_user_jobs(request), pk=pk),
+    }
+    return render(request, "reports/report_job_detail.html", context)
+
+@login_required
+def report_job_status(request, pk):
+    job = get_object_or_404(_user_jobs(request), pk=pk)
+    return JsonResponse({
+        "status": job.status,
+        "status_display": job.get_status_display(),
+        "finished": job.is_finished,
+        "size": job.size,
+        "duration": job.duration,
+        "error": job.error,
+        "download_url": reverse("reports:job_download", args=[job.pk]) if job.status == ReportJob.STATUS_DONE else None,
+    })
+
+@login_required
+def report_job_download(request, pk):
+    job = get_object_or_404(_user_jobs(request), pk=pk)
+    if job.status != ReportJob.STATUS_DONE or not job.file:
+        raise Http404("Arquivo ainda não disponível.")
+    return FileResponse(job.file.open("rb"), as_attachment=True, filename=os.path.basename(job.file.name))
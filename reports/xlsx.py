@@ -0,0 +1,121 @@
+"""
+Exportação XLSX em modo write-only.
+
+As linhas são gravadas pelo openpyxl direto em disco à medida que chegam (nada
+fica retido na planilha) e o .xlsx final é montado num arquivo temporário que
+o FileResponse entrega em blocos. Com querysets lidos via .iterator(), o uso
+de memória não depende do número de linhas exportadas.
+"""
+import logging
+import os
+import tempfile
+
+from django.http import FileResponse
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.drawing.image import Image as OpenpyxlImage
+from openpyxl.styles import Alignment, Font
+from openpyxl.worksheet.cell_range import CellRange
+
+logger = logging.getLogger(__name__)
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+MONEY_FORMAT = "R$ #,##0.00"
+XLSX_CHUNK_SIZE = 2000 # Linhas por ida ao banco ao iterar querysets
+
+BOLD = Font(bold=True)
+CENTER = Alignment(horizontal="center")
+
+
+class StreamingXLSX:
+    """
+    Planilha de uma aba escrita linha a linha. Como o modo write-only não
+    permite voltar a uma célula já escrita, o estilo de cada linha é passado
+    no momento do append.
+    """
+
+    def __init__(self, title, widths):
+        self.workbook = Workbook(write_only=True)
+        self.ws = self.workbook.create_sheet(title[:31])
+        self.row_count = 0
+        # Larguras precisam ser definidas antes da primeira linha
+        for letter, width in widths.items():
+            self.ws.column_dimensions[letter].width = width
+        self.last_column = len(widths)
+
+    def _cell(self, value, font=None, number_format=None, alignment=None):
+        cell = WriteOnlyCell(self.ws, value=value)
+        if font:
+            cell.font = font
+        if number_format:
+            cell.number_format = number_format
+        if alignment:
+            cell.alignment = alignment
+        return cell
+
+    def append(self, values, font=None, money_columns=(), font_columns=None):
+        """
+        Acrescenta uma linha. money_columns usa índices a partir de 1, como no
+        openpyxl; font_columns restringe a fonte a essas colunas.
+        """
+        row = []
+        for col_idx, value in enumerate(values, 1):
+            use_font = font if font_columns is None or col_idx in font_columns else None
+            number_format = MONEY_FORMAT if col_idx in money_columns else None
+            if use_font or number_format:
+                value = self._cell(value, font=use_font, number_format=number_format)
+            row.append(value)
+        self.ws.append(row)
+        self.row_count += 1
+
+    def rows(self, iterable, money_columns=()):
+        for values in iterable:
+            self.append(values, money_columns=money_columns)
+
+    def blank(self):
+        self.append([])
+
+    def merged(self, value, first_column, font, height=None):
+        """Linha com um único texto centralizado, mesclado até a última coluna."""
+        self.ws.append([None] * (first_column - 1) + [self._cell(value, font=font, alignment=CENTER)])
+        self.row_count += 1
+        self.ws.merged_cells.add(CellRange(
+            min_row=self.row_count, min_col=first_column,
+            max_row=self.row_count, max_col=max(self.last_column, first_column),
+        ))
+        if height:
+            self.ws.row_dimensions[self.row_count].height = height
+
+    def church_header(self, church_config):
+        if not church_config:
+            return
+        if church_config.logo and hasattr(church_config.logo, "path") and os.path.exists(church_config.logo.path):
+            try:
+                img = OpenpyxlImage(church_config.logo.path)
+                img.height = 75; img.width = 75
+                self.ws.add_image(img, "A1")
+            except Exception as e:
+                logger.warning("Logo da igreja inválido (%s): %s", church_config.logo.path, e)
+        self.merged(church_config.church_name or "Nome da Igreja", 2, Font(bold=True, size=16))
+        self.merged(
+            f"Pastor: {church_config.president_pastor_name or "-"} | Tesoureiro: {church_config.treasurer_name or "-"}",
+            2, Font(size=10),
+        )
+
+    def title(self, text, church_config=None):
+        """Cabeçalho da igreja (se houver) + título do relatório + linha em branco."""
+        self.church_header(church_config)
+        self.merged(text, 1, Font(bold=True, size=14), height=20)
+        self.blank()
+
+    def section(self, text):
+        self.append([text], font=Font(bold=True, size=12))
+
+    def header(self, values):
+        self.append(values, font=BOLD, font_columns={i for i, v in enumerate(values, 1) if v})
+
+    def response(self, filename):
+        spool = tempfile.TemporaryFile()
+        self.workbook.save(spool)
+        spool.seek(0)
+        return FileResponse(spool, as_attachment=True, filename=filename, content_type=XLSX_CONTENT_TYPE)
@@ -0,0 +1,57 @@
+"""
+Gravação da frequência da Escola Dominical em lote.
+
+Uma chamada grava a chamada inteira (de uma turma ou de todas as turmas do
+domingo) com um único INSERT ... ON CONFLICT (student, date) DO UPDATE, em vez
+de um update_or_create por aluno. Como bulk_create não dispara post_save, o
+sinal attendance_recorded avisa quem depende desses dados (ex.: cache dos
+relatórios e as estatísticas de frequência).
+"""
+from django.db import transaction
+
+from .models import Attendance
+from .signals import attendance_recorded
+
+ATTENDANCE_BATCH_SIZE = 500
+
+
+def present_student_ids(date, school_classes=None):
+    """PKs dos alunos marcados como presentes na data (opcionalmente só nas turmas informadas)."""
+    records = Attendance.objects.filter(date=date, present=True)
+    if school_classes is not None:
+        records = records.filter(school_class__in=school_classes)
+    return set(records.values_list("student_id", flat=True))
+
+
+def record_attendance(date, students, present_ids):
+    """
+    Grava presença/ausência de cada aluno de `students` na data. `present_ids`
+    é o conjunto de PKs (int ou str) marcados como presentes; os demais ficam
+    ausentes. Retorna o número de registros gravados.
+    """
+    present_ids = {str(pk) for pk in present_ids}
+    records = [
+        Attendance(
+            student_id=student.pk,
+            school_class_id=student.school_class_id,
+            date=date,
+            present=str(student.pk) in present_ids,
+        )
+        for student in students
+    ]
+    if not records:
+        return 0
+    with transaction.atomic():
+        Attendance.objects.bulk_create(
+            records,
+            batch_size=ATTENDANCE_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=["student", "date"],
+            update_fields=["school_class", "present"],
+        )
+        transaction.on_commit(lambda: attendance_recorded.send(
+            sender=Attendance, date=date,
+            school_class_ids={r.school_class_id for r in records},
+            student_ids=[r.student_id for r in records],
+        ))
+    return len(records)
@@ -1,4 +1,6 @@
 from django import forms
+from django.urls import reverse_lazy
+from core.widgets import AutocompleteSelect
 from .models import SchoolClass, Student, Attendance
 import datetime
 
@@ -8,6 +10,7 @@ class SchoolClassForm(forms.ModelForm):
         fields = ["name", "description", "teacher", "room", "schedule", "max_students"]
         widgets = {
             "description": forms.Textarea(attrs={"rows": 4}),
+            "teacher": AutocompleteSelect(reverse_lazy("members:member_search"), placeholder="Nome do professor..."),
         }
     
     def __init__(self, *args, **kwargs):
@@ -20,6 +23,9 @@ class StudentForm(forms.ModelForm):
     class Meta:
         model = Student
         fields = ["member", "school_class"]
+        widgets = {
+            "member": AutocompleteSelect(reverse_lazy("members:member_search"), placeholder="Nome, CPF ou telefone do membro..."),
+        }
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -46,6 +52,18 @@ class AttendanceRecordForm(forms.Form):
         # Apply Tailwind classes if needed
         self.fields["date"].widget.attrs.update({"class": "shadow appearance-none border rounded w-full py-2 px-3 text-gray-700 leading-tight focus:outline-none focus:shadow-outline"})
 
+# Form for the Sunday sheet: every class recorded for the same date
+class AttendanceSheetForm(forms.Form):
+    date = forms.DateField(
+        label="Data da Aula",
+        widget=forms.DateInput(attrs={"type": "date"}),
+        initial=datetime.date.today
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["date"].widget.attrs.update({"class": "shadow appearance-none border rounded w-full py-2 px-3 text-gray-700 leading-tight focus:outline-none focus:shadow-outline"})
+
 
 # --- Old AttendanceForm (for individual records - might be removed later) ---
 class OldAttendanceForm(forms.ModelForm):
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from school.models import SchoolClass, Student
+from school.stats import refresh_all, refresh_stale
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula as estatísticas de frequência (presenças, taxas de 4/12 semanas, última presença) de todos os "
+        "alunos e turmas. Com --stale, só as que não foram calculadas hoje (agende uma vez por dia)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--stale", action="store_true",
+                            help="Recalcula só os alunos e turmas com estatísticas de dias anteriores.")
+
+    def handle(self, *args, **options):
+        if options["stale"]:
+            students, classes = refresh_stale(Student.objects.all()), refresh_stale(SchoolClass.objects.all())
+        else:
+            students, classes = refresh_all()
+        self.stdout.write(self.style.SUCCESS(f"Estatísticas recalculadas: {students} alunos, {classes} turmas."))
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-17 23:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('school', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['school_class', 'date'], name='attendance_class_date_idx'),
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.2.1 on 2026-10-17 23:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('school', '0002_attendance_attendance_class_date_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='schoolclass',
+            name='attendance_present',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Presenças'),
+        ),
+        migrations.AddField(
+            model_name='schoolclass',
+            name='attendance_rate_12w',
+            field=models.DecimalField(blank=True, decimal_places=1, editable=False, max_digits=4, null=True, verbose_name='Frequência nas últimas 12 semanas (%)'),
+        ),
+        migrations.AddField(
+            model_name='schoolclass',
+            name='attendance_rate_4w',
+            field=models.DecimalField(blank=True, decimal_places=1, editable=False, max_digits=4, null=True, verbose_name='Frequência nas últimas 4 semanas (%)'),
+        ),
+        migrations.AddField(
+            model_name='schoolclass',
+            name='attendance_stats_date',
+            field=models.DateField(blank=True, editable=False, null=True, verbose_name='Estatísticas calculadas em'),
+        ),
+        migrations.AddField(
+            model_name='schoolclass',
+            name='attendance_total',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Registros de Frequência'),
+        ),
+        migrations.AddField(
+            model_name='schoolclass',
+            name='current_students',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Alunos Matriculados'),
+        ),
+        migrations.AddField(
+            model_name='schoolclass',
+            name='last_seen',
+            field=models.DateField(blank=True, editable=False, null=True, verbose_name='Última Presença'),
+        ),
+        migrations.AddField(
+            model_name='student',
+            name='attendance_present',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Presenças'),
+        ),
+        migrations.AddField(
+            model_name='student',
+            name='attendance_rate_12w',
+            field=models.DecimalField(blank=True, decimal_places=1, editable=False, max_digits=4, null=True, verbose_name='Frequência nas últimas 12 semanas (%)'),
+        ),
+        migrations.AddField(
+            model_name='student',
+            name='attendance_rate_4w',
+            field=models.DecimalField(blank=True, decimal_places=1, editable=False, max_digits=4, null=True, verbose_name='Frequência nas últimas 4 semanas (%)'),
+        ),
+        migrations.AddField(
+            model_name='student',
+            name='attendance_stats_date',
+            field=models.DateField(blank=True, editable=False, null=True, verbose_name='Estatísticas calculadas em'),
+        ),
+        migrations.AddField(
+            model_name='student',
+            name='attendance_total',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Registros de Frequência'),
+        ),
+        migrations.AddField(
+            model_name='student',
+            name='last_seen',
+            field=models.DateField(blank=True, editable=False, null=True, verbose_name='Última Presença'),
+        ),
+    ]
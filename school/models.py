@@ -1,7 +1,31 @@
 from django.db import models
 from members.models import Member
 
-class SchoolClass(models.Model):
+
+class AttendanceStats(models.Model):
+    """
+    Contadores de frequência mantidos por school.stats a cada gravação de
+    frequência, para que as telas não precisem varrer o histórico. As taxas das
+    janelas móveis valem para a data em attendance_stats_date.
+    """
+    attendance_present = models.PositiveIntegerField(default=0, editable=False, verbose_name="Presenças")
+    attendance_total = models.PositiveIntegerField(default=0, editable=False, verbose_name="Registros de Frequência")
+    attendance_rate_4w = models.DecimalField(max_digits=4, decimal_places=1, null=True, blank=True, editable=False, verbose_name="Frequência nas últimas 4 semanas (%)")
+    attendance_rate_12w = models.DecimalField(max_digits=4, decimal_places=1, null=True, blank=True, editable=False, verbose_name="Frequência nas últimas 12 semanas (%)")
+    last_seen = models.DateField(null=True, blank=True, editable=False, verbose_name="Última Presença")
+    attendance_stats_date = models.DateField(null=True, blank=True, editable=False, verbose_name="Estatísticas calculadas em")
+
+    class Meta:
+        abstract = True
+
+    @property
+    def attendance_rate(self):
+        if not self.attendance_total:
+            return None
+        return round(self.attendance_present * 100 / self.attendance_total, 1)
+
+
+class SchoolClass(AttendanceStats):
     name = models.CharField(max_length=255, verbose_name="Nome da Turma")
     description = models.TextField(blank=True, null=True, verbose_name="Descrição")
     # Usar Member como professor, assumindo que professores são membros
@@ -9,7 +33,7 @@ class SchoolClass(models.Model):
     room = models.CharField(max_length=100, blank=True, null=True, verbose_name="Sala")
     schedule = models.CharField(max_length=255, blank=True, null=True, verbose_name="Horário")
     max_students = models.PositiveIntegerField(blank=True, null=True, verbose_name="Máximo de Alunos")
-    # current_students pode ser calculado ou mantido via signals/métodos
+    current_students = models.PositiveIntegerField(default=0, editable=False, verbose_name="Alunos Matriculados") # Mantido por school.stats
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Criado em")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Atualizado em")
 
@@ -21,11 +45,10 @@ class SchoolClass(models.Model):
         verbose_name_plural = "Turmas da Escola Dominical"
         ordering = ["name"]
 
-class Student(models.Model):
+class Student(AttendanceStats):
     member = models.ForeignKey(Member, on_delete=models.CASCADE, related_name="student_enrollments", verbose_name="Membro (Aluno)")
     school_class = models.ForeignKey(SchoolClass, on_delete=models.CASCADE, related_name="students", verbose_name="Turma")
     enrollment_date = models.DateField(auto_now_add=True, verbose_name="Data de Matrícula")
-    # attendance_rate pode ser calculado
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Criado em")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Atualizado em")
 
@@ -54,4 +77,7 @@ class Attendance(models.Model):
         verbose_name_plural = "Registros de Frequência"
         unique_together = [("student", "date")] # Um aluno só tem um registro por dia
         ordering = ["-date", "student"]
+        indexes = [
+            models.Index(fields=["school_class", "date"], name="attendance_class_date_idx"),
+        ]
 
@@ -0,0 +1,44 @@
+from django.db.models import QuerySet
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import Signal
+
+from .models import Attendance, Student
+from . import stats
+
+# Enviado após a gravação em lote da frequência (bulk_create não dispara post_save).
+# Argumentos: date, school_class_ids, student_ids
+attendance_recorded = Signal()
+
+
+def _deleted_directly(model, origin):
+    """False quando a exclusão veio em cascata de outro modelo (aluno/turma inteiros)."""
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return origin is None or origin_model is model
+
+
+def refresh_attendance_stats(sender, **kwargs):
+    stats.refresh_students(kwargs["student_ids"])
+    stats.refresh_classes(kwargs["school_class_ids"])
+
+
+def refresh_attendance_stats_for_record(sender, instance, **kwargs):
+    if not _deleted_directly(Attendance, kwargs.get("origin")):
+        return
+    stats.refresh_students([instance.student_id])
+    stats.refresh_classes([instance.school_class_id])
+
+
+def refresh_class_after_student_change(sender, instance, **kwargs):
+    if kwargs.get("signal") is post_delete:
+        # Sem o aluno, as presenças dele deixam de contar para a turma
+        if _deleted_directly(Student, kwargs.get("origin")):
+            stats.refresh_classes([instance.school_class_id])
+        return
+    stats.refresh_class_sizes()
+
+
+attendance_recorded.connect(refresh_attendance_stats, dispatch_uid="school_attendance_recorded")
+post_save.connect(refresh_attendance_stats_for_record, sender=Attendance, dispatch_uid="school_stats_save_attendance")
+post_delete.connect(refresh_attendance_stats_for_record, sender=Attendance, dispatch_uid="school_stats_delete_attendance")
+post_save.connect(refresh_class_after_student_change, sender=Student, dispatch_uid="school_stats_save_student")
+post_delete.connect(refresh_class_after_student_change, sender=Student, dispatch_uid="school_stats_delete_student")
@@ -0,0 +1,117 @@
+"""
+Estatísticas de frequência pré-calculadas por aluno e por turma.
+
+Os campos de AttendanceStats (presenças/total, taxas das últimas 4 e 12 semanas,
+última presença) são recalculados aqui sempre que a frequência é gravada (ver
+school.signals), com uma consulta agrupada para todos os afetados. As telas e
+relatórios só leem esses campos. Como as janelas móveis dependem do dia, o
+comando refresh_attendance_stats --stale (agendado uma vez por dia e rodado na
+inicialização, ver entrypoint.sh) recalcula os registros de datas anteriores
+com refresh_stale(); sem --stale, refresh_all() recalcula tudo.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
+from .models import Attendance, SchoolClass, Student
+
+STATS_BATCH_SIZE = 500
+WINDOWS = {"attendance_rate_4w": 28, "attendance_rate_12w": 84} # Janela em dias
+STATS_FIELDS = ["attendance_present", "attendance_total", "last_seen", "attendance_stats_date", *WINDOWS]
+
+
+def _chunks(ids):
+    ids = sorted(set(ids))
+    for i in range(0, len(ids), STATS_BATCH_SIZE):
+        yield ids[i:i + STATS_BATCH_SIZE]
+
+
+def _aggregates(today):
+    aggregates = {
+        "total_count": Count("id"),
+        "present_count": Count("id", filter=Q(present=True)),
+        "last_present": Max("date", filter=Q(present=True)),
+    }
+    for field, days in WINDOWS.items():
+        in_window = Q(date__gt=today - timedelta(days=days), date__lte=today)
+        aggregates[f"{field}_total"] = Count("id", filter=in_window)
+        aggregates[f"{field}_present"] = Count("id", filter=in_window & Q(present=True))
+    return aggregates
+
+
+def _rate(present, total):
+    if not total:
+        return None
+    return (Decimal(present * 100) / total).quantize(Decimal("0.1"))
+
+
+def _apply(obj, row, today):
+    row = row or {}
+    obj.attendance_present = row.get("present_count", 0)
+    obj.attendance_total = row.get("total_count", 0)
+    obj.last_seen = row.get("last_present")
+    obj.attendance_stats_date = today
+    for field in WINDOWS:
+        setattr(obj, field, _rate(row.get(f"{field}_present", 0), row.get(f"{field}_total", 0)))
+
+
+def _refresh(model, group_field, ids, today, extra_fields=(), extra=None):
+    today = today or timezone.localdate()
+    updated = 0
+    for chunk in _chunks(ids):
+        rows = Attendance.objects.filter(**{f"{group_field}__in": chunk})\
+                                 .values(group_field).annotate(**_aggregates(today))
+        rows = {row[group_field]: row for row in rows}
+        objs = list(model.objects.filter(pk__in=chunk).only("pk"))
+        extra_values = extra(chunk) if extra else {}
+        for obj in objs:
+            _apply(obj, rows.get(obj.pk), today)
+            for field in extra_fields:
+                setattr(obj, field, extra_values.get(obj.pk, 0))
+        model.objects.bulk_update(objs, STATS_FIELDS + list(extra_fields))
+        updated += len(objs)
+    return updated
+
+
+def _student_counts(class_ids):
+    rows = Student.objects.filter(school_class_id__in=class_ids)\
+                          .values("school_class_id").annotate(count=Count("id"))
+    return {row["school_class_id"]: row["count"] for row in rows}
+
+
+def refresh_students(student_ids, today=None):
+    return _refresh(Student, "student_id", student_ids, today)
+
+
+def refresh_classes(class_ids, today=None):
+    return _refresh(SchoolClass, "school_class_id", class_ids, today,
+                    extra_fields=["current_students"], extra=_student_counts)
+
+
+def refresh_class_sizes():
+    """Atualiza só current_students de todas as turmas (matrícula criada, movida ou excluída)."""
+    counts = _student_counts(SchoolClass.objects.values("pk"))
+    classes = list(SchoolClass.objects.only("pk", "current_students"))
+    changed = [c for c in classes if c.current_students != counts.get(c.pk, 0)]
+    for school_class in changed:
+        school_class.current_students = counts.get(school_class.pk, 0)
+    SchoolClass.objects.bulk_update(changed, ["current_students"])
+
+
+def refresh_stale(queryset, today=None):
+    """Recalcula os registros do queryset (Student ou SchoolClass) cujas taxas não são de hoje (uso do comando)."""
+    today = today or timezone.localdate()
+    stale_ids = list(queryset.exclude(attendance_stats_date=today).values_list("pk", flat=True))
+    if not stale_ids:
+        return 0
+    if queryset.model is Student:
+        return refresh_students(stale_ids, today)
+    return refresh_classes(stale_ids, today)
+
+
+def refresh_all(today=None):
+    students = refresh_students(Student.objects.values_list("pk", flat=True), today)
+    classes = refresh_classes(SchoolClass.objects.values_list("pk", flat=True), today)
+    return students, classes
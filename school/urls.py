@@ -13,6 +13,8 @@ urlpatterns = [
     
     # Rota para registrar frequência da turma
     path("turmas/<int:class_pk>/frequencia/", views.record_class_attendance, name="record_class_attendance"),
+    # Chamada do domingo: todas as turmas numa única tela
+    path("frequencia/domingo/", views.record_sunday_attendance, name="record_sunday_attendance"),
     
     # Rotas para Alunos (Student)
     path("alunos/", views.student_list, name="student_list"), # Pode ser acessado com ?class_pk=ID
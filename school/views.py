@@ -1,16 +1,19 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.db import transaction
+from django.urls import reverse
 from django.utils.dateparse import parse_date
 from django.contrib.auth.decorators import login_required, permission_required
 
 from .models import SchoolClass, Student, Attendance # Corrected model name to Attendance
-from .forms import SchoolClassForm, StudentForm, AttendanceRecordForm
+from .forms import SchoolClassForm, StudentForm, AttendanceRecordForm, AttendanceSheetForm
+from .attendance import present_student_ids, record_attendance
+
+STUDENT_RECENT_ATTENDANCES = 12
 
 # Views para SchoolClass (Turmas)
 @login_required
 def school_class_list(request):
-    classes = SchoolClass.objects.all().order_by("name")
+    classes = SchoolClass.objects.select_related("teacher").order_by("name")
     return render(request, "schools/school_class_list.html", {
         "classes": classes,
         "active_menu": "school",
@@ -91,7 +94,7 @@ def student_list(request):
     if class_pk:
         school_class_filter = get_object_or_404(SchoolClass, pk=class_pk)
         students = students.filter(school_class=school_class_filter)
-        
+
     return render(request, "schools/student_list.html", {
         "students": students,
         "school_class_filter": school_class_filter,
@@ -101,7 +104,8 @@ def student_list(request):
 @login_required
 def student_detail(request, pk):
     student = get_object_or_404(Student.objects.select_related("member", "school_class"), pk=pk)
-    attendances = student.attendances.all().order_by("-date") # Use the correct related name
+    # Totais e taxas vêm dos contadores do aluno; o histórico mostra só as aulas mais recentes
+    attendances = student.attendances.order_by("-date")[:STUDENT_RECENT_ATTENDANCES]
     return render(request, "schools/student_detail.html", {
         "student": student,
         "attendances": attendances,
@@ -173,40 +177,31 @@ def student_delete(request, pk):
     })
 
 @login_required
-@permission_required("school.add_attendancerecord", raise_exception=True) # Assuming add implies change for update_or_create
+@permission_required("school.add_attendance", raise_exception=True) # Assuming add implies change for the upsert
 def record_class_attendance(request, class_pk):
     school_class_obj = get_object_or_404(SchoolClass, pk=class_pk) # Renamed to avoid conflict
     students = school_class_obj.students.select_related("member").order_by("member__name")
-    
+    existing_attendance = set()
+
     if request.method == "POST":
         form = AttendanceRecordForm(request.POST, school_class=school_class_obj)
+        present_student_pks = request.POST.getlist("present_students")
         if form.is_valid():
             attendance_date = form.cleaned_data["date"]
-            present_student_pks = request.POST.getlist("present_students")
-            
             try:
-                with transaction.atomic():
-                    for student_obj in students: # Renamed to avoid conflict
-                        is_present = str(student_obj.pk) in present_student_pks
-                        Attendance.objects.update_or_create(
-                            student=student_obj,
-                            school_class=school_class_obj,
-                            date=attendance_date,
-                            defaults={"present": is_present}
-                        )
+                record_attendance(attendance_date, students, present_student_pks)
                 messages.success(request, f"Frequência para {school_class_obj.name} em {attendance_date.strftime('%d/%m/%Y')} registrada com sucesso!")
                 return redirect("school:school_class_detail", pk=class_pk)
             except Exception as e:
                 messages.error(request, f"Erro ao registrar frequência: {e}")
+        # Mantém as marcações enviadas ao reexibir o formulário
+        existing_attendance = {int(pk) for pk in present_student_pks if pk.isdigit()}
     else:
         initial_date_str = request.GET.get("date")
         initial_date = parse_date(initial_date_str) if initial_date_str else None
         form = AttendanceRecordForm(school_class=school_class_obj, initial={"date": initial_date} if initial_date else {})
-        
-        existing_attendance = {}
         if initial_date:
-            existing_records = Attendance.objects.filter(school_class=school_class_obj, date=initial_date, present=True)
-            existing_attendance = {record.student.pk for record in existing_records}
+            existing_attendance = present_student_ids(initial_date, [school_class_obj])
 
     return render(request, "schools/attendance_record_form.html", {
         "form": form,
@@ -216,3 +211,34 @@ def record_class_attendance(request, class_pk):
         "active_menu": "school",
     })
 
+@login_required
+@permission_required("school.add_attendance", raise_exception=True)
+def record_sunday_attendance(request):
+    """Chamada do domingo: todas as turmas de uma data gravadas numa única submissão."""
+    students = Student.objects.select_related("member", "school_class").order_by("school_class__name", "school_class_id", "member__name")
+    existing_attendance = set()
+
+    if request.method == "POST":
+        form = AttendanceSheetForm(request.POST)
+        present_student_pks = request.POST.getlist("present_students")
+        if form.is_valid():
+            attendance_date = form.cleaned_data["date"]
+            try:
+                total = record_attendance(attendance_date, students, present_student_pks)
+                messages.success(request, f"Frequência de {attendance_date.strftime('%d/%m/%Y')} registrada para {total} alunos.")
+                return redirect(f"{reverse('school:record_sunday_attendance')}?date={attendance_date.isoformat()}")
+            except Exception as e:
+                messages.error(request, f"Erro ao registrar frequência: {e}")
+        existing_attendance = {int(pk) for pk in present_student_pks if pk.isdigit()}
+    else:
+        initial_date = parse_date(request.GET.get("date") or "")
+        form = AttendanceSheetForm(initial={"date": initial_date} if initial_date else {})
+        if initial_date:
+            existing_attendance = present_student_ids(initial_date)
+
+    return render(request, "schools/attendance_sheet_form.html", {
+        "form": form,
+        "students": students,
+        "existing_attendance": existing_attendance,
+        "active_menu": "school",
+    })
@@ -14,7 +14,7 @@ def setup_groups_and_permissions():
     APP_MODELS = {
         "members": ["member"],
         "churches": ["church"],
-        "school": ["schoolclass", "student", "attendancerecord"],
+        "school": ["schoolclass", "student", "attendance"],
         "events": ["event", "eventsubscription"],
         "finances": ["category", "transaction"],
         "core": ["churchconfiguration"],
@@ -35,7 +35,7 @@ def setup_groups_and_permissions():
             "school": {
                 "schoolclass": "all_crud", 
                 "student": "all_crud", 
-                "attendancerecord": "all_crud"
+                "attendance": "all_crud"
             },
             "events": {
                 "event": "all_crud", 
@@ -54,7 +54,7 @@ def setup_groups_and_permissions():
             "school": {
                 "schoolclass": "all_crud", 
                 "student": "all_crud", 
-                "attendancerecord": "all_crud"
+                "attendance": "all_crud"
             },
             "events": {
                 "event": "all_crud", 
@@ -73,7 +73,7 @@ def setup_groups_and_permissions():
             "school": {
                 "schoolclass": ["view"], 
                 "student": ["view"], 
-                "attendancerecord": ["view"]
+                "attendance": ["view"]
             },
             "events": {
                 "event": ["view"], 
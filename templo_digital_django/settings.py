@@ -14,6 +14,7 @@ from pathlib import Path
 import os
 from dotenv import load_dotenv
 import dj_database_url
+from django.core.exceptions import ImproperlyConfigured
 
 load_dotenv()
 
@@ -70,8 +71,12 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    # Usuário da requisição para o registro de atividades (ver dashboard.activity)
+    'dashboard.activity.ActivityActorMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Só fica ativo com QUERY_PROFILING=True (ver abaixo)
+    'core.profiling.QueryProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'templo_digital_django.urls'
@@ -86,6 +91,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'core.context_processors.church_config',
             ],
         },
     },
@@ -137,6 +143,10 @@ else:
         }
     }
 
+# Lookups de trigramas (trigram_word_similar) da busca de membros no PostgreSQL (ver members.search)
+if DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    INSTALLED_APPS.append('django.contrib.postgres')
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -199,3 +209,69 @@ AUTH_USER_MODEL = 'users.CustomUser'
 LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'dashboard:index'
 LOGOUT_REDIRECT_URL = 'users:login'
+
+# Cache compartilhado. Os caches do dashboard, dos relatórios e das opções são invalidados por
+# signals no processo que gravou a alteração; para os outros processos (workers do gunicorn e o
+# run_report_jobs do entrypoint.sh) verem a invalidação, o cache PRECISA ser compartilhado entre eles:
+# - "database" (padrão): tabela CACHE_LOCATION no próprio banco, criada após o migrate (ver core.apps);
+# - "redis": CACHE_LOCATION=redis://host:6379/0 (requer o pacote redis), recomendado em produção;
+# - "file": pasta em CACHE_LOCATION, compartilhada só pelos processos da mesma máquina;
+# - "locmem": um cache por processo; só é aceito com DJANGO_DEBUG=True (runserver, um processo).
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'database')
+CACHE_BACKENDS = {
+    'database': ('django.core.cache.backends.db.DatabaseCache', 'templo_cache'),
+    'redis': ('django.core.cache.backends.redis.RedisCache', 'redis://127.0.0.1:6379/0'),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', os.path.join(BASE_DIR, '.cache')),
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'templo-digital'),
+}
+if CACHE_BACKEND not in CACHE_BACKENDS:
+    raise ImproperlyConfigured(f"CACHE_BACKEND inválido: {CACHE_BACKEND!r} (use {', '.join(CACHE_BACKENDS)}).")
+if CACHE_BACKEND == 'locmem' and not DEBUG:
+    raise ImproperlyConfigured(
+        "CACHE_BACKEND=locmem não é compartilhado entre os workers: as invalidações de cache não "
+        "chegariam aos outros processos. Use database, redis ou file."
+    )
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND][0],
+        'LOCATION': os.environ.get('CACHE_LOCATION', CACHE_BACKENDS[CACHE_BACKEND][1]),
+        'KEY_PREFIX': os.environ.get('CACHE_KEY_PREFIX', 'templo'),
+        'TIMEOUT': int(os.environ.get('CACHE_TIMEOUT', '300')),
+    }
+}
+
+# Tempo (segundos) que o snapshot do dashboard fica em cache
+DASHBOARD_CACHE_TIMEOUT = int(os.environ.get('DASHBOARD_CACHE_TIMEOUT', '300'))
+
+# Tempo (segundos) que os conjuntos de dados dos relatórios ficam em cache
+REPORT_CACHE_TIMEOUT = int(os.environ.get('REPORT_CACHE_TIMEOUT', '300'))
+
+# Tempo (segundos) que dados de referência (configuração da igreja, igrejas, categorias) ficam em cache
+CHOICES_CACHE_TIMEOUT = int(os.environ.get('CHOICES_CACHE_TIMEOUT', '3600'))
+
+# Perfil de requisições (consultas, tempo de SQL e de renderização); desligado por padrão
+QUERY_PROFILING = os.environ.get('QUERY_PROFILING', 'False') == 'True'
+# Destino dos perfis: "table" (core.RequestProfile) ou "log" (arquivo rotativo em JSON)
+QUERY_PROFILING_SINK = os.environ.get('QUERY_PROFILING_SINK', 'table')
+# Quantidade de perfis mantidos na tabela; os mais antigos são descartados
+QUERY_PROFILING_MAX_ROWS = int(os.environ.get('QUERY_PROFILING_MAX_ROWS', '10000'))
+QUERY_PROFILING_LOG = os.environ.get('QUERY_PROFILING_LOG', os.path.join(BASE_DIR, 'query_profile.log'))
+
+if QUERY_PROFILING and QUERY_PROFILING_SINK == 'log':
+    LOGGING = {
+        'version': 1,
+        'disable_existing_loggers': False,
+        'formatters': {'message': {'format': '%(message)s'}},
+        'handlers': {
+            'query_profile': {
+                'class': 'logging.handlers.RotatingFileHandler',
+                'filename': QUERY_PROFILING_LOG,
+                'maxBytes': 5 * 1024 * 1024,
+                'backupCount': 3,
+                'formatter': 'message',
+            },
+        },
+        'loggers': {
+            'core.profiling': {'handlers': ['query_profile'], 'level': 'INFO', 'propagate': False},
+        },
+    }
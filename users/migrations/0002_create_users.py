@@ -1,6 +1,6 @@
 from django.db import migrations
 
-def inserir_usuario(apps):
+def inserir_usuario(apps, schema_editor):
     User = apps.get_model('users', 'CustomUser')
 
     tesoureiro = User.objects.create_user(
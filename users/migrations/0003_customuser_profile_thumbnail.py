@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-17 23:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_create_users'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='profile_thumbnail',
+            field=models.ImageField(blank=True, editable=False, upload_to='profile_images/', verbose_name='Miniatura da Imagem de Perfil'),
+        ),
+    ]
@@ -43,6 +43,14 @@ class CustomUser(AbstractUser):
         null=True
     )
     
+    # Gerada por core.thumbnails a partir de profile_image
+    profile_thumbnail = models.ImageField(
+        _('Miniatura da Imagem de Perfil'),
+        upload_to='profile_images/',
+        blank=True,
+        editable=False
+    )
+    
     def __str__(self):
         return self.get_full_name() or self.username
     
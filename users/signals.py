@@ -0,0 +1,12 @@
+from django.db.models.signals import post_save
+
+from core.thumbnails import sync_thumbnail
+from .models import CustomUser
+
+
+def update_profile_thumbnail(sender, instance, raw=False, **kwargs):
+    if not raw:
+        sync_thumbnail(instance, "profile_image", "profile_thumbnail")
+
+
+post_save.connect(update_profile_thumbnail, sender=CustomUser, dispatch_uid="users_profile_thumbnail")